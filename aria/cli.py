@@ -38,7 +38,7 @@ def main():
     serve_parser = subparsers.add_parser("serve", help="Start real-time hub and dashboard")
     serve_parser.add_argument("--port", type=int, default=8001, help="Port (default: 8001)")
     serve_parser.add_argument("--host", default="127.0.0.1", help="Host (default: 127.0.0.1)")
-    serve_parser.add_argument("--verbose", action="store_true", help="Enable DEBUG logging")
+    serve_parser.add_argument("--verbose", action="store_true", help="Enable DEBUG logging and HTTP access log")
     serve_parser.add_argument("--quiet", action="store_true", help="Only show WARNING and above")
 
     # Demo command
@@ -152,6 +152,7 @@ def _serve(host: str, port: int, log_level: str = "INFO"):
     import asyncio
     import logging
     import os
+    import signal
     from pathlib import Path
 
     logging.basicConfig(
@@ -189,149 +190,175 @@ def _serve(host: str, port: int, log_level: str = "INFO"):
         hub = IntelligenceHub(cache_path)
         await hub.initialize()
 
-        # Seed config defaults
+        # SIGINT/SIGTERM arrive through the event loop. While modules are still
+        # starting they cancel this task, so the finally below closes the hub.
+        loop = asyncio.get_running_loop()
+        handled_signals = (signal.SIGINT, signal.SIGTERM)
         try:
-            from aria.hub.config_defaults import seed_config_defaults
-
-            seeded = await seed_config_defaults(hub.cache)
-            if seeded:
-                logger.info(f"Seeded {seeded} new config parameter(s)")
-        except Exception as e:
-            logger.warning(f"Config seeding failed (non-fatal): {e}")
-
-        # HA credentials
-        ha_url = os.environ.get("HA_URL")
-        ha_token = os.environ.get("HA_TOKEN")
-        if not ha_url or not ha_token:
-            logger.error("HA_URL and HA_TOKEN environment variables required")
-            await hub.shutdown()
-            return
-
-        intelligence_dir = str(cache_dir.parent)
-        models_dir = os.path.join(intelligence_dir, "models")
-        training_data_dir = os.path.join(intelligence_dir, "daily")
-
-        # Register and initialize modules, tracking success/failure
-        def _init_module(module, name):
-            """Register and mark module status after init attempt."""
-
-            async def _do():
-                try:
-                    await module.initialize()
-                    hub.mark_module_running(name)
-                except Exception:
-                    hub.mark_module_failed(name)
-                    raise
-
-            return _do
-
-        # discovery
-        discovery = DiscoveryModule(hub, ha_url, ha_token)
-        hub.register_module(discovery)
-        await _init_module(discovery, "discovery")()
-        await discovery.schedule_periodic_discovery(interval_hours=24)
-        try:
-            await discovery.start_event_listener()
-        except Exception as e:
-            logger.warning(f"Event listener failed to start (non-fatal): {e}")
-
-        # ml_engine
-        ml_engine = MLEngine(hub, models_dir, training_data_dir)
-        hub.register_module(ml_engine)
-        await _init_module(ml_engine, "ml_engine")()
-        await ml_engine.schedule_periodic_training(interval_days=7)
-
-        # pattern_recognition
-        log_dir = Path(intelligence_dir)
-        patterns = PatternRecognition(hub, log_dir)
-        hub.register_module(patterns)
-        await _init_module(patterns, "pattern_recognition")()
-
-        # orchestrator
-        orchestrator = OrchestratorModule(hub, ha_url, ha_token)
-        hub.register_module(orchestrator)
-        await _init_module(orchestrator, "orchestrator")()
-
-        # shadow_engine (non-fatal)
-        try:
-            shadow_engine = ShadowEngine(hub)
-            hub.register_module(shadow_engine)
-            await _init_module(shadow_engine, "shadow_engine")()
-        except Exception as e:
-            logger.error(f"Shadow engine failed (hub continues without it): {e}")
-
-        # data_quality (non-fatal)
-        try:
-            from aria.modules.data_quality import DataQualityModule
-
-            data_quality = DataQualityModule(hub)
-            hub.register_module(data_quality)
-            await _init_module(data_quality, "data_quality")()
-        except Exception as e:
-            logger.warning(f"Data quality module failed (non-fatal): {e}")
+            for sig in handled_signals:
+                loop.add_signal_handler(sig, asyncio.current_task().cancel)
+        except NotImplementedError:  # event loops without signal support (Windows)
+            handled_signals = ()
 
-        # organic_discovery (non-fatal)
-        try:
-            from aria.modules.organic_discovery.module import OrganicDiscoveryModule
-            organic_discovery = OrganicDiscoveryModule(hub)
-            hub.register_module(organic_discovery)
-            await _init_module(organic_discovery, "organic_discovery")()
-        except Exception as e:
-            logger.warning(f"Organic discovery module failed (non-fatal): {e}")
-
-        # intelligence (non-fatal)
-        intel_mod = IntelligenceModule(hub, intelligence_dir)
-        hub.register_module(intel_mod)
         try:
-            await _init_module(intel_mod, "intelligence")()
-            await intel_mod.schedule_refresh()
-        except Exception as e:
-            logger.warning(f"Intelligence module failed (non-fatal): {e}")
+            # Seed config defaults
+            try:
+                from aria.hub.config_defaults import seed_config_defaults
+
+                seeded = await seed_config_defaults(hub.cache)
+                if seeded:
+                    logger.info(f"Seeded {seeded} new config parameter(s)")
+            except Exception as e:
+                logger.warning(f"Config seeding failed (non-fatal): {e}")
+
+            # HA credentials
+            ha_url = os.environ.get("HA_URL")
+            ha_token = os.environ.get("HA_TOKEN")
+            if not ha_url or not ha_token:
+                logger.error("HA_URL and HA_TOKEN environment variables required")
+                await hub.shutdown()
+                return
+
+            intelligence_dir = str(cache_dir.parent)
+            models_dir = os.path.join(intelligence_dir, "models")
+            training_data_dir = os.path.join(intelligence_dir, "daily")
+
+            # Register and initialize modules, tracking success/failure
+            def _init_module(module, name):
+                """Register and mark module status after init attempt."""
+
+                async def _do():
+                    try:
+                        await module.initialize()
+                        hub.mark_module_running(name)
+                    except Exception:
+                        hub.mark_module_failed(name)
+                        raise
+
+                return _do
+
+            # discovery
+            discovery = DiscoveryModule(hub, ha_url, ha_token)
+            hub.register_module(discovery)
+            await _init_module(discovery, "discovery")()
+            await discovery.schedule_periodic_discovery(interval_hours=24)
+            try:
+                await discovery.start_event_listener()
+            except Exception as e:
+                logger.warning(f"Event listener failed to start (non-fatal): {e}")
+
+            # ml_engine
+            ml_engine = MLEngine(hub, models_dir, training_data_dir)
+            hub.register_module(ml_engine)
+            await _init_module(ml_engine, "ml_engine")()
+            await ml_engine.schedule_periodic_training(interval_days=7)
+
+            # pattern_recognition
+            log_dir = Path(intelligence_dir)
+            patterns = PatternRecognition(hub, log_dir)
+            hub.register_module(patterns)
+            await _init_module(patterns, "pattern_recognition")()
+
+            # orchestrator
+            orchestrator = OrchestratorModule(hub, ha_url, ha_token)
+            hub.register_module(orchestrator)
+            await _init_module(orchestrator, "orchestrator")()
+
+            # shadow_engine (non-fatal)
+            try:
+                shadow_engine = ShadowEngine(hub)
+                hub.register_module(shadow_engine)
+                await _init_module(shadow_engine, "shadow_engine")()
+            except Exception as e:
+                logger.error(f"Shadow engine failed (hub continues without it): {e}")
 
-        # activity_monitor (non-fatal)
-        try:
-            activity_monitor = ActivityMonitor(hub, ha_url, ha_token)
-            hub.register_module(activity_monitor)
-            await _init_module(activity_monitor, "activity_monitor")()
-        except Exception as e:
-            logger.warning(f"Activity monitor failed (non-fatal): {e}")
+            # data_quality (non-fatal)
+            try:
+                from aria.modules.data_quality import DataQualityModule
 
-        # activity_labeler (non-fatal)
-        try:
-            from aria.modules.activity_labeler import ActivityLabeler
-            activity_labeler = ActivityLabeler(hub)
-            hub.register_module(activity_labeler)
-            await _init_module(activity_labeler, "activity_labeler")()
-        except Exception as e:
-            logger.warning(f"Activity labeler module failed (non-fatal): {e}")
-
-        # Module load summary
-        total = len(hub.module_status)
-        running = sum(1 for s in hub.module_status.values() if s == "running")
-        failed = [mid for mid, s in hub.module_status.items() if s == "failed"]
-        if failed:
-            logger.warning(f"Loaded {running}/{total} modules ({', '.join(failed)} failed)")
-        else:
-            logger.info(f"Loaded {running}/{total} modules (all healthy)")
+                data_quality = DataQualityModule(hub)
+                hub.register_module(data_quality)
+                await _init_module(data_quality, "data_quality")()
+            except Exception as e:
+                logger.warning(f"Data quality module failed (non-fatal): {e}")
 
-        app = create_api(hub)
+            # organic_discovery (non-fatal)
+            try:
+                from aria.modules.organic_discovery.module import OrganicDiscoveryModule
+                organic_discovery = OrganicDiscoveryModule(hub)
+                hub.register_module(organic_discovery)
+                await _init_module(organic_discovery, "organic_discovery")()
+            except Exception as e:
+                logger.warning(f"Organic discovery module failed (non-fatal): {e}")
+
+            # intelligence (non-fatal)
+            intel_mod = IntelligenceModule(hub, intelligence_dir)
+            hub.register_module(intel_mod)
+            try:
+                await _init_module(intel_mod, "intelligence")()
+                await intel_mod.schedule_refresh()
+            except Exception as e:
+                logger.warning(f"Intelligence module failed (non-fatal): {e}")
 
-        config = uvicorn.Config(
-            app,
-            host=host,
-            port=port,
-            log_level=log_level.lower(),
-            access_log=(log_level != "WARNING"),
-        )
-        server = uvicorn.Server(config)
+            # activity_monitor (non-fatal)
+            try:
+                activity_monitor = ActivityMonitor(hub, ha_url, ha_token)
+                hub.register_module(activity_monitor)
+                await _init_module(activity_monitor, "activity_monitor")()
+            except Exception as e:
+                logger.warning(f"Activity monitor failed (non-fatal): {e}")
 
-        try:
+            # activity_labeler (non-fatal)
+            try:
+                from aria.modules.activity_labeler import ActivityLabeler
+                activity_labeler = ActivityLabeler(hub)
+                hub.register_module(activity_labeler)
+                await _init_module(activity_labeler, "activity_labeler")()
+            except Exception as e:
+                logger.warning(f"Activity labeler module failed (non-fatal): {e}")
+
+            # Module load summary
+            total = len(hub.module_status)
+            running = sum(1 for s in hub.module_status.values() if s == "running")
+            failed = [mid for mid, s in hub.module_status.items() if s == "failed"]
+            if failed:
+                logger.warning(f"Loaded {running}/{total} modules ({', '.join(failed)} failed)")
+            else:
+                logger.info(f"Loaded {running}/{total} modules (all healthy)")
+
+            app = create_api(hub)
+
+            # Per-request access lines are only emitted with --verbose; at INFO they
+            # cost a log record per dashboard poll. http/ws stay "auto", which picks
+            # httptools and websockets (uvicorn[standard]) when they are installed.
+            config = uvicorn.Config(
+                app,
+                host=host,
+                port=port,
+                log_level=log_level.lower(),
+                access_log=(log_level == "DEBUG"),
+            )
+            server = uvicorn.Server(config)
+
+            # uvicorn installs its own SIGINT/SIGTERM handling for the serve loop
+            for sig in handled_signals:
+                loop.remove_signal_handler(sig)
             await server.serve()
+        except asyncio.CancelledError:
+            logger.info("Startup interrupted by signal — shutting down")
         finally:
             if hub.is_running():
                 await hub.shutdown()
 
-    asyncio.run(start())
+    # uvloop (installed with uvicorn[standard] on non-Windows) when available.
+    # uvicorn's own loop setting does not apply because we drive server.serve()
+    # from our loop, so the choice is made here.
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(start())
+    else:
+        uvloop.run(start())
 
 
 def _demo(args):
@@ -86,7 +86,7 @@ def build_intraday_snapshot(hour: int | None, date_str: str | None, config: AppC
         snapshot["lights"]["rooms_lit"] = rooms_lit
 
         # Motion active count
-        snapshot["motion"]["active_count"] = sum(1 for v in snapshot["motion"]["sensors"].values() if v == "on")
+        snapshot["motion"]["active_count"] = list(snapshot["motion"]["sensors"].values()).count("on")
 
         # Add is_charging for EV
         for ev_name, ev_data in snapshot["ev"].items():
@@ -3,8 +3,10 @@
 Replaces module-level globals with type-safe, testable config objects.
 """
 
+import copy
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -125,6 +127,17 @@ class SafetyConfig:
     safety_entities: set = field(default_factory=lambda: {"lock.", "alarm_", "camera."})
 
 
+@lru_cache(maxsize=8)
+def _load_holidays(country: str, years: tuple):
+    """Build (once per country/years) the holiday calendar; {} if holidays package unavailable."""
+    try:
+        import holidays as holidays_lib
+
+        return holidays_lib.country_holidays(country, years=list(years))
+    except ImportError:
+        return {}
+
+
 @dataclass
 class HolidayConfig:
     """Holiday calendar."""
@@ -133,13 +146,17 @@ class HolidayConfig:
     years: tuple = (2025, 2026, 2027, 2028)
 
     def get_holidays(self):
-        """Load holiday calendar. Returns empty dict if holidays package unavailable."""
-        try:
-            import holidays as holidays_lib
-
-            return holidays_lib.country_holidays(self.country, years=list(self.years))
-        except ImportError:
-            return {}
+        """Load holiday calendar. Returns empty dict if holidays package unavailable.
+
+        The calendar is built once per country/years and each call gets its own
+        shallow copy: lookups outside ``years`` expand the calendar in place, which
+        must not leak into other callers. The copy gets its own ``years`` set too,
+        since that set is what marks a year as already expanded.
+        """
+        calendar = copy.copy(_load_holidays(self.country, tuple(self.years)))
+        if hasattr(calendar, "years"):
+            calendar.years = set(calendar.years)
+        return calendar
 
 
 @dataclass
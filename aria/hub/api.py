@@ -3,6 +3,7 @@
 import os
 import sys
 import time
+from collections import OrderedDict
 from pathlib import Path
 from fastapi import (
     APIRouter,
@@ -16,17 +17,30 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.security import APIKeyHeader
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 import logging
 import json
 from datetime import datetime
 
 from aria.hub.core import IntelligenceHub
 
+try:
+    import orjson
+
+    class _JSONResponse(JSONResponse):
+        """JSONResponse rendered by orjson, with the options the hub cache encodes with."""
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+except ImportError:
+    _JSONResponse = JSONResponse
+
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +105,81 @@ class WebSocketManager:
             self.disconnect(conn)
 
 
+def _cache_etag(entry: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Weak ETag for a cache entry, from its category, version and write time.
+
+    Takes a full entry or a CacheManager.get_revision result. Every cache write
+    bumps the version and last_updated, so the tag changes whenever the payload
+    may have. The tag is weak because GZipMiddleware sends the same one for gzip
+    and identity bodies. Returns None for missing or unversioned entries.
+    """
+    if not entry or entry.get("version") is None:
+        return None
+    return f'W/"{entry.get("category")}-{entry["version"]}-{entry.get("last_updated")}"'
+
+
+# Encoded response bodies kept per (path, ETag) by _conditional_response
+_BODY_CACHE_SIZE = 8
+
+
+def _cached_response(
+    request: Request,
+    etag: Optional[str],
+    bodies: Optional["OrderedDict[Tuple[str, str], bytes]"] = None,
+) -> Optional[Response]:
+    """Bodiless 304 when the client already has etag, or the kept encoded body for it.
+
+    Returns None when the payload has to be loaded and encoded, so endpoints
+    can call this with the tag from CacheManager.get_revision before decoding
+    the entry. If-None-Match uses weak comparison, and ``*`` matches any
+    current entry.
+    """
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    opaque = etag.removeprefix("W/")
+    for tag in request.headers.get("if-none-match", "").split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return Response(status_code=304, headers=headers)
+    if bodies is None:
+        return None
+
+    key = (request.url.path, etag)
+    body = bodies.get(key)
+    if body is None:
+        return None
+    bodies.move_to_end(key)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _conditional_response(
+    request: Request,
+    content: Any,
+    etag: Optional[str],
+    bodies: Optional["OrderedDict[Tuple[str, str], bytes]"] = None,
+) -> Response:
+    """JSON response carrying etag, or a bodiless 304 when the client already has it.
+
+    When ``bodies`` is given, the encoded JSON is kept per (path, etag), so a
+    client without the tag still skips re-encoding unchanged data.
+    """
+    if etag is None:
+        return _JSONResponse(content=content)
+    cached = _cached_response(request, etag, bodies)
+    if cached is not None:
+        return cached
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if bodies is None:
+        return _JSONResponse(content=content, headers=headers)
+
+    body = _JSONResponse(content=content).body
+    bodies[(request.url.path, etag)] = body
+    while len(bodies) > _BODY_CACHE_SIZE:
+        bodies.popitem(last=False)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 def create_api(hub: IntelligenceHub) -> FastAPI:
     """Create FastAPI application with hub routes.
 
@@ -106,9 +195,14 @@ def create_api(hub: IntelligenceHub) -> FastAPI:
         title="ARIA",
         description="REST API for ARIA — Adaptive Residence Intelligence Architecture",
         version=__version__,
+        default_response_class=_JSONResponse,
     )
+    # Large JSON (discovery history, capabilities, dashboard assets) compresses ~10x;
+    # small responses stay uncompressed
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
     ws_manager = WebSocketManager()
+    response_bodies: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
 
     # --- Request timing middleware ---
     @app.middleware("http")
@@ -167,17 +261,7 @@ def create_api(hub: IntelligenceHub) -> FastAPI:
     async def list_cache_keys():
         """List all cached categories with last-updated timestamps."""
         try:
-            categories = await hub.cache.list_categories()
-            keys = []
-            for cat in categories:
-                entry = await hub.cache.get(cat)
-                keys.append(
-                    {
-                        "category": cat,
-                        "last_updated": entry.get("last_updated") if entry else None,
-                        "version": entry.get("version") if entry else None,
-                    }
-                )
+            keys = await hub.cache.list_entries()
             return {"keys": keys, "count": len(keys)}
         except Exception:
             logger.exception("Error listing cache keys")
@@ -396,20 +480,28 @@ def create_api(hub: IntelligenceHub) -> FastAPI:
     # --- Organic discovery endpoints ---
 
     @router.get("/api/capabilities/candidates")
-    async def get_capability_candidates():
-        """Return only candidate capabilities."""
+    async def get_capability_candidates(request: Request):
+        """Return only candidate capabilities (ETag / If-None-Match aware)."""
+        # Revalidation and repeat requests are answered from the version alone, before decoding the entry
+        hit = _cached_response(request, _cache_etag(await hub.cache.get_revision("capabilities")), response_bodies)
+        if hit is not None:
+            return hit
         cached = await hub.cache.get("capabilities")
         if not cached or not cached.get("data"):
             return {}
-        return {name: cap for name, cap in cached["data"].items() if cap.get("status") == "candidate"}
+        candidates = {name: cap for name, cap in cached["data"].items() if cap.get("status") == "candidate"}
+        return _conditional_response(request, candidates, _cache_etag(cached), response_bodies)
 
     @router.get("/api/capabilities/history")
-    async def get_discovery_history():
-        """Return discovery run history."""
+    async def get_discovery_history(request: Request):
+        """Return discovery run history (ETag / If-None-Match aware)."""
+        hit = _cached_response(request, _cache_etag(await hub.cache.get_revision("discovery_history")), response_bodies)
+        if hit is not None:
+            return hit
         cached = await hub.cache.get("discovery_history")
         if not cached or not cached.get("data"):
             return []
-        return cached["data"]
+        return _conditional_response(request, cached["data"], _cache_etag(cached), response_bodies)
 
     @router.put("/api/capabilities/{capability_name}/promote")
     async def promote_capability(capability_name: str):
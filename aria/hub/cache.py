@@ -1,198 +1,564 @@
 """SQLite cache manager with JSON columns and versioning."""
 
+import asyncio
 import json
+import logging
 import aiosqlite
 import os
+from time import time_ns
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Any, Optional, Dict, List
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional, Dict, List, Union
+
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    _json_loads = orjson.loads
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
+try:
+    import zstandard
+
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Connection tuning applied on every initialize()
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=5000;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Read-only pool connections share the mmap window instead of a private page cache
+READER_PRAGMAS = """
+    PRAGMA query_only=1;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA busy_timeout=5000;
+    PRAGMA mmap_size=268435456;
+"""
+
+MAX_READ_POOL_SIZE = 8
+
+# Cache payloads at least this large are zstd-compressed when zstandard is installed.
+# Compressed rows are recognized by the zstd frame magic, which JSON can never start with.
+COMPRESS_MIN_BYTES = 4096
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Per-connection prepared statement cache (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Categories whose encoded row get() keeps in memory (least recently used evicted)
+ROW_MEMO_SIZE = 64
+
+# Buffered event log: flushed every EVENT_FLUSH_INTERVAL_MS or once this many are queued
+EVENT_FLUSH_INTERVAL_MS = 100
+EVENT_FLUSH_BATCH_SIZE = 256
+
+# Rows pulled per reader round trip while iterating events
+EVENT_FETCH_BATCH_SIZE = 32
+
+# Normalized discovery tables: table -> (key column, indexed columns copied from the record)
+_REGISTRY_TABLES = {
+    "entities": ("entity_id", ("area_id", "device_id", "domain")),
+    "devices": ("device_id", ("area_id",)),
+    "areas": ("area_id", ()),
+}
+
+RegistryRecords = Union[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]
+
+# Bump SCHEMA_VERSION whenever SCHEMA_SQL changes; initialize() applies the
+# script (in one transaction) only to databases stamped with an older version.
+SCHEMA_VERSION = 1
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS cache (
+        category TEXT PRIMARY KEY,
+        data BLOB NOT NULL,
+        version INTEGER NOT NULL DEFAULT 1,
+        last_updated TEXT NOT NULL,
+        metadata BLOB
+    );
+
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp INTEGER NOT NULL,
+        event_type TEXT NOT NULL,
+        category TEXT,
+        data BLOB,
+        metadata BLOB
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_events_timestamp
+    ON events(timestamp DESC);
+
+    -- Serve filtered event tails (WHERE ... ORDER BY timestamp DESC LIMIT) from the index.
+    -- idx_events_type_ts also covers plain event_type lookups, replacing idx_events_type.
+    DROP INDEX IF EXISTS idx_events_type;
+
+    CREATE INDEX IF NOT EXISTS idx_events_type_ts
+    ON events(event_type, timestamp DESC);
+
+    CREATE INDEX IF NOT EXISTS idx_events_cat_ts
+    ON events(category, timestamp DESC);
+
+    -- Shadow engine tables
+    CREATE TABLE IF NOT EXISTS predictions (
+        id TEXT PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        context TEXT NOT NULL,
+        predictions TEXT NOT NULL,
+        outcome TEXT,
+        actual TEXT,
+        confidence REAL NOT NULL,
+        is_exploration BOOLEAN DEFAULT FALSE,
+        propagated_count INTEGER DEFAULT 0,
+        window_seconds INTEGER NOT NULL,
+        resolved_at TEXT
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_predictions_timestamp
+    ON predictions(timestamp DESC);
+
+    CREATE INDEX IF NOT EXISTS idx_predictions_outcome
+    ON predictions(outcome);
+
+    CREATE TABLE IF NOT EXISTS pipeline_state (
+        id INTEGER PRIMARY KEY DEFAULT 1,
+        current_stage TEXT NOT NULL DEFAULT 'backtest',
+        stage_entered_at TEXT NOT NULL,
+        backtest_accuracy REAL,
+        shadow_accuracy_7d REAL,
+        suggest_approval_rate_14d REAL,
+        autonomous_contexts TEXT,
+        updated_at TEXT NOT NULL
+    );
+
+    -- Phase 2: Config store
+    CREATE TABLE IF NOT EXISTS config (
+        key TEXT PRIMARY KEY,
+        value TEXT,
+        default_value TEXT,
+        value_type TEXT NOT NULL,
+        label TEXT,
+        description TEXT,
+        category TEXT,
+        min_value REAL,
+        max_value REAL,
+        options TEXT,
+        step REAL,
+        updated_at TEXT NOT NULL
+    );
+
+    -- Phase 2: Entity curation
+    CREATE TABLE IF NOT EXISTS entity_curation (
+        entity_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        tier INTEGER NOT NULL,
+        reason TEXT,
+        auto_classification TEXT,
+        human_override BOOLEAN DEFAULT FALSE,
+        metrics TEXT,
+        group_id TEXT,
+        decided_at TEXT NOT NULL,
+        decided_by TEXT
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_entity_curation_tier
+    ON entity_curation(tier);
+
+    CREATE INDEX IF NOT EXISTS idx_entity_curation_status
+    ON entity_curation(status);
+
+    -- Phase 2: Config change history
+    CREATE TABLE IF NOT EXISTS config_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        key TEXT NOT NULL,
+        old_value TEXT,
+        new_value TEXT,
+        changed_at TEXT NOT NULL,
+        changed_by TEXT
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_config_history_key
+    ON config_history(key);
+
+    -- Thompson Sampling state persistence
+    CREATE TABLE IF NOT EXISTS thompson_state (
+        id INTEGER PRIMARY KEY DEFAULT 1,
+        state TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+
+    -- Correction propagation replay buffer
+    CREATE TABLE IF NOT EXISTS propagation_buffer (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        prediction_id TEXT NOT NULL,
+        context TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        priority REAL NOT NULL,
+        created_at TEXT NOT NULL
+    );
+
+    -- Discovery registries, one row per entity/device/area (attrs = full record JSON)
+    CREATE TABLE IF NOT EXISTS entities (
+        entity_id TEXT PRIMARY KEY,
+        area_id TEXT,
+        device_id TEXT,
+        domain TEXT,
+        attrs BLOB,
+        updated_at TEXT
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_entities_area_domain
+    ON entities(area_id, domain);
+
+    CREATE TABLE IF NOT EXISTS devices (
+        device_id TEXT PRIMARY KEY,
+        area_id TEXT,
+        attrs BLOB,
+        updated_at TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS areas (
+        area_id TEXT PRIMARY KEY,
+        attrs BLOB,
+        updated_at TEXT
+    );
+"""
+
+# Hot-path statements, kept as constants so every call hits the statement cache
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (timestamp, event_type, category, data, metadata)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# get_events query per (filter by event_type, filter by category); columns are
+# spelled out so a column added to events later is not decoded on every read
+_EVENT_COLUMNS = "id, timestamp, event_type, category, data, metadata"
+_SELECT_EVENTS_SQL = {
+    (False, False): f"SELECT {_EVENT_COLUMNS} FROM events ORDER BY timestamp DESC LIMIT ?",
+    (True, False): f"SELECT {_EVENT_COLUMNS} FROM events WHERE event_type = ? ORDER BY timestamp DESC LIMIT ?",
+    (False, True): f"SELECT {_EVENT_COLUMNS} FROM events WHERE category = ? ORDER BY timestamp DESC LIMIT ?",
+    (True, True): (
+        f"SELECT {_EVENT_COLUMNS} FROM events WHERE event_type = ? AND category = ? ORDER BY timestamp DESC LIMIT ?"
+    ),
+}
+
+_SELECT_CACHE_ROW_SQL = "SELECT data, version, last_updated, metadata FROM cache WHERE category = ?"
+_SELECT_CACHE_VERSION_SQL = "SELECT version FROM cache WHERE category = ?"
+_SELECT_CACHE_REVISION_SQL = "SELECT version, last_updated FROM cache WHERE category = ?"
+
+_UPSERT_CACHE_ROW_SQL = """
+    INSERT INTO cache (category, data, version, last_updated, metadata)
+    VALUES (?, ?, 1, ?, ?)
+    ON CONFLICT(category) DO UPDATE SET
+        data = excluded.data,
+        version = cache.version + 1,
+        last_updated = excluded.last_updated,
+        metadata = excluded.metadata
+    RETURNING version
+"""
+
+
+def _pack_blob(encoded: bytes) -> bytes:
+    """Compress an encoded JSON payload for storage if it is worth it."""
+    if zstandard is not None and len(encoded) >= COMPRESS_MIN_BYTES:
+        return _ZSTD_COMPRESSOR.compress(encoded)
+    return encoded
+
+
+def _unpack_blob(stored: Union[bytes, str]) -> Union[bytes, str]:
+    """Undo _pack_blob; uncompressed and legacy TEXT values pass through."""
+    if isinstance(stored, bytes) and stored[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("Cache row is zstd-compressed; install zstandard to read it")
+        return _ZSTD_DECOMPRESSOR.decompress(stored)
+    return stored
 
 
 class CacheManager:
-    """Manages SQLite cache for hub data storage."""
+    """Manages SQLite cache for hub data storage.
+
+    All writes go through a single writer connection; reads are served by a
+    pool of read-only connections so they are not queued behind writes.
+    """
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        read_pool_size: Optional[int] = None,
+        flush_interval_ms: int = EVENT_FLUSH_INTERVAL_MS,
+    ):
         """Initialize cache manager.
 
         Args:
             db_path: Path to SQLite database file
+            read_pool_size: Number of read-only connections (default: CPU count, max 8)
+            flush_interval_ms: How often buffered events are written to the events table
         """
         self.db_path = db_path
-        self._conn: Optional[aiosqlite.Connection] = None
+        self.read_pool_size = read_pool_size or min(os.cpu_count() or 1, MAX_READ_POOL_SIZE)
+        self.flush_interval_ms = flush_interval_ms
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: Optional[asyncio.Queue[aiosqlite.Connection]] = None
+        self._reader_conns: List[aiosqlite.Connection] = []
+        self._event_buf: deque[tuple] = deque()
+        self._flush_wakeup = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        # category -> (data, version, last_updated, metadata) as committed, written
+        # through by set() and dropped by delete(); assumes this manager is the
+        # only writer of the cache table.
+        self._row_memo: OrderedDict[str, tuple] = OrderedDict()
+        self._row_memo_epoch = 0
+        # Serializes writers: held per write method, or for a whole transaction() block
+        self._write_lock = asyncio.Lock()
+        # Task that opened the current transaction() block, and the cache rows it
+        # wrote (None = deleted), applied to the memo only once the block commits
+        self._tx_task: Optional[asyncio.Task] = None
+        self._tx_rows: Dict[str, Optional[tuple]] = {}
 
     async def initialize(self):
-        """Initialize database schema."""
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-
-        # Connect to database
-        self._conn = await aiosqlite.connect(self.db_path)
-        self._conn.row_factory = aiosqlite.Row
-
-        # Enable WAL mode for concurrent reads + busy timeout for lock contention
-        await self._conn.execute("PRAGMA journal_mode=WAL")
-        await self._conn.execute("PRAGMA busy_timeout=5000")
-
-        # Create tables
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS cache (
-                category TEXT PRIMARY KEY,
-                data TEXT NOT NULL,
-                version INTEGER NOT NULL DEFAULT 1,
-                last_updated TEXT NOT NULL,
-                metadata TEXT
-            )
-        """)
-
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                event_type TEXT NOT NULL,
-                category TEXT,
-                data TEXT,
-                metadata TEXT
-            )
-        """)
+        """Initialize database schema and open the writer and reader connections."""
+        # Re-initializing replaces any open connections
+        await self.close()
 
-        await self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_events_timestamp
-            ON events(timestamp DESC)
-        """)
+        # Ensure directory exists (off the loop; the stat/mkdir can block on slow disks)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(self.db_path), exist_ok=True)
 
-        await self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_events_type
-            ON events(event_type)
-        """)
-
-        # Shadow engine tables
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS predictions (
-                id TEXT PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                context TEXT NOT NULL,
-                predictions TEXT NOT NULL,
-                outcome TEXT,
-                actual TEXT,
-                confidence REAL NOT NULL,
-                is_exploration BOOLEAN DEFAULT FALSE,
-                propagated_count INTEGER DEFAULT 0,
-                window_seconds INTEGER NOT NULL,
-                resolved_at TEXT
-            )
-        """)
-
-        await self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_predictions_timestamp
-            ON predictions(timestamp DESC)
-        """)
-
-        await self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_predictions_outcome
-            ON predictions(outcome)
-        """)
-
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS pipeline_state (
-                id INTEGER PRIMARY KEY DEFAULT 1,
-                current_stage TEXT NOT NULL DEFAULT 'backtest',
-                stage_entered_at TEXT NOT NULL,
-                backtest_accuracy REAL,
-                shadow_accuracy_7d REAL,
-                suggest_approval_rate_14d REAL,
-                autonomous_contexts TEXT,
-                updated_at TEXT NOT NULL
-            )
-        """)
+        # Writer: implicit transactions start with BEGIN IMMEDIATE so the write
+        # lock is taken up front instead of on a deferred upgrade.
+        self._writer = await aiosqlite.connect(
+            self.db_path, isolation_level="IMMEDIATE", cached_statements=STATEMENT_CACHE_SIZE
+        )
+        self._writer.row_factory = aiosqlite.Row
 
-        # Phase 2: Config store
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS config (
-                key TEXT PRIMARY KEY,
-                value TEXT,
-                default_value TEXT,
-                value_type TEXT NOT NULL,
-                label TEXT,
-                description TEXT,
-                category TEXT,
-                min_value REAL,
-                max_value REAL,
-                options TEXT,
-                step REAL,
-                updated_at TEXT NOT NULL
+        # WAL lets readers proceed during writes; synchronous=NORMAL is durable
+        # under WAL and drops the per-commit fsync of the rollback journal.
+        await self._writer.executescript(SQLITE_PRAGMAS)
+        cursor = await self._writer.execute("PRAGMA journal_mode")
+        row = await cursor.fetchone()
+        if row[0].lower() != "wal":
+            logger.warning(f"SQLite journal_mode is {row[0]!r}, expected 'wal' ({self.db_path})")
+
+        # Schema DDL runs only when the database is behind SCHEMA_VERSION, so warm
+        # starts skip it entirely. Every statement is idempotent, which lets
+        # databases from before the version stamp upgrade in place.
+        cursor = await self._writer.execute("PRAGMA user_version")
+        (version,) = await cursor.fetchone()
+        if version < SCHEMA_VERSION:
+            await self._migrate_event_timestamps()
+            await self._writer.executescript(
+                f"BEGIN IMMEDIATE;\n{SCHEMA_SQL}\nPRAGMA user_version = {SCHEMA_VERSION};\nCOMMIT;"
             )
-        """)
 
-        # Phase 2: Entity curation
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS entity_curation (
-                entity_id TEXT PRIMARY KEY,
-                status TEXT NOT NULL,
-                tier INTEGER NOT NULL,
-                reason TEXT,
-                auto_classification TEXT,
-                human_override BOOLEAN DEFAULT FALSE,
-                metrics TEXT,
-                group_id TEXT,
-                decided_at TEXT NOT NULL,
-                decided_by TEXT
-            )
-        """)
+        await self._open_readers()
+        self._flush_task = asyncio.create_task(self._flush_loop())
 
-        await self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_entity_curation_tier
-            ON entity_curation(tier)
-        """)
+    async def _migrate_event_timestamps(self):
+        """Rebuild an events table from before timestamps were unix-ms INTEGERs.
 
-        await self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_entity_curation_status
-            ON entity_curation(status)
-        """)
+        Older databases stored datetime.now().isoformat() TEXT. Rows are
+        converted in place (as local time, like they were written); rows with
+        an unparseable timestamp are dropped. The indexes go with the old table
+        and are recreated by SCHEMA_SQL. A fresh database has no events table
+        yet and is left alone.
+        """
+        cursor = await self._writer.execute("PRAGMA table_info(events)")
+        column_types = {row["name"]: row["type"].upper() for row in await cursor.fetchall()}
+        if not column_types or column_types.get("timestamp") == "INTEGER":
+            return
 
-        # Phase 2: Config change history
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS config_history (
+        cursor = await self._writer.execute("SELECT id, timestamp, event_type, category, data, metadata FROM events")
+        rows = []
+        for row in await cursor.fetchall():
+            try:
+                ts_ms = int(datetime.fromisoformat(row["timestamp"]).timestamp() * 1000)
+            except (TypeError, ValueError):
+                continue
+            rows.append((row["id"], ts_ms, row["event_type"], row["category"], row["data"], row["metadata"]))
+
+        await self._writer.execute("BEGIN IMMEDIATE")
+        await self._writer.execute("ALTER TABLE events RENAME TO events_legacy")
+        await self._writer.execute("""
+            CREATE TABLE events (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                changed_at TEXT NOT NULL,
-                changed_by TEXT
-            )
-        """)
-
-        await self._conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_config_history_key
-            ON config_history(key)
-        """)
-
-        # Thompson Sampling state persistence
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS thompson_state (
-                id INTEGER PRIMARY KEY DEFAULT 1,
-                state TEXT NOT NULL,
-                updated_at TEXT NOT NULL
+                timestamp INTEGER NOT NULL,
+                event_type TEXT NOT NULL,
+                category TEXT,
+                data BLOB,
+                metadata BLOB
             )
         """)
+        await self._writer.executemany(
+            "INSERT INTO events (id, timestamp, event_type, category, data, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        await self._writer.execute("DROP TABLE events_legacy")
+        await self._writer.commit()
+        logger.info(f"Migrated {len(rows)} events to integer timestamps")
+
+    async def _open_readers(self):
+        """Open the read-only connection pool (the database must already exist)."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        self._readers = asyncio.Queue()
+        for _ in range(self.read_pool_size):
+            conn = await aiosqlite.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE)
+            conn.row_factory = aiosqlite.Row
+            await conn.executescript(READER_PRAGMAS)
+            self._reader_conns.append(conn)
+            self._readers.put_nowait(conn)
 
-        # Correction propagation replay buffer
-        await self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS propagation_buffer (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                prediction_id TEXT NOT NULL,
-                context TEXT NOT NULL,
-                confidence REAL NOT NULL,
-                priority REAL NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        """)
+    async def close(self):
+        """Flush buffered events, then close the writer and all reader connections."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self._writer:
+            await self.flush_events()
+        self._row_memo.clear()
+        for conn in self._reader_conns:
+            await conn.close()
+        self._reader_conns = []
+        self._readers = None
+        if self._writer:
+            await self._writer.close()
+            self._writer = None
+
+    @asynccontextmanager
+    async def _acquire_read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool."""
+        if not self._readers:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    def _owns_transaction(self) -> bool:
+        """Whether the calling task is the one that opened the current transaction() block."""
+        return self._tx_task is not None and self._tx_task is asyncio.current_task()
+
+    @asynccontextmanager
+    async def _writing(self) -> AsyncIterator[None]:
+        """Hold the writer for one write method's statements, then commit them.
+
+        Inside the caller's own transaction() block the statements join it and
+        the block commits. Every other writer waits for the write lock, so it
+        never joins (or commits) a transaction another task has open. A failed
+        write is rolled back rather than left for the next commit.
+        """
+        if self._owns_transaction():
+            yield
+            return
+        async with self._write_lock:
+            try:
+                yield
+            except BaseException:
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+                raise
+            await self._writer.commit()
+
+    def _record_row(self, category: str, row: Optional[tuple]):
+        """Note a written (or, with None, deleted) cache row for the memo.
+
+        Inside a transaction the row is held back until the block commits, so
+        other tasks never see uncommitted data through get().
+        """
+        if self._owns_transaction():
+            self._tx_rows[category] = row
+            return
+        self._row_memo_epoch += 1
+        if row is None:
+            self._row_memo.pop(category, None)
+        else:
+            self._remember_row(category, row)
+
+    def _memo_row(self, category: str) -> tuple:
+        """(known, row) for category from this task's transaction, else the committed memo."""
+        if self._owns_transaction() and category in self._tx_rows:
+            return True, self._tx_rows[category]
+        row = self._row_memo.get(category)
+        return row is not None, row
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Group writes into one BEGIN IMMEDIATE ... COMMIT.
+
+        The block holds the write lock throughout: write methods called from
+        the task that opened it skip their own commit, so the whole block costs
+        one commit, while writes from any other task (including ones spawned
+        inside the block) wait until it ends. Reads from inside the block go to the writer and see its
+        uncommitted rows; everyone else keeps reading committed data. On error
+        everything is rolled back. Buffered events are not flushed until the
+        block ends. Nested blocks join the outer transaction.
+        """
+        if not self._writer:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+        if self._owns_transaction():
+            yield
+            return
 
-        await self._conn.commit()
+        async with self._write_lock:
+            # No explicit BEGIN: the first write in the block starts BEGIN
+            # IMMEDIATE through the writer's isolation_level.
+            self._tx_task = asyncio.current_task()
+            try:
+                yield
+            except BaseException:
+                await self._writer.rollback()
+                raise
+            else:
+                await self._writer.commit()
+                for category, row in self._tx_rows.items():
+                    self._row_memo_epoch += 1
+                    if row is None:
+                        self._row_memo.pop(category, None)
+                    else:
+                        self._remember_row(category, row)
+            finally:
+                self._tx_task = None
+                self._tx_rows = {}
+
+    async def _fetchall(self, query: str, params=()) -> List[aiosqlite.Row]:
+        """Run a SELECT and return all rows.
+
+        Reads go to a pooled reader, except inside the caller's own transaction,
+        where only the writer can see the block's uncommitted writes.
+        """
+        if self._owns_transaction():
+            return list(await self._writer.execute_fetchall(query, params))
+        async with self._acquire_read() as conn:
+            return list(await conn.execute_fetchall(query, params))
 
-    async def close(self):
-        """Close database connection."""
-        if self._conn:
-            await self._conn.close()
-            self._conn = None
+    async def _fetchone(self, query: str, params=()) -> Optional[aiosqlite.Row]:
+        """Run a SELECT (see _fetchall) and return the first row, if any."""
+        rows = await self._fetchall(query, params)
+        return rows[0] if rows else None
 
     async def get(self, category: str) -> Optional[Dict[str, Any]]:
         """Get data from cache by category.
@@ -203,23 +569,97 @@ class CacheManager:
         Returns:
             Cache entry with data, version, last_updated, metadata or None if not found
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("SELECT * FROM cache WHERE category = ?", (category,))
-        row = await cursor.fetchone()
-
-        if not row:
+        # The memo holds the encoded (decompressed) row, not decoded dicts: every caller still
+        # gets its own objects to mutate, only the SQLite round trip is skipped.
+        known, memo = self._memo_row(category)
+        if not known:
+            epoch = self._row_memo_epoch
+            row = await self._fetchone(_SELECT_CACHE_ROW_SQL, (category,))
+            if not row:
+                return None
+            data, version, last_updated, metadata = row
+            memo = (_unpack_blob(data), version, last_updated, metadata)
+            # Skip memoizing if a set/delete landed while we were reading, or if the
+            # row came from inside a transaction and may not be committed yet
+            if epoch == self._row_memo_epoch and not self._owns_transaction():
+                self._remember_row(category, memo)
+        elif memo is None:
             return None
+        elif category in self._row_memo:
+            self._row_memo.move_to_end(category)
 
+        data, version, last_updated, metadata = memo
         return {
-            "category": row["category"],
-            "data": json.loads(row["data"]),
-            "version": row["version"],
-            "last_updated": row["last_updated"],
-            "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
+            "category": category,
+            "data": _json_loads(data),
+            "version": version,
+            "last_updated": last_updated,
+            "metadata": _json_loads(metadata) if metadata else None,
         }
 
+    async def get_version(self, category: str) -> Optional[int]:
+        """Get the current version of a cache entry without reading its payload.
+
+        Returns:
+            Version number, or None if the category is missing
+        """
+        if not self._writer:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+
+        known, memo = self._memo_row(category)
+        if known:
+            return memo[1] if memo is not None else None
+        row = await self._fetchone(_SELECT_CACHE_VERSION_SQL, (category,))
+        return row["version"] if row else None
+
+    async def get_revision(self, category: str) -> Optional[Dict[str, Any]]:
+        """Get a cache entry's category, version and last_updated without reading its payload.
+
+        Returns:
+            Dict with category, version and last_updated, or None if the category is missing
+        """
+        if not self._writer:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+
+        known, memo = self._memo_row(category)
+        if known:
+            if memo is None:
+                return None
+            version, last_updated = memo[1], memo[2]
+        else:
+            row = await self._fetchone(_SELECT_CACHE_REVISION_SQL, (category,))
+            if not row:
+                return None
+            version, last_updated = row["version"], row["last_updated"]
+        return {"category": category, "version": version, "last_updated": last_updated}
+
+    async def get_metadata(self, category: str) -> Optional[Dict[str, Any]]:
+        """Get only the metadata of a cache entry, without decoding its data.
+
+        Returns:
+            Metadata dict, or None if the category is missing or has no metadata
+        """
+        if not self._writer:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+
+        known, memo = self._memo_row(category)
+        if known:
+            metadata = memo[3] if memo is not None else None
+        else:
+            row = await self._fetchone("SELECT metadata FROM cache WHERE category = ?", (category,))
+            metadata = row["metadata"] if row else None
+        return _json_loads(metadata) if metadata else None
+
+    def _remember_row(self, category: str, row: tuple):
+        """Store an encoded cache row in the LRU memo."""
+        self._row_memo[category] = row
+        self._row_memo.move_to_end(category)
+        if len(self._row_memo) > ROW_MEMO_SIZE:
+            self._row_memo.popitem(last=False)
+
     async def set(self, category: str, data: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> int:
         """Set data in cache, incrementing version.
 
@@ -231,34 +671,23 @@ class CacheManager:
         Returns:
             New version number
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        # Get current version
-        current = await self.get(category)
-        new_version = (current["version"] + 1) if current else 1
+        encoded_data = _json_dumps(data)
+        encoded_metadata = _json_dumps(metadata) if metadata else None
+        last_updated = datetime.now().isoformat()
 
-        # Store data
-        await self._conn.execute(
-            """
-            INSERT INTO cache (category, data, version, last_updated, metadata)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(category) DO UPDATE SET
-                data = excluded.data,
-                version = excluded.version,
-                last_updated = excluded.last_updated,
-                metadata = excluded.metadata
-            """,
-            (
-                category,
-                json.dumps(data),
-                new_version,
-                datetime.now().isoformat(),
-                json.dumps(metadata) if metadata else None,
-            ),
-        )
+        # Upsert and bump the version in one statement
+        async with self._writing():
+            cursor = await self._writer.execute(
+                _UPSERT_CACHE_ROW_SQL, (category, _pack_blob(encoded_data), last_updated, encoded_metadata)
+            )
+            row = await cursor.fetchone()
+            await cursor.close()
+        new_version = row[0]
 
-        await self._conn.commit()
+        self._record_row(category, (encoded_data, new_version, last_updated, encoded_metadata))
 
         return new_version
 
@@ -271,11 +700,13 @@ class CacheManager:
         Returns:
             True if deleted, False if not found
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("DELETE FROM cache WHERE category = ?", (category,))
-        await self._conn.commit()
+        async with self._writing():
+            cursor = await self._writer.execute("DELETE FROM cache WHERE category = ?", (category,))
+
+        self._record_row(category, None)
 
         deleted = cursor.rowcount > 0
         if deleted:
@@ -289,13 +720,24 @@ class CacheManager:
         Returns:
             List of category names
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("SELECT category FROM cache ORDER BY category")
-        rows = await cursor.fetchall()
+        rows = await self._fetchall("SELECT category FROM cache ORDER BY category")
         return [row["category"] for row in rows]
 
+    async def list_entries(self) -> List[Dict[str, Any]]:
+        """List all cache categories with version and last_updated, without payloads.
+
+        Returns:
+            List of dicts with category, version, last_updated (ordered by category)
+        """
+        if not self._writer:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+
+        rows = await self._fetchall("SELECT category, version, last_updated FROM cache ORDER BY category")
+        return [dict(row) for row in rows]
+
     async def log_event(
         self,
         event_type: str,
@@ -303,7 +745,7 @@ class CacheManager:
         data: Optional[Dict[str, Any]] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ):
-        """Log an event to the events table.
+        """Queue an event for the events table (written by the background flusher).
 
         Args:
             event_type: Type of event (e.g., "cache_update", "module_registered")
@@ -311,68 +753,115 @@ class CacheManager:
             data: Event data (optional)
             metadata: Event metadata (optional)
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        await self._conn.execute(
-            """
-            INSERT INTO events (timestamp, event_type, category, data, metadata)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+        # Buffered; _flush_loop writes the batch in one transaction
+        self._event_buf.append(
             (
-                datetime.now().isoformat(),
+                time_ns() // 1_000_000,
                 event_type,
                 category,
-                json.dumps(data) if data else None,
-                json.dumps(metadata) if metadata else None,
-            ),
+                _json_dumps(data) if data else None,
+                _json_dumps(metadata) if metadata else None,
+            )
         )
-        await self._conn.commit()
+        if len(self._event_buf) >= EVENT_FLUSH_BATCH_SIZE:
+            self._flush_wakeup.set()
 
-    async def get_events(
+    async def flush_events(self) -> int:
+        """Write all buffered events in a single transaction.
+
+        Deferred (returns 0) when called from inside a transaction() block, so a
+        rollback there cannot drop events that were already taken off the
+        buffer; other callers wait for the block to end.
+
+        Returns:
+            Number of events written
+        """
+        if not self._event_buf or self._owns_transaction():
+            return 0
+        batch: deque = deque()
+        try:
+            async with self._writing():
+                batch, self._event_buf = self._event_buf, deque()
+                if batch:
+                    await self._writer.executemany(_INSERT_EVENT_SQL, batch)
+        except BaseException:
+            # Keep the events (ahead of any logged meanwhile) for the next flush. This
+            # includes cancellation: close() cancels the flusher mid-write, then flushes again
+            self._event_buf.extendleft(reversed(batch))
+            raise
+        return len(batch)
+
+    async def _flush_loop(self):
+        """Flush buffered events on a timer, or early when a full batch is queued."""
+        interval = self.flush_interval_ms / 1000
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            try:
+                await self.flush_events()
+            except Exception as e:
+                logger.error(f"Event flush failed: {e}")
+
+    async def iter_events(
         self, event_type: Optional[str] = None, category: Optional[str] = None, limit: int = 100
-    ) -> List[Dict[str, Any]]:
-        """Get recent events from the events table.
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield recent events from the events table, newest first.
+
+        Rows are fetched from SQLite in small batches and decoded one at a
+        time, so a caller that stops early pays only for what it consumed.
+        A pooled reader is held until the iterator is exhausted or closed.
 
         Args:
             event_type: Filter by event type (optional)
             category: Filter by category (optional)
-            limit: Maximum number of events to return
+            limit: Maximum number of events to yield
 
-        Returns:
-            List of events
+        Yields:
+            Event dicts
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        query = "SELECT * FROM events WHERE 1=1"
-        params = []
+        # Make events logged so far visible to this read
+        await self.flush_events()
 
-        if event_type:
-            query += " AND event_type = ?"
-            params.append(event_type)
+        query = _SELECT_EVENTS_SQL[bool(event_type), bool(category)]
+        params = [value for value in (event_type, category) if value]
+        params.append(limit)
 
-        if category:
-            query += " AND category = ?"
-            params.append(category)
+        async with self._acquire_read() as conn:
+            async with conn.execute(query, params) as cursor:
+                cursor.arraysize = EVENT_FETCH_BATCH_SIZE
+                async for row in cursor:
+                    yield {
+                        "id": row["id"],
+                        "timestamp": datetime.fromtimestamp(row["timestamp"] / 1000).isoformat(),
+                        "event_type": row["event_type"],
+                        "category": row["category"],
+                        "data": _json_loads(row["data"]) if row["data"] else None,
+                        "metadata": _json_loads(row["metadata"]) if row["metadata"] else None,
+                    }
 
-        query += " ORDER BY timestamp DESC LIMIT ?"
-        params.append(limit)
+    async def get_events(
+        self, event_type: Optional[str] = None, category: Optional[str] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get recent events from the events table as a list (see iter_events).
 
-        cursor = await self._conn.execute(query, params)
-        rows = await cursor.fetchall()
+        Args:
+            event_type: Filter by event type (optional)
+            category: Filter by category (optional)
+            limit: Maximum number of events to return
 
-        return [
-            {
-                "id": row["id"],
-                "timestamp": row["timestamp"],
-                "event_type": row["event_type"],
-                "category": row["category"],
-                "data": json.loads(row["data"]) if row["data"] else None,
-                "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
-            }
-            for row in rows
-        ]
+        Returns:
+            List of events
+        """
+        return [event async for event in self.iter_events(event_type, category, limit)]
 
     # ========================================================================
     # Retention / pruning
@@ -380,24 +869,26 @@ class CacheManager:
 
     async def prune_events(self, retention_days: int = 7) -> int:
         """Delete events older than retention_days. Returns count deleted."""
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
-        cursor = await self._conn.execute("DELETE FROM events WHERE timestamp < ?", (cutoff,))
-        await self._conn.commit()
+        await self.flush_events()
+
+        cutoff_ms = int((datetime.now() - timedelta(days=retention_days)).timestamp() * 1000)
+        async with self._writing():
+            cursor = await self._writer.execute("DELETE FROM events WHERE timestamp < ?", (cutoff_ms,))
         return cursor.rowcount
 
     async def prune_predictions(self, retention_days: int = 30) -> int:
         """Delete resolved predictions older than retention_days."""
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
-        cursor = await self._conn.execute(
-            "DELETE FROM predictions WHERE resolved_at IS NOT NULL AND resolved_at < ?", (cutoff,)
-        )
-        await self._conn.commit()
+        async with self._writing():
+            cursor = await self._writer.execute(
+                "DELETE FROM predictions WHERE resolved_at IS NOT NULL AND resolved_at < ?", (cutoff,)
+            )
         return cursor.rowcount
 
     # ========================================================================
@@ -425,26 +916,26 @@ class CacheManager:
             window_seconds: Evaluation window in seconds
             is_exploration: Whether this is an exploration prediction
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        await self._conn.execute(
-            """
-            INSERT INTO predictions
-                (id, timestamp, context, predictions, confidence, window_seconds, is_exploration)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                prediction_id,
-                timestamp,
-                json.dumps(context),
-                json.dumps(predictions),
-                confidence,
-                window_seconds,
-                is_exploration,
-            ),
-        )
-        await self._conn.commit()
+        async with self._writing():
+            await self._writer.execute(
+                """
+                INSERT INTO predictions
+                    (id, timestamp, context, predictions, confidence, window_seconds, is_exploration)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    prediction_id,
+                    timestamp,
+                    json.dumps(context),
+                    json.dumps(predictions),
+                    confidence,
+                    window_seconds,
+                    is_exploration,
+                ),
+            )
 
     async def update_prediction_outcome(
         self,
@@ -461,24 +952,24 @@ class CacheManager:
             actual: What actually happened (will be JSON-serialized)
             propagated_count: Number of times this prediction was propagated
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        await self._conn.execute(
-            """
-            UPDATE predictions
-            SET outcome = ?, actual = ?, propagated_count = ?, resolved_at = ?
-            WHERE id = ?
-            """,
-            (
-                outcome,
-                json.dumps(actual) if actual else None,
-                propagated_count,
-                datetime.now().isoformat(),
-                prediction_id,
-            ),
-        )
-        await self._conn.commit()
+        async with self._writing():
+            await self._writer.execute(
+                """
+                UPDATE predictions
+                SET outcome = ?, actual = ?, propagated_count = ?, resolved_at = ?
+                WHERE id = ?
+                """,
+                (
+                    outcome,
+                    json.dumps(actual) if actual else None,
+                    propagated_count,
+                    datetime.now().isoformat(),
+                    prediction_id,
+                ),
+            )
 
     async def get_recent_predictions(
         self,
@@ -496,7 +987,7 @@ class CacheManager:
         Returns:
             List of prediction dicts
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         query = "SELECT * FROM predictions WHERE 1=1"
@@ -512,8 +1003,7 @@ class CacheManager:
         params.append(limit)
         params.append(offset)
 
-        cursor = await self._conn.execute(query, params)
-        rows = await cursor.fetchall()
+        rows = await self._fetchall(query, params)
 
         return [self._prediction_from_row(row) for row in rows]
 
@@ -530,7 +1020,7 @@ class CacheManager:
         Returns:
             List of pending prediction dicts
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         if before_timestamp is None:
@@ -544,8 +1034,7 @@ class CacheManager:
         """
         params: list = [before_timestamp]
 
-        cursor = await self._conn.execute(query, params)
-        rows = await cursor.fetchall()
+        rows = await self._fetchall(query, params)
 
         return [self._prediction_from_row(row) for row in rows]
 
@@ -560,13 +1049,13 @@ class CacheManager:
         Returns:
             Dict with overall_accuracy, per_outcome breakdown, and daily_trend
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
 
         # Overall counts by outcome
-        cursor = await self._conn.execute(
+        rows = await self._fetchall(
             """
             SELECT outcome, COUNT(*) as cnt
             FROM predictions
@@ -575,7 +1064,6 @@ class CacheManager:
             """,
             (cutoff,),
         )
-        rows = await cursor.fetchall()
 
         per_outcome: Dict[str, int] = {}
         total_resolved = 0
@@ -589,7 +1077,7 @@ class CacheManager:
         overall_accuracy = (correct_count / total_resolved) if total_resolved > 0 else 0.0
 
         # Daily trend
-        cursor = await self._conn.execute(
+        trend_rows = await self._fetchall(
             """
             SELECT date(resolved_at) as day,
                    SUM(CASE WHEN outcome = 'correct' THEN 1 ELSE 0 END) as correct,
@@ -601,7 +1089,6 @@ class CacheManager:
             """,
             (cutoff,),
         )
-        trend_rows = await cursor.fetchall()
 
         daily_trend = [
             {
@@ -630,27 +1117,28 @@ class CacheManager:
         Returns:
             Pipeline state dict
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("SELECT * FROM pipeline_state WHERE id = 1")
-        row = await cursor.fetchone()
-
-        if not row:
-            now = datetime.now().isoformat()
-            await self._conn.execute(
-                """
-                INSERT INTO pipeline_state
-                    (id, current_stage, stage_entered_at, updated_at)
-                VALUES (1, 'backtest', ?, ?)
-                """,
-                (now, now),
-            )
-            await self._conn.commit()
-
-            cursor = await self._conn.execute("SELECT * FROM pipeline_state WHERE id = 1")
+        # Read and (first time) insert under the write lock, so the row is not
+        # read from or created inside another task's open transaction
+        async with self._writing():
+            cursor = await self._writer.execute("SELECT * FROM pipeline_state WHERE id = 1")
             row = await cursor.fetchone()
 
+            if not row:
+                now = datetime.now().isoformat()
+                await self._writer.execute(
+                    """
+                    INSERT INTO pipeline_state
+                        (id, current_stage, stage_entered_at, updated_at)
+                    VALUES (1, 'backtest', ?, ?)
+                    """,
+                    (now, now),
+                )
+                cursor = await self._writer.execute("SELECT * FROM pipeline_state WHERE id = 1")
+                row = await cursor.fetchone()
+
         return {
             "id": row["id"],
             "current_stage": row["current_stage"],
@@ -671,7 +1159,7 @@ class CacheManager:
                 shadow_accuracy_7d, suggest_approval_rate_14d,
                 autonomous_contexts
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         # Ensure default row exists
@@ -704,11 +1192,11 @@ class CacheManager:
         values = list(updates.values())
         values.append(1)  # WHERE id = 1
 
-        await self._conn.execute(
-            f"UPDATE pipeline_state SET {set_clause} WHERE id = ?",
-            values,
-        )
-        await self._conn.commit()
+        async with self._writing():
+            await self._writer.execute(
+                f"UPDATE pipeline_state SET {set_clause} WHERE id = ?",
+                values,
+            )
 
     # ========================================================================
     # Phase 2: Config store
@@ -723,11 +1211,10 @@ class CacheManager:
         Returns:
             Config row as dict, or None if not found.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("SELECT * FROM config WHERE key = ?", (key,))
-        row = await cursor.fetchone()
+        row = await self._fetchone("SELECT * FROM config WHERE key = ?", (key,))
         if not row:
             return None
         return self._config_from_row(row)
@@ -738,11 +1225,10 @@ class CacheManager:
         Returns:
             List of config dicts, ordered by category then key.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("SELECT * FROM config ORDER BY category, key")
-        rows = await cursor.fetchall()
+        rows = await self._fetchall("SELECT * FROM config ORDER BY category, key")
         return [self._config_from_row(row) for row in rows]
 
     async def set_config(self, key: str, value: str, changed_by: str = "user") -> Dict[str, Any]:
@@ -759,7 +1245,7 @@ class CacheManager:
         Raises:
             ValueError: If key not found or value fails validation.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         current = await self.get_config(key)
@@ -772,20 +1258,19 @@ class CacheManager:
         old_value = current["value"]
         now = datetime.now().isoformat()
 
-        # Update config
-        await self._conn.execute(
-            "UPDATE config SET value = ?, updated_at = ? WHERE key = ?",
-            (value, now, key),
-        )
-
-        # Write history
-        await self._conn.execute(
-            """INSERT INTO config_history (key, old_value, new_value, changed_at, changed_by)
-               VALUES (?, ?, ?, ?, ?)""",
-            (key, old_value, value, now, changed_by),
-        )
+        async with self._writing():
+            # Update config
+            await self._writer.execute(
+                "UPDATE config SET value = ?, updated_at = ? WHERE key = ?",
+                (value, now, key),
+            )
 
-        await self._conn.commit()
+            # Write history
+            await self._writer.execute(
+                """INSERT INTO config_history (key, old_value, new_value, changed_at, changed_by)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (key, old_value, value, now, changed_by),
+            )
         return await self.get_config(key)
 
     async def upsert_config_default(
@@ -820,31 +1305,31 @@ class CacheManager:
         Returns:
             True if inserted, False if key already existed.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         now = datetime.now().isoformat()
-        cursor = await self._conn.execute(
-            """INSERT OR IGNORE INTO config
-               (key, value, default_value, value_type, label, description,
-                category, min_value, max_value, options, step, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                key,
-                default_value,
-                default_value,
-                value_type,
-                label,
-                description,
-                category,
-                min_value,
-                max_value,
-                options,
-                step,
-                now,
-            ),
-        )
-        await self._conn.commit()
+        async with self._writing():
+            cursor = await self._writer.execute(
+                """INSERT OR IGNORE INTO config
+                   (key, value, default_value, value_type, label, description,
+                    category, min_value, max_value, options, step, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    key,
+                    default_value,
+                    default_value,
+                    value_type,
+                    label,
+                    description,
+                    category,
+                    min_value,
+                    max_value,
+                    options,
+                    step,
+                    now,
+                ),
+            )
         return cursor.rowcount > 0
 
     async def reset_config(self, key: str, changed_by: str = "user") -> Dict[str, Any]:
@@ -860,7 +1345,7 @@ class CacheManager:
         Raises:
             ValueError: If key not found.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         current = await self.get_config(key)
@@ -897,11 +1382,10 @@ class CacheManager:
         Returns:
             List of curation dicts, ordered by tier then entity_id.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("SELECT * FROM entity_curation ORDER BY tier, entity_id")
-        rows = await cursor.fetchall()
+        rows = await self._fetchall("SELECT * FROM entity_curation ORDER BY tier, entity_id")
         return [self._curation_from_row(row) for row in rows]
 
     async def get_curation(self, entity_id: str) -> Optional[Dict[str, Any]]:
@@ -913,11 +1397,10 @@ class CacheManager:
         Returns:
             Curation dict or None.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("SELECT * FROM entity_curation WHERE entity_id = ?", (entity_id,))
-        row = await cursor.fetchone()
+        row = await self._fetchone("SELECT * FROM entity_curation WHERE entity_id = ?", (entity_id,))
         if not row:
             return None
         return self._curation_from_row(row)
@@ -928,13 +1411,10 @@ class CacheManager:
         Returns:
             Dict with total, per_tier, and per_status breakdowns.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute(
-            "SELECT tier, status, COUNT(*) as cnt FROM entity_curation GROUP BY tier, status"
-        )
-        rows = await cursor.fetchall()
+        rows = await self._fetchall("SELECT tier, status, COUNT(*) as cnt FROM entity_curation GROUP BY tier, status")
 
         per_tier: Dict[int, int] = {}
         per_status: Dict[str, int] = {}
@@ -978,40 +1458,40 @@ class CacheManager:
             group_id: Device group identifier.
             decided_by: Who made the decision.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         now = datetime.now().isoformat()
-        await self._conn.execute(
-            """INSERT INTO entity_curation
-               (entity_id, status, tier, reason, auto_classification,
-                human_override, metrics, group_id, decided_at, decided_by)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-               ON CONFLICT(entity_id) DO UPDATE SET
-                   status = excluded.status,
-                   tier = excluded.tier,
-                   reason = excluded.reason,
-                   auto_classification = excluded.auto_classification,
-                   human_override = excluded.human_override,
-                   metrics = excluded.metrics,
-                   group_id = excluded.group_id,
-                   decided_at = excluded.decided_at,
-                   decided_by = excluded.decided_by
-            """,
-            (
-                entity_id,
-                status,
-                tier,
-                reason,
-                auto_classification,
-                human_override,
-                json.dumps(metrics) if metrics else None,
-                group_id,
-                now,
-                decided_by,
-            ),
-        )
-        await self._conn.commit()
+        async with self._writing():
+            await self._writer.execute(
+                """INSERT INTO entity_curation
+                   (entity_id, status, tier, reason, auto_classification,
+                    human_override, metrics, group_id, decided_at, decided_by)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(entity_id) DO UPDATE SET
+                       status = excluded.status,
+                       tier = excluded.tier,
+                       reason = excluded.reason,
+                       auto_classification = excluded.auto_classification,
+                       human_override = excluded.human_override,
+                       metrics = excluded.metrics,
+                       group_id = excluded.group_id,
+                       decided_at = excluded.decided_at,
+                       decided_by = excluded.decided_by
+                """,
+                (
+                    entity_id,
+                    status,
+                    tier,
+                    reason,
+                    auto_classification,
+                    human_override,
+                    json.dumps(metrics) if metrics else None,
+                    group_id,
+                    now,
+                    decided_by,
+                ),
+            )
 
     async def bulk_update_curation(
         self,
@@ -1029,7 +1509,7 @@ class CacheManager:
         Returns:
             Number of rows updated.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         if not entity_ids:
@@ -1037,14 +1517,14 @@ class CacheManager:
 
         now = datetime.now().isoformat()
         placeholders = ",".join("?" for _ in entity_ids)
-        cursor = await self._conn.execute(
-            f"""UPDATE entity_curation
-                SET status = ?, human_override = TRUE,
-                    decided_at = ?, decided_by = ?
-                WHERE entity_id IN ({placeholders})""",
-            [status, now, decided_by] + entity_ids,
-        )
-        await self._conn.commit()
+        async with self._writing():
+            cursor = await self._writer.execute(
+                f"""UPDATE entity_curation
+                    SET status = ?, human_override = TRUE,
+                        decided_at = ?, decided_by = ?
+                    WHERE entity_id IN ({placeholders})""",
+                [status, now, decided_by] + entity_ids,
+            )
         return cursor.rowcount
 
     async def get_included_entity_ids(self) -> set:
@@ -1053,13 +1533,10 @@ class CacheManager:
         Returns:
             Set of entity_id strings where status in ('included', 'promoted').
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute(
-            "SELECT entity_id FROM entity_curation WHERE status IN ('included', 'promoted')"
-        )
-        rows = await cursor.fetchall()
+        rows = await self._fetchall("SELECT entity_id FROM entity_curation WHERE status IN ('included', 'promoted')")
         return {row["entity_id"] for row in rows}
 
     # ========================================================================
@@ -1076,7 +1553,7 @@ class CacheManager:
         Returns:
             List of history dicts, most recent first.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         query = "SELECT * FROM config_history WHERE 1=1"
@@ -1089,8 +1566,7 @@ class CacheManager:
         query += " ORDER BY changed_at DESC LIMIT ?"
         params.append(limit)
 
-        cursor = await self._conn.execute(query, params)
-        rows = await cursor.fetchall()
+        rows = await self._fetchall(query, params)
 
         return [
             {
@@ -1114,19 +1590,19 @@ class CacheManager:
         Args:
             state: Dict mapping bucket keys to alpha/beta/observations dicts.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
         now = datetime.now().isoformat()
-        await self._conn.execute(
-            """INSERT INTO thompson_state (id, state, updated_at)
-               VALUES (1, ?, ?)
-               ON CONFLICT(id) DO UPDATE SET
-                   state = excluded.state,
-                   updated_at = excluded.updated_at""",
-            (json.dumps(state), now),
-        )
-        await self._conn.commit()
+        async with self._writing():
+            await self._writer.execute(
+                """INSERT INTO thompson_state (id, state, updated_at)
+                   VALUES (1, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       state = excluded.state,
+                       updated_at = excluded.updated_at""",
+                (json.dumps(state), now),
+            )
 
     async def load_thompson_state(self) -> Optional[Dict[str, Any]]:
         """Load Thompson Sampling bucket state from the database.
@@ -1134,15 +1610,111 @@ class CacheManager:
         Returns:
             Dict mapping bucket keys to alpha/beta/observations dicts, or None.
         """
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Cache not initialized. Call initialize() first.")
 
-        cursor = await self._conn.execute("SELECT state FROM thompson_state WHERE id = 1")
-        row = await cursor.fetchone()
+        row = await self._fetchone("SELECT state FROM thompson_state WHERE id = 1")
         if not row:
             return None
         return json.loads(row["state"])
 
+    # ========================================================================
+    # Discovery registries (entities / devices / areas)
+    # ========================================================================
+
+    async def upsert_entities(self, entities: RegistryRecords, prune: bool = True) -> int:
+        """Upsert discovered entities keyed by entity_id. See _upsert_registry."""
+        return await self._upsert_registry("entities", entities, prune)
+
+    async def upsert_devices(self, devices: RegistryRecords, prune: bool = True) -> int:
+        """Upsert discovered devices keyed by device_id. See _upsert_registry."""
+        return await self._upsert_registry("devices", devices, prune)
+
+    async def upsert_areas(self, areas: RegistryRecords, prune: bool = True) -> int:
+        """Upsert discovered areas keyed by area_id. See _upsert_registry."""
+        return await self._upsert_registry("areas", areas, prune)
+
+    async def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Get one discovered entity record by ID, or None."""
+        if not self._writer:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+
+        row = await self._fetchone("SELECT attrs FROM entities WHERE entity_id = ?", (entity_id,))
+        return _json_loads(row["attrs"]) if row else None
+
+    async def get_entities(
+        self, area_id: Optional[str] = None, domain: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get discovered entity records, optionally filtered by area and/or domain.
+
+        Returns:
+            Dict mapping entity_id to its record
+        """
+        if not self._writer:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+
+        query = "SELECT entity_id, attrs FROM entities WHERE 1=1"
+        params: list = []
+
+        if area_id is not None:
+            query += " AND area_id = ?"
+            params.append(area_id)
+
+        if domain is not None:
+            query += " AND domain = ?"
+            params.append(domain)
+
+        rows = await self._fetchall(query, params)
+        return {row["entity_id"]: _json_loads(row["attrs"]) for row in rows}
+
+    async def _upsert_registry(self, table: str, records: RegistryRecords, prune: bool) -> int:
+        """Write registry records row-by-row in one transaction.
+
+        ``records`` maps key -> record as produced by discovery; a list of
+        records carrying their own key field is accepted too.
+
+        Rows whose columns and record JSON are unchanged are left untouched,
+        so a rediscovery only rewrites what actually changed. With prune,
+        rows whose key is no longer in ``records`` are deleted.
+
+        Returns:
+            Number of rows inserted, updated or deleted
+        """
+        if not self._writer:
+            raise RuntimeError("Cache not initialized. Call initialize() first.")
+
+        key, columns = _REGISTRY_TABLES[table]
+        if not isinstance(records, dict):
+            records = {record[key]: record for record in records}
+        tracked = (*columns, "attrs")
+        insert_cols = (key, *tracked, "updated_at")
+        now = datetime.now().isoformat()
+        rows = [
+            (record_id, *(record.get(col) for col in columns), _json_dumps(record), now)
+            for record_id, record in records.items()
+        ]
+
+        async with self._writing():
+            cursor = await self._writer.executemany(
+                f"""
+                INSERT INTO {table} ({", ".join(insert_cols)})
+                VALUES ({", ".join("?" * len(insert_cols))})
+                ON CONFLICT({key}) DO UPDATE SET
+                    {", ".join(f"{col} = excluded.{col}" for col in (*tracked, "updated_at"))}
+                WHERE {" OR ".join(f"{table}.{col} IS NOT excluded.{col}" for col in tracked)}
+                """,
+                rows,
+            )
+            written = max(cursor.rowcount, 0)
+
+            if prune:
+                cursor = await self._writer.execute(
+                    f"DELETE FROM {table} WHERE {key} NOT IN (SELECT value FROM json_each(?))",
+                    (json.dumps(list(records)),),
+                )
+                written += cursor.rowcount
+        return written
+
     # ========================================================================
     # Internal helpers
     # ========================================================================
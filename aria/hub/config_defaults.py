@@ -419,7 +419,7 @@ CONFIG_DEFAULTS: List[Dict[str, Any]] = [
         "default_value": "true",
         "value_type": "boolean",
         "label": "Incremental Training Enabled",
-        "description": "Enable eGBDT incremental LightGBM adaptation on drift detection.",
+        "description": "Warm-start scheduled retraining from the saved models instead of refitting from scratch.",
         "category": "Incremental Training",
     },
     {
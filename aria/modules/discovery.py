@@ -1,23 +1,39 @@
 """Discovery Module - HA entity and capability detection.
 
-Wraps the standalone discover.py script and integrates it with the hub.
-Runs discovery on a schedule and stores results in hub cache.
+Runs discovery_core in-process, on a schedule and on registry changes,
+and stores results in hub cache.
 """
 
-import os
-import sys
+import hashlib
 import json
-import subprocess
 import logging
 import asyncio
-from pathlib import Path
 from typing import Dict, Any, Optional
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 import aiohttp
 
 from aria.hub.core import Module, IntelligenceHub
 from aria.capabilities import Capability
+from aria.modules.discovery_core import discover_all
+
+# Upper bound (seconds) on one full discovery run
+DISCOVERY_TIMEOUT = 120
+
+try:
+    import orjson
+
+    def _canonical_json(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+
+    def _canonical_json(data: Any) -> bytes:
+        return json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+
+
+def content_hash(data: Any) -> str:
+    """Stable digest of a discovery payload (key order does not matter)."""
+    return hashlib.blake2b(_canonical_json(data), digest_size=16).hexdigest()
 
 
 logger = logging.getLogger(__name__)
@@ -53,10 +69,6 @@ class DiscoveryModule(Module):
         super().__init__("discovery", hub)
         self.ha_url = ha_url
         self.ha_token = ha_token
-        self.discover_script = Path(__file__).parent.parent.parent / "bin" / "discover.py"
-
-        if not self.discover_script.exists():
-            raise FileNotFoundError(f"Discovery script not found: {self.discover_script}")
 
     async def initialize(self):
         """Initialize module - run initial discovery."""
@@ -70,7 +82,7 @@ class DiscoveryModule(Module):
             self.logger.error(f"Initial discovery failed: {e}")
 
     async def run_discovery(self) -> Dict[str, Any]:
-        """Run discovery script and store results in hub cache.
+        """Run discovery against HA and store results in hub cache.
 
         Returns:
             Discovery results dictionary
@@ -78,21 +90,7 @@ class DiscoveryModule(Module):
         self.logger.info("Running discovery...")
 
         try:
-            # Run discover.py subprocess
-            result = subprocess.run(
-                [sys.executable, str(self.discover_script)],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                env={**os.environ, "HA_URL": self.ha_url, "HA_TOKEN": self.ha_token},
-            )
-
-            if result.returncode != 0:
-                error_msg = result.stderr or "Unknown error"
-                raise RuntimeError(f"Discovery failed: {error_msg}")
-
-            # Parse JSON output
-            capabilities = json.loads(result.stdout)
+            capabilities = await asyncio.wait_for(discover_all(self.ha_url, self.ha_token), timeout=DISCOVERY_TIMEOUT)
 
             # Store in hub cache
             await self._store_discovery_results(capabilities)
@@ -104,11 +102,8 @@ class DiscoveryModule(Module):
 
             return capabilities
 
-        except subprocess.TimeoutExpired:
-            self.logger.error("Discovery timed out after 120 seconds")
-            raise
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse discovery output: {e}")
+        except asyncio.TimeoutError:
+            self.logger.error(f"Discovery timed out after {DISCOVERY_TIMEOUT} seconds")
             raise
         except Exception as e:
             self.logger.error(f"Discovery error: {e}")
@@ -117,6 +112,13 @@ class DiscoveryModule(Module):
     async def _store_discovery_results(self, capabilities: Dict[str, Any]):
         """Store discovery results in hub cache.
 
+        Entities, devices and areas are upserted row-by-row into their
+        normalized tables (only changed rows are rewritten) and also stored
+        as whole-map cache entries for modules that read the aggregate. Whole-map
+        entries whose content hash is unchanged are not rewritten. All writes
+        share one transaction; cache_updated events for the written entries
+        are published only once it has committed.
+
         Stores separate cache entries for:
         - entities: Entity registry data
         - devices: Device registry data
@@ -124,43 +126,83 @@ class DiscoveryModule(Module):
         - capabilities: Detected capabilities
         - discovery_metadata: Discovery run metadata
         """
-        # Store entities
-        entities = capabilities.get("entities", {})
-        if entities:
-            await self.hub.set_cache("entities", entities, {"count": len(entities), "source": "discovery"})
-
-        # Store devices
-        devices = capabilities.get("devices", {})
-        if devices:
-            await self.hub.set_cache("devices", devices, {"count": len(devices), "source": "discovery"})
-
-        # Store areas
-        areas = capabilities.get("areas", {})
-        if areas:
-            await self.hub.set_cache("areas", areas, {"count": len(areas), "source": "discovery"})
-
-        # Store capabilities — merge with existing to preserve organic discoveries
-        caps = capabilities.get("capabilities", {})
-        if caps:
-            existing_entry = await self.hub.get_cache("capabilities")
-            if existing_entry and existing_entry.get("data"):
-                existing = existing_entry["data"]
-                # Preserve organic capabilities that seed discovery doesn't know about
-                for name, cap_data in existing.items():
-                    if cap_data.get("source") == "organic" and name not in caps:
-                        caps[name] = cap_data
-            await self.hub.set_cache("capabilities", caps, {"count": len(caps), "source": "discovery"})
-
-        # Store metadata
-        metadata = {
-            "entity_count": capabilities.get("entity_count", 0),
-            "device_count": capabilities.get("device_count", 0),
-            "area_count": capabilities.get("area_count", 0),
-            "capability_count": len(caps),
-            "timestamp": capabilities.get("timestamp"),
-            "ha_version": capabilities.get("ha_version"),
-        }
-        await self.hub.set_cache("discovery_metadata", metadata)
+        written: Dict[str, int] = {}
+
+        # One transaction (one commit) for the whole discovery run
+        async with self.hub.cache.transaction():
+            # Store entities
+            entities = capabilities.get("entities", {})
+            if entities:
+                changed = await self.hub.cache.upsert_entities(entities)
+                self.logger.debug(f"Entity table: {changed} rows changed")
+                await self._set_cache_if_changed(
+                    written, "entities", entities, {"count": len(entities), "source": "discovery"}
+                )
+
+            # Store devices
+            devices = capabilities.get("devices", {})
+            if devices:
+                await self.hub.cache.upsert_devices(devices)
+                await self._set_cache_if_changed(
+                    written, "devices", devices, {"count": len(devices), "source": "discovery"}
+                )
+
+            # Store areas
+            areas = capabilities.get("areas", {})
+            if areas:
+                await self.hub.cache.upsert_areas(areas)
+                await self._set_cache_if_changed(written, "areas", areas, {"count": len(areas), "source": "discovery"})
+
+            # Store capabilities — merge with existing to preserve organic discoveries
+            caps = capabilities.get("capabilities", {})
+            if caps:
+                existing_entry = await self.hub.get_cache("capabilities")
+                if existing_entry and existing_entry.get("data"):
+                    existing = existing_entry["data"]
+                    # Preserve organic capabilities that seed discovery doesn't know about
+                    for name, cap_data in existing.items():
+                        if cap_data.get("source") == "organic" and name not in caps:
+                            caps[name] = cap_data
+                await self._set_cache_if_changed(
+                    written, "capabilities", caps, {"count": len(caps), "source": "discovery"}
+                )
+
+            # Store metadata
+            metadata = {
+                "entity_count": capabilities.get("entity_count", 0),
+                "device_count": capabilities.get("device_count", 0),
+                "area_count": capabilities.get("area_count", 0),
+                "capability_count": len(caps),
+                "timestamp": capabilities.get("timestamp"),
+                "ha_version": capabilities.get("ha_version"),
+            }
+            written["discovery_metadata"] = await self.hub.cache.set("discovery_metadata", metadata)
+
+        # Subscribers re-read the cache on these events, so only announce committed data
+        for category, version in written.items():
+            await self.hub.publish(
+                "cache_updated", {"category": category, "version": version, "timestamp": datetime.now().isoformat()}
+            )
+
+    async def _set_cache_if_changed(
+        self, written: Dict[str, int], category: str, data: Dict[str, Any], metadata: Dict[str, Any]
+    ) -> bool:
+        """cache.set unless the stored entry already has the same content hash.
+
+        An unchanged payload is not rewritten, so its version stays put. A
+        written entry's new version is recorded in ``written`` so the caller can
+        publish cache_updated once its transaction commits.
+
+        Returns:
+            True if the entry was written
+        """
+        digest = content_hash(data)
+        stored = await self.hub.cache.get_metadata(category)
+        if stored and stored.get("content_hash") == digest:
+            self.logger.debug(f"{category}: unchanged, skipping cache write")
+            return False
+        written[category] = await self.hub.cache.set(category, data, {**metadata, "content_hash": digest})
+        return True
 
     async def on_event(self, event_type: str, data: Dict[str, Any]):
         """Handle hub events."""
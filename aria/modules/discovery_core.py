@@ -0,0 +1,589 @@
+"""Home Assistant discovery - fetch entities, devices, areas and detect capabilities.
+
+Scans an HA instance via REST + WebSocket. Runs in-process inside the hub
+(DiscoveryModule awaits discover_all) and standalone via bin/discover.py.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+
+import aiohttp
+
+# orjson parses bytes directly and is several times faster on large
+# /api/states payloads; stdlib json also accepts bytes as a fallback.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+# === Config ===
+HA_URL = os.environ.get("HA_URL", "http://192.168.1.35:8123")
+HA_TOKEN = os.environ.get("HA_TOKEN", "")
+
+# Domains to exclude from unavailable counts (normally unavailable)
+UNAVAILABLE_EXCLUDE_DOMAINS = {"update", "tts", "stt"}
+
+# Vehicle name as a standalone token ("sensor.tars_battery"), not a substring
+# of unrelated names ("media_player.guitars", "sensor.stars")
+EV_NAME_PATTERN = re.compile(r"(?<![a-z])tars(?![a-z])")
+
+# Base delay (seconds) for jittered exponential backoff between retries
+RETRY_BASE_DELAY = 0.5
+
+# Total timeout (seconds) for a single REST request or WebSocket connect
+REQUEST_TIMEOUT = 30
+
+
+logger = logging.getLogger(__name__)
+
+
+def log(msg):
+    """Progress message (stderr when run from bin/discover.py)."""
+    logger.info(msg)
+
+
+def entity_domain(entity_id):
+    """Return the interned domain of an entity_id ("light.kitchen" -> "light").
+
+    Interning keeps one shared string per domain, so later equality checks and
+    dict lookups on domains hit the identity fast path.
+    """
+    dot = entity_id.find(".")
+    return sys.intern(entity_id[:dot] if dot >= 0 else entity_id)
+
+
+# === HA Client (aiohttp) ===
+
+
+class HARequestError(Exception):
+    """HA rejected a request (auth failure or non-retryable 4xx); not retryable."""
+
+
+class WebSocketCommandError(HARequestError):
+    """HA rejected a WebSocket request (auth_invalid or success=false)."""
+
+
+def backoff_delay(attempt, base=None, retry_after=None):
+    """Seconds to wait before retry ``attempt + 1`` (full-jitter exponential backoff).
+
+    ``base`` defaults to RETRY_BASE_DELAY. A server-provided Retry-After
+    (seconds) takes precedence when present.
+    """
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    if base is None:
+        base = RETRY_BASE_DELAY
+    return random.uniform(0, base * 2**attempt)
+
+
+def create_session(token):
+    """Create the shared aiohttp session used for every REST and WebSocket call.
+
+    The connector keeps connections alive between requests, and the bearer
+    token is attached once as a default header.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=30),
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    )
+
+
+async def fetch_rest_api(session, base_url, endpoint, retries=3):
+    """Fetch data from HA REST API with retries and jittered exponential backoff.
+
+    Connection errors, 5xx and 429 responses are retried; other 4xx responses
+    are permanent and raise immediately.
+    """
+    url = f"{base_url.rstrip('/')}{endpoint}"
+
+    for attempt in range(retries):
+        retry_after = None
+        try:
+            async with session.get(url) as response:
+                status = response.status
+                if status == 401:
+                    raise HARequestError(f"Authentication failed: HTTP 401 {response.reason}")
+                if 400 <= status < 500 and status != 429:
+                    raise HARequestError(f"HTTP error {status} on {endpoint}: {response.reason}")
+                if status >= 400:
+                    retry_after = response.headers.get("Retry-After")
+                    log(f"HTTP error {status} on {endpoint}, attempt {attempt + 1}/{retries}")
+                else:
+                    data = await response.read()
+                    try:
+                        return json_loads(data)
+                    except ValueError as e:
+                        log(f"Invalid JSON on {endpoint}, attempt {attempt + 1}/{retries}: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log(f"Connection error on {endpoint}, attempt {attempt + 1}/{retries}: {e}")
+
+        if attempt < retries - 1:
+            await asyncio.sleep(backoff_delay(attempt, retry_after=retry_after))
+
+    raise Exception(f"Failed to fetch {endpoint} after {retries} attempts")
+
+
+class HAWebSocket:
+    """Authenticated HA WebSocket session reused across multiple commands.
+
+    Connects and authenticates lazily on the first command, then issues every
+    subsequent command over the same socket. A dropped connection is re-opened
+    with jittered backoff, up to ``retries`` attempts per command. Framing,
+    masking and ping/pong are handled by aiohttp.
+    """
+
+    def __init__(self, session, url, token, retries=3):
+        self.session = session
+        self.ws_url = url.replace("http", "ws", 1).rstrip("/") + "/api/websocket"
+        self.token = token
+        self.retries = retries
+        self.ws = None
+        self._next_id = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    async def close(self):
+        """Close the socket if open (errors are ignored)."""
+        if self.ws is None:
+            return
+        try:
+            await self.ws.close()
+        except Exception:
+            pass
+        self.ws = None
+
+    async def _receive(self):
+        """Return the next JSON message, raising if the server closed the socket."""
+        msg = await self.ws.receive()
+        if msg.type == aiohttp.WSMsgType.TEXT:
+            return json_loads(msg.data)
+        raise ConnectionError(f"WebSocket closed by server ({msg.type.name})")
+
+    async def _connect(self):
+        self.ws = await self.session.ws_connect(self.ws_url)
+
+        auth_msg = await self._receive()
+        if auth_msg.get("type") != "auth_required":
+            raise ConnectionError(f"Expected auth_required, got: {auth_msg}")
+
+        await self.ws.send_json({"type": "auth", "access_token": self.token})
+        auth_response = await self._receive()
+        if auth_response.get("type") == "auth_invalid":
+            raise WebSocketCommandError("Authentication failed")
+        if auth_response.get("type") != "auth_ok":
+            raise ConnectionError(f"Unexpected auth response: {auth_response}")
+
+    async def command(self, command_type):
+        """Send a command and return its result, skipping unrelated frames."""
+        result = (await self.commands([command_type]))[0]
+        if isinstance(result, WebSocketCommandError):
+            raise result
+        return result
+
+    async def commands(self, command_types):
+        """Send several commands back-to-back and return their results in order.
+
+        All requests are written before any response is read, so the batch costs
+        one round-trip. A command HA rejects yields its WebSocketCommandError in
+        place of a result instead of failing the rest of the batch.
+        """
+        for attempt in range(self.retries):
+            try:
+                if self.ws is None:
+                    await self._connect()
+                return await self._pipeline(command_types)
+            except WebSocketCommandError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, ValueError) as e:
+                log(f"WebSocket error on {', '.join(command_types)}, attempt {attempt + 1}/{self.retries}: {e}")
+                await self.close()
+                if attempt < self.retries - 1:
+                    await asyncio.sleep(backoff_delay(attempt))
+
+        raise Exception(f"Failed to fetch {', '.join(command_types)} after {self.retries} attempts")
+
+    async def _pipeline(self, command_types):
+        pending = {}
+        for index, command_type in enumerate(command_types):
+            self._next_id += 1
+            pending[self._next_id] = index
+            await self.ws.send_json({"id": self._next_id, "type": command_type})
+
+        results = [None] * len(command_types)
+        while pending:
+            response = await self._receive()
+            index = pending.pop(response.get("id"), None)
+            if index is None:  # Event or stale frame
+                continue
+            if response.get("success"):
+                results[index] = response.get("result", [])
+            else:
+                results[index] = WebSocketCommandError(f"WebSocket command failed: {response.get('error')}")
+        return results
+
+
+async def fetch_registries(session, url, token):
+    """Fetch entity/device/area/label registries over one WebSocket session.
+
+    The four list commands are pipelined in a single batch.
+    Returns (entity_registry, device_registry, area_registry, label_registry).
+    Labels may not exist in older HA versions and fall back to an empty list.
+    """
+    async with HAWebSocket(session, url, token) as ws:
+        entity_registry, device_registry, area_registry, label_registry = await ws.commands(
+            [
+                "config/entity_registry/list",
+                "config/device_registry/list",
+                "config/area_registry/list",
+                "config/label_registry/list",
+            ]
+        )
+
+    for result in (entity_registry, device_registry, area_registry):
+        if isinstance(result, WebSocketCommandError):
+            raise result
+    log(f"Found {len(entity_registry)} registry entries")
+    log(f"Found {len(device_registry)} devices")
+    log(f"Found {len(area_registry)} areas")
+
+    if isinstance(label_registry, WebSocketCommandError):
+        log("Labels not available (HA version may not support them)")
+        label_registry = []
+    else:
+        log(f"Found {len(label_registry)} labels")
+
+    return entity_registry, device_registry, area_registry, label_registry
+
+
+# === Capability Detection ===
+
+
+def detect_capabilities(states, entity_registry, device_registry):
+    """Detect capabilities based on discovered entities.
+
+    Buckets every entity in a single pass over ``states``, then assembles the
+    capability dicts from the accumulated lists.
+    """
+    power_entities = []
+    light_entities = []
+    supports_color = supports_color_temp = supports_brightness = 0
+    person_entities = []
+    device_tracker_entities = []
+    climate_entities = []
+    climate_modes = set()
+    ev_entities = []
+    battery_entities = []
+    motion_entities = []
+    door_window_entities = []
+    lock_entities = []
+    media_entities = []
+    vacuum_entities = []
+
+    # One hash lookup per entity replaces the chains of domain/device_class comparisons
+    domain_buckets = {
+        "light": light_entities,
+        "person": person_entities,
+        "device_tracker": device_tracker_entities,
+        "climate": climate_entities,
+        "lock": lock_entities,
+        "media_player": media_entities,
+        "vacuum": vacuum_entities,
+    }
+    device_class_buckets = {
+        "power": power_entities,
+        "motion": motion_entities,
+        "door": door_window_entities,
+        "window": door_window_entities,
+    }
+
+    for e in states:
+        eid = e["entity_id"]
+        attrs = e.get("attributes") or {}
+
+        bucket = device_class_buckets.get(attrs.get("device_class"))
+        if bucket is not None and (bucket is not power_entities or attrs.get("unit_of_measurement") == "W"):
+            bucket.append(eid)
+
+        bucket = domain_buckets.get(entity_domain(eid))
+        if bucket is not None:
+            bucket.append(eid)
+            if bucket is light_entities:
+                supports_color += "rgb_color" in attrs
+                supports_color_temp += "color_temp" in attrs
+                supports_brightness += "brightness" in attrs
+            elif bucket is climate_entities:
+                climate_modes.update(attrs.get("hvac_modes", []))
+
+        eid_folded = eid.casefold()
+        if ("battery" in eid_folded and "vehicle" in eid_folded) or EV_NAME_PATTERN.search(eid_folded):
+            ev_entities.append(eid)
+
+        if "battery" in attrs or "battery_level" in attrs:
+            battery_entities.append(eid)
+
+    capabilities = {}
+
+    # Power monitoring
+    if power_entities:
+        capabilities["power_monitoring"] = {
+            "available": True,
+            "entities": power_entities,
+            "total_count": len(power_entities),
+            "measurement_unit": "W",
+            "can_predict": True,
+        }
+
+    # Lighting
+    if light_entities:
+        capabilities["lighting"] = {
+            "available": True,
+            "entities": light_entities,
+            "total_count": len(light_entities),
+            "supports_color": supports_color,
+            "supports_color_temp": supports_color_temp,
+            "supports_brightness": supports_brightness,
+            "can_predict": True,
+        }
+
+    # Occupancy
+    if person_entities or device_tracker_entities:
+        capabilities["occupancy"] = {
+            "available": True,
+            "method": [],
+            "people": person_entities,
+            "tracked_devices": len(device_tracker_entities),
+            "can_predict": True,
+        }
+        if person_entities:
+            capabilities["occupancy"]["method"].append("person")
+        if device_tracker_entities:
+            capabilities["occupancy"]["method"].append("device_tracker")
+
+    # Climate
+    if climate_entities:
+        capabilities["climate"] = {
+            "available": True,
+            "entities": climate_entities,
+            "total_count": len(climate_entities),
+            "modes": list(climate_modes),
+            "can_predict": True,
+        }
+
+    # EV Charging
+    if ev_entities:
+        capabilities["ev_charging"] = {
+            "available": True,
+            "entities": ev_entities,
+            "vehicle_count": 1,  # Simplified for MVP
+            "can_predict": True,
+        }
+
+    # Battery devices
+    if battery_entities:
+        capabilities["battery_devices"] = {
+            "available": True,
+            "entities": battery_entities,
+            "total_count": len(battery_entities),
+            "can_predict": True,
+        }
+
+    # Motion sensors
+    if motion_entities:
+        capabilities["motion"] = {
+            "available": True,
+            "entities": motion_entities,
+            "total_count": len(motion_entities),
+            "can_predict": False,
+        }
+
+    # Doors/Windows
+    if door_window_entities:
+        capabilities["doors_windows"] = {
+            "available": True,
+            "entities": door_window_entities,
+            "total_count": len(door_window_entities),
+            "can_predict": False,
+        }
+
+    # Locks
+    if lock_entities:
+        capabilities["locks"] = {
+            "available": True,
+            "entities": lock_entities,
+            "total_count": len(lock_entities),
+            "can_predict": False,
+        }
+
+    # Media
+    if media_entities:
+        capabilities["media"] = {
+            "available": True,
+            "entities": media_entities,
+            "total_count": len(media_entities),
+            "can_predict": False,
+        }
+
+    # Vacuum
+    if vacuum_entities:
+        capabilities["vacuum"] = {
+            "available": True,
+            "entities": vacuum_entities,
+            "total_count": len(vacuum_entities),
+            "can_predict": False,
+        }
+
+    return capabilities
+
+
+# === Main Discovery ===
+
+
+async def discover_all(ha_url=None, ha_token=None):
+    """Run full discovery - fetch all data from HA.
+
+    Defaults to the HA_URL / HA_TOKEN environment configuration.
+    """
+    ha_url = ha_url or HA_URL
+    ha_token = ha_token or HA_TOKEN
+    log("Starting discovery...")
+
+    discovery = {
+        "discovery_timestamp": datetime.now(timezone.utc).isoformat(),
+        "ha_version": None,
+        "entity_count": 0,
+        "capabilities": {},
+        "entities": {},
+        "devices": {},
+        "areas": {},
+        "integrations": [],
+        "labels": [],
+    }
+
+    # REST calls and the registry session are independent, so run them concurrently
+    log("Fetching states, config and registries...")
+    async with create_session(ha_token) as session:
+        states, config, registries = await asyncio.gather(
+            fetch_rest_api(session, ha_url, "/api/states"),
+            fetch_rest_api(session, ha_url, "/api/config"),
+            fetch_registries(session, ha_url, ha_token),
+        )
+    entity_registry, device_registry, area_registry, label_registry = registries
+
+    discovery["entity_count"] = len(states)
+    log(f"Found {len(states)} entities")
+    discovery["ha_version"] = config.get("version")
+    log(f"HA version: {discovery['ha_version']}")
+    discovery["labels"] = label_registry
+
+    # Detect capabilities
+    log("Detecting capabilities...")
+    capabilities = detect_capabilities(states, entity_registry, device_registry)
+    discovery["capabilities"] = capabilities
+    log(f"Detected {len(capabilities)} capabilities")
+
+    # Process entities (combine state + registry metadata)
+    log("Processing entities...")
+    entity_map = {e["entity_id"]: e for e in entity_registry}
+    for state in states:
+        entity_id = state["entity_id"]
+        domain = entity_domain(entity_id)
+        registry_entry = entity_map.get(entity_id, {})
+
+        discovery["entities"][entity_id] = {
+            "entity_id": entity_id,
+            "state": state.get("state"),
+            "attributes": state.get("attributes", {}),
+            "last_changed": state.get("last_changed"),
+            "last_updated": state.get("last_updated"),
+            "friendly_name": registry_entry.get("name") or state.get("attributes", {}).get("friendly_name"),
+            "device_id": registry_entry.get("device_id"),
+            "area_id": registry_entry.get("area_id"),
+            "labels": registry_entry.get("labels", []),
+            "domain": domain,
+            "device_class": state.get("attributes", {}).get("device_class"),
+            "unit_of_measurement": state.get("attributes", {}).get("unit_of_measurement"),
+            "disabled": registry_entry.get("disabled_by") is not None,
+            "hidden": registry_entry.get("hidden_by") is not None,
+            "icon": registry_entry.get("icon") or state.get("attributes", {}).get("icon"),
+        }
+
+    # Process devices
+    log("Processing devices...")
+    for device in device_registry:
+        device_id = device["id"]
+        discovery["devices"][device_id] = {
+            "device_id": device_id,
+            "name": device.get("name"),
+            "manufacturer": device.get("manufacturer"),
+            "model": device.get("model"),
+            "area_id": device.get("area_id"),
+            "via_device_id": device.get("via_device_id"),
+        }
+
+    # Backfill entity area_id from parent device when entity has no direct area
+    log("Resolving entity areas from devices...")
+    backfilled = 0
+    for eid, entity in discovery["entities"].items():
+        if not entity.get("area_id") and entity.get("device_id"):
+            device = discovery["devices"].get(entity["device_id"])
+            if device and device.get("area_id"):
+                entity["area_id"] = device["area_id"]
+                backfilled += 1
+    log(f"Backfilled area_id for {backfilled} entities from their parent devices")
+
+    # Process areas (entity counts include device-inherited areas)
+    log("Processing areas...")
+    area_counts = Counter(e["area_id"] for e in discovery["entities"].values() if e.get("area_id"))
+    for area in area_registry:
+        area_id = area["area_id"]
+        discovery["areas"][area_id] = {
+            "area_id": area_id,
+            "name": area.get("name"),
+            "entity_count": area_counts.get(area_id, 0),
+        }
+
+    # Extract integrations (unique domains)
+    log("Extracting integrations...")
+    domains = Counter(e["domain"] for e in discovery["entities"].values())
+    discovery["integrations"] = [
+        {"domain": domain, "entity_count": count}
+        for domain, count in domains.most_common()
+        if domain not in UNAVAILABLE_EXCLUDE_DOMAINS
+    ]
+
+    # Set top-level counts for metadata consumers
+    discovery["device_count"] = len(discovery["devices"])
+    discovery["area_count"] = len(discovery["areas"])
+
+    log("Discovery complete!")
+    return discovery
+
+
+def write_json(result, stream=None):
+    """Write result as indented JSON bytes to stream or stdout (orjson when available)."""
+    stream = stream or sys.stdout.buffer
+    if orjson is not None:
+        stream.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        stream.write(json.dumps(result, indent=2).encode("utf-8"))
+    stream.write(b"\n")
+    stream.flush()
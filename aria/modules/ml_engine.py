@@ -11,8 +11,11 @@ Architecture:
 - Model selection is configurable: any subset of {gb, rf, lgbm} can be enabled
 """
 
+import asyncio
+import copy
 import json
 import logging
+import os
 import pickle
 import math
 import warnings
@@ -21,8 +24,8 @@ from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 
 import numpy as np
-from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, IsolationForest
-from sklearn.preprocessing import StandardScaler
+from joblib import Parallel, delayed
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor, IsolationForest
 from sklearn.metrics import mean_absolute_error, r2_score
 import lightgbm as lgb
 
@@ -36,6 +39,11 @@ warnings.filterwarnings(
     module="sklearn",
 )
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from aria.engine.features.feature_config import DEFAULT_FEATURE_CONFIG as _ENGINE_FEATURE_CONFIG  # noqa: E402
 from aria.hub.core import Module, IntelligenceHub  # noqa: E402
 from aria.capabilities import Capability, DemandSignal  # noqa: E402
@@ -48,16 +56,219 @@ DECAY_HALF_LIFE_DAYS = 7
 WEEKDAY_ALIGNMENT_BONUS = 1.5
 ROLLING_WINDOWS_HOURS = [1, 3, 6]
 
+# Fewest rows a target needs for a full fit / for a warm-start update (one week of days)
+MIN_TRAINING_SAMPLES = 14
+MIN_WARM_START_SAMPLES = 7
+
+# Default blend weight per model key, in the order models are run and reported
+MODEL_WEIGHT_DEFAULTS = {"gb": 0.35, "rf": 0.25, "lgbm": 0.40}
+
+# Discovered capability -> targets we predict for it
+CAPABILITY_PREDICTIONS: Dict[str, List[str]] = {
+    "power_monitoring": ["power_watts"],
+    "lighting": ["lights_on", "total_brightness"],
+    "occupancy": ["people_home", "devices_home"],
+    "motion": ["motion_active_count"],
+    "climate": ["temperature", "humidity"],
+}
+
+# Prediction target -> (snapshot section, key) holding its value
+TARGET_SNAPSHOT_FIELDS: Dict[str, Tuple[str, str]] = {
+    "power_watts": ("power", "total_watts"),
+    "lights_on": ("lights", "on"),
+    "total_brightness": ("lights", "total_brightness"),
+    "people_home": ("occupancy", "people_home_count"),
+    "devices_home": ("occupancy", "device_count_home"),
+    "motion_active_count": ("motion", "active_count"),
+}
+
 
 def should_full_retrain(current_trees: int, max_trees: int = 500) -> bool:
     """Check if model has exceeded tree cap and needs full retrain.
 
-    Phase 2: Wire into _train_model_for_target() to gate incremental vs full
-    retrain based on config['incremental.max_total_trees'].
+    Gates warm-start vs full retraining in MLEngine._plan_warm_start against
+    config['incremental.max_total_trees'].
     """
     return current_trees > max_trees
 
 
+def _model_tree_count(model_data: Dict[str, Any]) -> int:
+    """Largest tree/iteration count across a target's gb, rf and lgbm models."""
+    return max(
+        model_data["gb_model"].n_iter_,
+        len(model_data["rf_model"].estimators_),
+        model_data["lgbm_model"].booster_.num_trees(),
+    )
+
+
+def _trailing_means(values: List[float], window: int) -> np.ndarray:
+    """Mean of every full window of values; entry j averages values[j : j + window].
+
+    Computed by differencing one cumulative sum, so the cost is linear in
+    len(values) regardless of the window size.
+    """
+    csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return (csum[window:] - csum[:-window]) / window
+
+
+def _read_json_file(path: Path) -> Any:
+    """Read and parse one JSON file (blocking; run through asyncio.to_thread)."""
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
+def _read_pickle_file(path: Path) -> Any:
+    """Unpickle one model file (blocking; run through asyncio.to_thread).
+
+    The file is read in one call and unpickled from memory rather than
+    letting pickle.load issue many small buffered reads.
+    """
+    with open(path, "rb") as f:
+        return pickle.loads(f.read())
+
+
+def _list_model_files(models_dir: Path) -> List[Path]:
+    """Sorted *.pkl files directly under models_dir (one scandir pass, no per-file stat)."""
+    with os.scandir(models_dir) as it:
+        return sorted(Path(entry.path) for entry in it if entry.name.endswith(".pkl"))
+
+
+def _fit_target_models(
+    X: np.ndarray, y: np.ndarray, sample_weights: np.ndarray, n_jobs: int = -1
+) -> Dict[str, Any]:
+    """Fit the per-target model set on one training matrix.
+
+    Pure CPU work with no hub access, kept at module level so joblib can run
+    it in a worker process. Returns the fitted models, split sizes and
+    validation metrics. ``n_jobs`` is the RandomForest thread count.
+    """
+    # 80/20 chronological split (no shuffle - time series data)
+    split_idx = int(len(X) * 0.8)
+    X_train, X_val = X[:split_idx], X[split_idx:]
+    y_train, y_val = y[:split_idx], y[split_idx:]
+    w_train = sample_weights[:split_idx] if len(sample_weights) > 0 else None
+
+    # Train gradient boosting model (histogram-binned splits; stored as "gb")
+    gb_model = HistGradientBoostingRegressor(
+        max_iter=100,
+        learning_rate=0.1,
+        max_depth=4,
+        min_samples_leaf=max(3, len(X_train) // 20),
+        early_stopping=False,
+        random_state=42,
+    )
+    gb_model.fit(X_train, y_train, sample_weight=w_train)
+
+    # Train RandomForest model
+    rf_model = RandomForestRegressor(n_estimators=100, max_depth=5, random_state=42, n_jobs=n_jobs)
+    rf_model.fit(X_train, y_train, sample_weight=w_train)
+
+    # Train LightGBM model (always trained even if disabled in enabled_models,
+    # so toggling a model on doesn't require a full retrain cycle)
+    lgbm_model = lgb.LGBMRegressor(
+        n_estimators=100,
+        learning_rate=0.1,
+        max_depth=4,
+        num_leaves=15,
+        min_child_samples=max(3, len(X_train) // 20),
+        subsample=0.8,
+        random_state=42,
+        verbosity=-1,  # Suppress LightGBM info logs
+        importance_type="gain",  # Gain-based importance (reduction in loss)
+    )
+    lgbm_model.fit(X_train, y_train, sample_weight=w_train)
+
+    # Train IsolationForest for anomaly detection
+    iso_model = IsolationForest(n_estimators=100, contamination=0.05, random_state=42)
+    iso_model.fit(X_train)
+
+    return _score_target_models(gb_model, rf_model, lgbm_model, iso_model, len(X_train), X_val, y_val)
+
+
+def _warm_start_target_models(
+    previous: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    sample_weights: np.ndarray,
+    n_jobs: int = -1,
+    extra_rounds: int = 20,
+) -> Dict[str, Any]:
+    """Grow a target's saved models by ``extra_rounds`` trees fit on recent data.
+
+    RandomForest and IsolationForest append trees through warm_start,
+    HistGradientBoosting boosts for more iterations and LightGBM continues
+    from the previous booster. The models are copied first, so a failed fit
+    leaves ``previous`` intact. Returns the same dict as _fit_target_models.
+    """
+    split_idx = int(len(X) * 0.8)
+    X_train, X_val = X[:split_idx], X[split_idx:]
+    y_train, y_val = y[:split_idx], y[split_idx:]
+    w_train = sample_weights[:split_idx] if len(sample_weights) > 0 else None
+
+    gb_model = copy.deepcopy(previous["gb_model"])
+    gb_model.set_params(warm_start=True, max_iter=gb_model.n_iter_ + extra_rounds)
+    gb_model.fit(X_train, y_train, sample_weight=w_train)
+
+    rf_model = copy.deepcopy(previous["rf_model"])
+    rf_model.set_params(warm_start=True, n_estimators=len(rf_model.estimators_) + extra_rounds, n_jobs=n_jobs)
+    rf_model.fit(X_train, y_train, sample_weight=w_train)
+
+    old_lgbm = previous["lgbm_model"]
+    lgbm_model = lgb.LGBMRegressor(**{**old_lgbm.get_params(), "n_estimators": extra_rounds})
+    lgbm_model.fit(X_train, y_train, sample_weight=w_train, init_model=old_lgbm.booster_)
+
+    iso_model = copy.deepcopy(previous["iso_model"])
+    iso_model.set_params(warm_start=True, n_estimators=len(iso_model.estimators_) + extra_rounds)
+    iso_model.fit(X_train)
+
+    return _score_target_models(gb_model, rf_model, lgbm_model, iso_model, len(X_train), X_val, y_val)
+
+
+def _score_target_models(
+    gb_model: Any, rf_model: Any, lgbm_model: Any, iso_model: Any, num_train: int, X_val: np.ndarray, y_val: np.ndarray
+) -> Dict[str, Any]:
+    """Bundle fitted models with split sizes and validation metrics."""
+    gb_pred = gb_model.predict(X_val)
+    rf_pred = rf_model.predict(X_val)
+    lgbm_pred = lgbm_model.predict(X_val)
+
+    return {
+        "gb_model": gb_model,
+        "rf_model": rf_model,
+        "lgbm_model": lgbm_model,
+        "iso_model": iso_model,
+        "num_train": num_train,
+        "num_val": len(X_val),
+        "gb_mae": mean_absolute_error(y_val, gb_pred),
+        "gb_r2": r2_score(y_val, gb_pred) if len(y_val) > 1 else 0.0,
+        "rf_mae": mean_absolute_error(y_val, rf_pred),
+        "rf_r2": r2_score(y_val, rf_pred) if len(y_val) > 1 else 0.0,
+        "lgbm_mae": mean_absolute_error(y_val, lgbm_pred),
+        "lgbm_r2": r2_score(y_val, lgbm_pred) if len(y_val) > 1 else 0.0,
+    }
+
+
+def _try_fit_target_models(
+    X: np.ndarray,
+    y: np.ndarray,
+    sample_weights: np.ndarray,
+    n_jobs: int,
+    previous: Optional[Dict[str, Any]] = None,
+    extra_rounds: int = 0,
+) -> Any:
+    """_fit_target_models (or _warm_start_target_models when ``previous`` is
+    given), returning the exception instead of raising it.
+
+    One failing target must not abort the other workers in a parallel batch.
+    """
+    try:
+        if previous is not None:
+            return _warm_start_target_models(previous, X, y, sample_weights, n_jobs, extra_rounds)
+        return _fit_target_models(X, y, sample_weights, n_jobs)
+    except Exception as e:
+        return e
+
+
 class MLEngine(Module):
     """Machine learning prediction engine with adaptive capability mapping."""
 
@@ -68,7 +279,14 @@ class MLEngine(Module):
             description="Feature engineering, model training, and adaptive predictions for HA capabilities.",
             module="ml_engine",
             layer="hub",
-            config_keys=["features.decay_half_life_days", "features.weekday_alignment_bonus"],
+            config_keys=[
+                "features.decay_half_life_days",
+                "features.weekday_alignment_bonus",
+                "incremental.enabled",
+                "incremental.boost_rounds",
+                "incremental.max_total_trees",
+                "incremental.data_window_days",
+            ],
             test_paths=["tests/hub/test_ml_training.py", "tests/hub/test_reference_model.py"],
             systemd_units=["aria-hub.service"],
             status="stable",
@@ -112,13 +330,7 @@ class MLEngine(Module):
 
         # Capability to prediction mapping
         # Maps discovered capabilities to what we should predict
-        self.capability_predictions = {
-            "power_monitoring": ["power_watts"],
-            "lighting": ["lights_on", "total_brightness"],
-            "occupancy": ["people_home", "devices_home"],
-            "motion": ["motion_active_count"],
-            "climate": ["temperature", "humidity"],
-        }
+        self.capability_predictions = {cap: list(targets) for cap, targets in CAPABILITY_PREDICTIONS.items()}
 
         # Model configuration — which model types to train and their blend weights.
         # Keys: "gb" (GradientBoosting), "rf" (RandomForest), "lgbm" (LightGBM)
@@ -128,11 +340,7 @@ class MLEngine(Module):
             "rf": True,
             "lgbm": True,
         }
-        self.model_weights: Dict[str, float] = {
-            "gb": 0.35,
-            "rf": 0.25,
-            "lgbm": 0.40,
-        }
+        self.model_weights: Dict[str, float] = dict(MODEL_WEIGHT_DEFAULTS)
 
         # Loaded models cache
         self.models: Dict[str, Dict[str, Any]] = {}
@@ -158,26 +366,36 @@ class MLEngine(Module):
         self.logger.info("ML Engine initialized")
 
     async def _load_models(self):
-        """Load trained models from disk."""
-        for model_file in self.models_dir.glob("*.pkl"):
-            try:
-                with open(model_file, "rb") as f:
-                    model_data = pickle.load(f)
+        """Load trained models from disk (listed and unpickled on worker threads)."""
+        model_files = await asyncio.to_thread(_list_model_files, self.models_dir)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_read_pickle_file, f) for f in model_files), return_exceptions=True
+        )
 
-                model_name = model_file.stem
-                self.models[model_name] = model_data
-                self.logger.info(f"Loaded model: {model_name}")
+        for model_file, model_data in zip(model_files, results):
+            if isinstance(model_data, Exception):
+                self.logger.error(f"Failed to load model {model_file}: {model_data}")
+                continue
 
-            except Exception as e:
-                self.logger.error(f"Failed to load model {model_file}: {e}")
+            # Target bundles are saved as <target>_model.pkl; key them by target as
+            # train_models does so a restart does not rename them
+            model_name = model_data.get("target", model_file.stem) if isinstance(model_data, dict) else model_file.stem
+            self.models[model_name] = model_data
+            self.logger.info(f"Loaded model: {model_name}")
+
+    def _save_model(self, name: str, model_data: Dict[str, Any]):
+        """Pickle a model to <name>.pkl using the highest pickle protocol."""
+        with open(self.models_dir / f"{name}.pkl", "wb") as f:
+            pickle.dump(model_data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
-    async def train_models(self, days_history: int = 60):
+    async def train_models(self, days_history: int = 60, incremental: bool = False):
         """Train models using historical data.
 
         Args:
             days_history: Number of days of historical data to use for training
+            incremental: Warm-start the saved models on the incremental.data_window_days
+                most recent days instead of refitting them, when _plan_warm_start allows it
         """
-        self.logger.info(f"Training models with {days_history} days of history...")
 
         # Get capabilities to determine what to train (warn if stale)
         capabilities_entry = await self.hub.get_cache_fresh(
@@ -189,6 +407,19 @@ class MLEngine(Module):
 
         capabilities = capabilities_entry.get("data", {})
 
+        # The feature schema is fixed for the whole run: resolve it once for every target
+        config = await self._get_feature_config()
+        feature_names = await self._get_feature_names(config)
+
+        warm_plan = await self._plan_warm_start(capabilities, feature_names) if incremental else None
+        previous_models: Dict[str, Dict[str, Any]] = {}
+        extra_rounds = 0
+        if warm_plan is not None:
+            previous_models, extra_rounds, days_history = warm_plan
+            self.logger.info(f"Warm-starting models with {days_history} days of history (+{extra_rounds} trees)...")
+        else:
+            self.logger.info(f"Training models with {days_history} days of history...")
+
         # Load training data
         training_data = await self._load_training_data(days_history)
         if not training_data:
@@ -200,6 +431,12 @@ class MLEngine(Module):
         # Track training results per capability for feedback loop
         training_results: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
+        # (capability, target, X, y, sample_weights) for every target with enough data
+        jobs: List[Tuple[str, str, np.ndarray, np.ndarray, np.ndarray]] = []
+
+        # Features are target-independent: extract them once for every target
+        feature_matrix = await self._build_feature_matrix(training_data, config)
+
         # Train models for each available capability
         for capability_name, capability_data in capabilities.items():
             if not capability_data.get("available"):
@@ -214,31 +451,53 @@ class MLEngine(Module):
             self.logger.info(f"Training models for capability: {capability_name}")
 
             for target in prediction_targets:
+                # Growing a saved model needs less data than fitting one from scratch
+                min_samples = MIN_WARM_START_SAMPLES if target in previous_models else MIN_TRAINING_SAMPLES
                 try:
-                    await self._train_model_for_target(target, training_data, capability_name)
-                    # Collect results for feedback
-                    if target in self.models and "accuracy_scores" in self.models[target]:
-                        scores = self.models[target]["accuracy_scores"]
-                        # Average R² across all model types
-                        r2_values = [v for k, v in scores.items() if k.endswith("_r2")]
-                        mae_values = [v for k, v in scores.items() if k.endswith("_mae")]
-                        avg_r2 = sum(r2_values) / len(r2_values) if r2_values else 0.0
-                        avg_mae = sum(mae_values) / len(mae_values) if mae_values else 0.0
-                        # Get top 5 features from RF importance
-                        importance = self.models[target].get("feature_importance", {})
-                        top5 = sorted(importance.items(), key=lambda x: x[1], reverse=True)[:5]
-                        if capability_name not in training_results:
-                            training_results[capability_name] = {}
-                        training_results[capability_name][target] = {
-                            "r2": round(avg_r2, 3),
-                            "mae": round(avg_mae, 3),
-                            "top_features": [name for name, _ in top5],
-                        }
+                    dataset = await self._prepare_target_dataset(target, training_data, feature_matrix, min_samples)
                 except Exception as e:
                     self.logger.error(f"Failed to train model for {target}: {e}")
+                    continue
+                if dataset is not None:
+                    jobs.append((capability_name, target, *dataset))
+
+        # Model fitting is independent per target: fan out across processes
+        fits = await self._fit_jobs(
+            [(X, y, w) for _, _, X, y, w in jobs],
+            previous=[previous_models.get(target) for _, target, _, _, _ in jobs] if previous_models else None,
+            extra_rounds=extra_rounds,
+        )
+
+        for (capability_name, target, X, _, _), fitted in zip(jobs, fits):
+            try:
+                if isinstance(fitted, Exception):
+                    raise fitted
+                await self._store_target_model(target, capability_name, len(X), fitted, feature_names)
+                # Collect results for feedback
+                if target in self.models and "accuracy_scores" in self.models[target]:
+                    scores = self.models[target]["accuracy_scores"]
+                    # Average R² across all model types
+                    r2_values = [v for k, v in scores.items() if k.endswith("_r2")]
+                    mae_values = [v for k, v in scores.items() if k.endswith("_mae")]
+                    avg_r2 = sum(r2_values) / len(r2_values) if r2_values else 0.0
+                    avg_mae = sum(mae_values) / len(mae_values) if mae_values else 0.0
+                    # Get top 5 features from RF importance
+                    importance = self.models[target].get("feature_importance", {})
+                    top5 = sorted(importance.items(), key=lambda x: x[1], reverse=True)[:5]
+                    if capability_name not in training_results:
+                        training_results[capability_name] = {}
+                    training_results[capability_name][target] = {
+                        "r2": round(avg_r2, 3),
+                        "mae": round(avg_mae, 3),
+                        "top_features": [name for name, _ in top5],
+                    }
+            except Exception as e:
+                self.logger.error(f"Failed to train model for {target}: {e}")
 
-        # Train global anomaly detector on all features
-        await self._train_anomaly_detector(training_data)
+        # Train global anomaly detector on all features (a warm-start window is too
+        # short to refit it, so the existing detector is kept)
+        if not previous_models or "anomaly_detector" not in self.models:
+            await self._train_anomaly_detector(training_data, feature_matrix)
 
         self.logger.info("Model training complete")
 
@@ -258,8 +517,10 @@ class MLEngine(Module):
             {
                 "last_trained": datetime.now().isoformat(),
                 "days_history": days_history,
+                "incremental": bool(previous_models),
                 "num_snapshots": len(training_data),
                 "capabilities_trained": list(capabilities.keys()),
+                "available_capabilities": self._available_capabilities(capabilities),
                 "targets_trained": trained_targets,
                 "accuracy_summary": accuracy_summary,
                 "has_anomaly_detector": "anomaly_detector" in self.models,
@@ -271,7 +532,6 @@ class MLEngine(Module):
             await self._write_feedback_to_capabilities(training_results)
 
         # Store feature configuration for reuse across restarts
-        config = await self._get_feature_config()
         config["last_modified"] = datetime.now().isoformat()
         config["modified_by"] = "ml_engine"
         await self.hub.set_cache("feature_config", config)
@@ -354,22 +614,27 @@ class MLEngine(Module):
             days: Number of days to load
 
         Returns:
-            List of snapshot dictionaries
+            List of snapshot dictionaries, oldest first, so lag and rolling
+            features look back in time and the validation split is the newest data
         """
-        snapshots = []
-        today = datetime.now()
+        # date.isoformat() is the same YYYY-MM-DD as strftime, without parsing a format per day
+        today = datetime.now().date()
+        dates = [(today - timedelta(days=i)).isoformat() for i in range(days - 1, -1, -1)]
+        paths = [self.training_data_dir / f"{date_str}.json" for date_str in dates]
 
-        for i in range(days):
-            date_str = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-            snapshot_file = self.training_data_dir / f"{date_str}.json"
+        # Read and parse all days concurrently on worker threads
+        results = await asyncio.gather(*(asyncio.to_thread(_read_json_file, p) for p in paths), return_exceptions=True)
 
-            if snapshot_file.exists():
-                try:
-                    with open(snapshot_file) as f:
-                        snapshot = json.load(f)
-                        snapshots.append(snapshot)
-                except (json.JSONDecodeError, IOError) as e:
-                    self.logger.warning(f"Failed to load snapshot {snapshot_file}: {e}")
+        snapshots = []
+        for snapshot_file, result in zip(paths, results):
+            if isinstance(result, FileNotFoundError):
+                continue
+            if isinstance(result, (ValueError, OSError)):
+                self.logger.warning(f"Failed to load snapshot {snapshot_file}: {result}")
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            snapshots.append(result)
 
         return snapshots
 
@@ -381,137 +646,194 @@ class MLEngine(Module):
             training_data: List of historical snapshots
             capability_name: Capability this target belongs to
         """
-        self.logger.info(f"Training model for target: {target}")
+        dataset = await self._prepare_target_dataset(target, training_data)
+        if dataset is None:
+            return
 
-        # Extract features, target values, and decay-based sample weights
-        X, y, sample_weights = await self._build_training_dataset(training_data, target)
+        X, y, sample_weights = dataset
+        fitted = await asyncio.to_thread(_fit_target_models, X, y, sample_weights)
+        await self._store_target_model(target, capability_name, len(X), fitted)
 
-        if len(X) < 14:
-            self.logger.warning(f"Insufficient training data for {target}: {len(X)} samples (need 14+)")
-            return
+    async def _plan_warm_start(
+        self, capabilities: Dict[str, Any], feature_names: List[str]
+    ) -> Optional[Tuple[Dict[str, Dict[str, Any]], int, int]]:
+        """Decide whether a scheduled run can warm-start instead of refitting.
 
-        # Sort snapshots chronologically for proper train/validation split
-        # (already chronological from _load_training_data, but ensure it)
+        Args:
+            capabilities: Capabilities cache data, as used by train_models
+            feature_names: Feature names of this run
 
-        # 80/20 chronological split (no shuffle - time series data)
-        split_idx = int(len(X) * 0.8)
-        X_train, X_val = X[:split_idx], X[split_idx:]
-        y_train, y_val = y[:split_idx], y[split_idx:]
-        w_train = sample_weights[:split_idx] if len(sample_weights) > 0 else None
+        Only targets with a saved model are planned. Targets without one (no
+        TARGET_SNAPSHOT_FIELDS mapping, or too little data so far) don't block
+        the warm start: train_models fits them from scratch on the same window.
 
-        # Train GradientBoosting model
-        gb_model = GradientBoostingRegressor(
-            n_estimators=100,
-            learning_rate=0.1,
-            max_depth=4,
-            min_samples_leaf=max(3, len(X_train) // 20),
-            subsample=0.8,
-            random_state=42,
-        )
-        gb_model.fit(X_train, y_train, sample_weight=w_train)
+        Returns:
+            (previous model bundle per target, trees to add, days of data to load),
+            or None for a full retrain: incremental training is disabled, no target
+            has a saved model, or a saved model was trained on other features or
+            would grow past incremental.max_total_trees.
+        """
+        get_value = self.hub.cache.get_config_value
+        if not await get_value("incremental.enabled", True):
+            return None
+        extra_rounds = int(await get_value("incremental.boost_rounds", 20))
+        max_trees = int(await get_value("incremental.max_total_trees", 500))
+        window_days = int(await get_value("incremental.data_window_days", 14))
+
+        previous: Dict[str, Dict[str, Any]] = {}
+        for capability_name, capability_data in capabilities.items():
+            if not capability_data.get("available"):
+                continue
+            for target in self.capability_predictions.get(capability_name, []):
+                model_data = self.models.get(target)
+                if model_data is None:
+                    continue
+                if model_data.get("feature_names") != feature_names or not isinstance(
+                    model_data.get("gb_model"), HistGradientBoostingRegressor
+                ):
+                    self.logger.info(f"No reusable model for {target}; running a full retrain")
+                    return None
+                if should_full_retrain(_model_tree_count(model_data) + extra_rounds, max_trees):
+                    self.logger.info(f"{target} would exceed {max_trees} trees; running a full retrain")
+                    return None
+                previous[target] = model_data
+
+        if not previous:
+            return None
+        return previous, extra_rounds, window_days
 
-        # Train RandomForest model
-        rf_model = RandomForestRegressor(n_estimators=100, max_depth=5, random_state=42)
-        rf_model.fit(X_train, y_train, sample_weight=w_train)
+    async def _prepare_target_dataset(
+        self,
+        target: str,
+        training_data: List[Dict[str, Any]],
+        feature_matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        min_samples: int = MIN_TRAINING_SAMPLES,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Build (X, y, sample_weights) for a target, or None if there is too little data.
+
+        Snapshots are already chronological from _load_training_data, which the
+        chronological train/validation split in _fit_target_models relies on.
+        """
+        self.logger.info(f"Training model for target: {target}")
 
-        # Train LightGBM model (always trained even if disabled in enabled_models,
-        # so toggling a model on doesn't require a full retrain cycle)
-        lgbm_model = lgb.LGBMRegressor(
-            n_estimators=100,
-            learning_rate=0.1,
-            max_depth=4,
-            num_leaves=15,
-            min_child_samples=max(3, len(X_train) // 20),
-            subsample=0.8,
-            random_state=42,
-            verbosity=-1,  # Suppress LightGBM info logs
-            importance_type="gain",  # Gain-based importance (reduction in loss)
-        )
-        lgbm_model.fit(X_train, y_train, sample_weight=w_train)
+        # Extract features, target values, and decay-based sample weights
+        X, y, sample_weights = await self._build_training_dataset(training_data, target, feature_matrix)
 
-        # Train IsolationForest for anomaly detection
-        iso_model = IsolationForest(n_estimators=100, contamination=0.05, random_state=42)
-        iso_model.fit(X_train)
+        if len(X) < min_samples:
+            self.logger.warning(f"Insufficient training data for {target}: {len(X)} samples (need {min_samples}+)")
+            return None
 
-        # Compute validation metrics
-        gb_pred = gb_model.predict(X_val)
-        rf_pred = rf_model.predict(X_val)
-        lgbm_pred = lgbm_model.predict(X_val)
+        return X, y, sample_weights
 
-        gb_mae = mean_absolute_error(y_val, gb_pred)
-        gb_r2 = r2_score(y_val, gb_pred) if len(y_val) > 1 else 0.0
+    async def _fit_jobs(
+        self,
+        jobs: List[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+        previous: Optional[List[Optional[Dict[str, Any]]]] = None,
+        extra_rounds: int = 0,
+    ) -> List[Any]:
+        """Fit each (X, y, sample_weights) job, one loky worker per job up to the core count.
+
+        Runs off the event loop. ``previous`` optionally holds, per job, the saved
+        model bundle to warm-start with ``extra_rounds`` more trees (None for a
+        full fit). Each result is the _fit_target_models dict, or the exception
+        that job raised.
+        """
+        if not jobs:
+            return []
+        if previous is None:
+            previous = [None] * len(jobs)
+        cpus = os.cpu_count() or 1
+        n_workers = min(len(jobs), cpus)
+        # Cores left over when there are fewer targets than cores go to RandomForest's trees
+        rf_jobs = max(1, cpus // n_workers)
+        parallel = Parallel(n_jobs=n_workers, backend="loky")
+        return await asyncio.to_thread(
+            parallel,
+            (
+                delayed(_try_fit_target_models)(X, y, w, rf_jobs, prev, extra_rounds)
+                for (X, y, w), prev in zip(jobs, previous)
+            ),
+        )
 
-        rf_mae = mean_absolute_error(y_val, rf_pred)
-        rf_r2 = r2_score(y_val, rf_pred) if len(y_val) > 1 else 0.0
+    async def _store_target_model(
+        self,
+        target: str,
+        capability_name: str,
+        num_samples: int,
+        fitted: Dict[str, Any],
+        feature_names: Optional[List[str]] = None,
+    ):
+        """Save a fitted target's models with their metadata and cache them in memory.
 
-        lgbm_mae = mean_absolute_error(y_val, lgbm_pred)
-        lgbm_r2 = r2_score(y_val, lgbm_pred) if len(y_val) > 1 else 0.0
+        Args:
+            target: Target metric the models predict
+            capability_name: Capability this target belongs to
+            num_samples: Training rows (train + validation)
+            fitted: Result of _fit_target_models
+            feature_names: Feature names the models were fit on; looked up
+                from the feature config when not given
+        """
+        if feature_names is None:
+            feature_names = await self._get_feature_names()
 
         # Extract feature importance from RandomForest
-        config = await self._get_feature_config()
-        feature_names = await self._get_feature_names(config)
         feature_importance = {
-            name: round(float(importance), 4) for name, importance in zip(feature_names, rf_model.feature_importances_)
+            name: round(float(importance), 4)
+            for name, importance in zip(feature_names, fitted["rf_model"].feature_importances_)
         }
 
         # Extract LightGBM feature importance (gain-based)
         lgbm_feature_importance = {
             name: round(float(importance), 4)
-            for name, importance in zip(feature_names, lgbm_model.feature_importances_)
+            for name, importance in zip(feature_names, fitted["lgbm_model"].feature_importances_)
         }
 
-        # Create scaler for feature normalization
-        scaler = StandardScaler()
-        scaler.fit(X_train)
-
         # Store model data with complete metadata
         model_data = {
             "target": target,
             "capability": capability_name,
-            "gb_model": gb_model,
-            "rf_model": rf_model,
-            "lgbm_model": lgbm_model,
-            "iso_model": iso_model,
-            "scaler": scaler,
+            "gb_model": fitted["gb_model"],
+            "rf_model": fitted["rf_model"],
+            "lgbm_model": fitted["lgbm_model"],
+            "iso_model": fitted["iso_model"],
             "trained_at": datetime.now().isoformat(),
-            "num_samples": len(X),
-            "num_train": len(X_train),
-            "num_val": len(X_val),
+            "num_samples": num_samples,
+            "num_train": fitted["num_train"],
+            "num_val": fitted["num_val"],
             "feature_names": feature_names,
             "feature_importance": feature_importance,
             "lgbm_feature_importance": lgbm_feature_importance,
             "accuracy_scores": {
-                "gb_mae": round(gb_mae, 3),
-                "gb_r2": round(gb_r2, 3),
-                "rf_mae": round(rf_mae, 3),
-                "rf_r2": round(rf_r2, 3),
-                "lgbm_mae": round(lgbm_mae, 3),
-                "lgbm_r2": round(lgbm_r2, 3),
+                key: round(fitted[key], 3) for key in ("gb_mae", "gb_r2", "rf_mae", "rf_r2", "lgbm_mae", "lgbm_r2")
             },
         }
 
         # Save to disk
-        model_file = self.models_dir / f"{target}_model.pkl"
-        with open(model_file, "wb") as f:
-            pickle.dump(model_data, f)
+        await asyncio.to_thread(self._save_model, f"{target}_model", model_data)
 
         # Cache in memory
         self.models[target] = model_data
 
         self.logger.info(
             f"Model trained for {target}: "
-            f"{len(X)} samples ({len(X_train)} train, {len(X_val)} val), "
+            f"{num_samples} samples ({fitted['num_train']} train, {fitted['num_val']} val), "
             f"{len(feature_names)} features, "
-            f"GB MAE={gb_mae:.2f} R²={gb_r2:.3f}, "
-            f"RF MAE={rf_mae:.2f} R²={rf_r2:.3f}, "
-            f"LGBM MAE={lgbm_mae:.2f} R²={lgbm_r2:.3f}"
+            f"GB MAE={fitted['gb_mae']:.2f} R²={fitted['gb_r2']:.3f}, "
+            f"RF MAE={fitted['rf_mae']:.2f} R²={fitted['rf_r2']:.3f}, "
+            f"LGBM MAE={fitted['lgbm_mae']:.2f} R²={fitted['lgbm_r2']:.3f}"
         )
 
-    async def _train_anomaly_detector(self, training_data: List[Dict[str, Any]]):
+    async def _train_anomaly_detector(
+        self,
+        training_data: List[Dict[str, Any]],
+        feature_matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ):
         """Train global anomaly detector on all features.
 
         Args:
             training_data: List of historical snapshots
+            feature_matrix: _build_feature_matrix result for training_data;
+                built here when not given
         """
         self.logger.info("Training anomaly detector...")
 
@@ -519,43 +841,23 @@ class MLEngine(Module):
             self.logger.warning(f"Insufficient data for anomaly detector ({len(training_data)} < 14)")
             return
 
-        # Build feature matrix from all snapshots
-        config = await self._get_feature_config()
-        feature_names = await self._get_feature_names(config)
-        X_list = []
-
-        for i, snapshot in enumerate(training_data):
-            prev_snapshot = training_data[i - 1] if i > 0 else None
-
-            # Compute rolling stats
-            rolling_stats = {}
-            if i >= 7:
-                recent = training_data[max(0, i - 7) : i]
-                rolling_stats["power_mean_7d"] = sum(s.get("power", {}).get("total_watts", 0) for s in recent) / len(
-                    recent
-                )
-                rolling_stats["lights_mean_7d"] = sum(s.get("lights", {}).get("on", 0) for s in recent) / len(recent)
-
-            features = await self._extract_features(
-                snapshot, config=config, prev_snapshot=prev_snapshot, rolling_stats=rolling_stats
-            )
-
-            if features:
-                X_list.append([features.get(name, 0) for name in feature_names])
+        # Build feature matrix from all snapshots (reusing train_models' matrix when given)
+        if feature_matrix is None:
+            feature_matrix = await self._build_feature_matrix(training_data)
+        X_all, valid = feature_matrix
+        X = X_all[valid]
 
-        if len(X_list) < 14:
-            self.logger.warning(f"Insufficient feature vectors for anomaly detector ({len(X_list)} < 14)")
+        if len(X) < 14:
+            self.logger.warning(f"Insufficient feature vectors for anomaly detector ({len(X)} < 14)")
             return
 
-        X = np.array(X_list, dtype=float)
-
         # Train IsolationForest
         model = IsolationForest(
             n_estimators=100,
             contamination=0.05,  # Assume 5% of training data is anomalous
             random_state=42,
         )
-        model.fit(X)
+        await asyncio.to_thread(model.fit, X)
 
         # Save anomaly detector
         model_data = {
@@ -565,71 +867,102 @@ class MLEngine(Module):
             "contamination": 0.05,
         }
 
-        model_file = self.models_dir / "anomaly_detector.pkl"
-        with open(model_file, "wb") as f:
-            pickle.dump(model_data, f)
+        await asyncio.to_thread(self._save_model, "anomaly_detector", model_data)
 
         # Cache in memory
         self.models["anomaly_detector"] = model_data
 
         self.logger.info(f"Anomaly detector trained: {len(X)} samples, contamination=0.05")
 
-    async def _build_training_dataset(
-        self, snapshots: List[Dict[str, Any]], target: str
-    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Build training dataset from snapshots.
+    async def _build_feature_matrix(
+        self, snapshots: List[Dict[str, Any]], config: Optional[Dict[str, Any]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract the feature row of every snapshot once.
+
+        Features do not depend on the prediction target, so train_models builds
+        this once per run and every target's dataset (and the anomaly detector's)
+        is a row selection of it.
 
         Args:
             snapshots: List of historical snapshots
-            target: Target metric to extract
+            config: Feature configuration (fetched when not given)
 
         Returns:
-            Tuple of (features, targets, sample_weights) as numpy arrays.
-            Sample weights are decay-based: recent data and same-weekday
-            data receive higher weight.
+            Tuple of (X, valid): X has one row per snapshot in feature-name
+            order; valid marks the rows whose features could be extracted.
         """
-        X_list = []
-        y_list = []
-        included_snapshots = []
-        config = await self._get_feature_config()
+        if config is None:
+            config = await self._get_feature_config()
         feature_names = await self._get_feature_names(config)
 
+        # float32: the sklearn tree models split on float32 internally, so this
+        # spares each fit a converted copy of X. Targets stay float64 for the same reason.
+        X = np.zeros((len(snapshots), len(feature_names)), dtype=np.float32)
+        valid = np.zeros(len(snapshots), dtype=bool)
+
+        # Rolling means over the previous 7 snapshots: row i (i >= 7) uses entry i - 7
+        power_mean_7d = _trailing_means([s.get("power", {}).get("total_watts", 0) for s in snapshots], 7)
+        lights_mean_7d = _trailing_means([s.get("lights", {}).get("on", 0) for s in snapshots], 7)
+
         for i, snapshot in enumerate(snapshots):
             # Get previous snapshot and rolling stats for lag features
             prev_snapshot = snapshots[i - 1] if i > 0 else None
 
-            # Compute rolling stats for last 7 snapshots
             rolling_stats = {}
             if i >= 7:
-                recent = snapshots[max(0, i - 7) : i]
-                rolling_stats["power_mean_7d"] = sum(s.get("power", {}).get("total_watts", 0) for s in recent) / len(
-                    recent
-                )
-                rolling_stats["lights_mean_7d"] = sum(s.get("lights", {}).get("on", 0) for s in recent) / len(recent)
+                rolling_stats["power_mean_7d"] = float(power_mean_7d[i - 7])
+                rolling_stats["lights_mean_7d"] = float(lights_mean_7d[i - 7])
 
             # Extract features
             features = await self._extract_features(
                 snapshot, config=config, prev_snapshot=prev_snapshot, rolling_stats=rolling_stats
             )
-            if features is None:
+            if not features:
                 continue
 
-            # Extract target value
-            target_value = self._extract_target(snapshot, target)
-            if target_value is None:
-                continue
+            X[i] = [features.get(name, 0) for name in feature_names]
+            valid[i] = True
+
+        return X, valid
+
+    async def _build_training_dataset(
+        self,
+        snapshots: List[Dict[str, Any]],
+        target: str,
+        feature_matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build training dataset from snapshots.
+
+        Args:
+            snapshots: List of historical snapshots
+            target: Target metric to extract
+            feature_matrix: _build_feature_matrix result for these snapshots;
+                built here when not given
+
+        Returns:
+            Tuple of (features, targets, sample_weights) as numpy arrays.
+            Sample weights are decay-based: recent data and same-weekday
+            data receive higher weight.
+        """
+        if feature_matrix is None:
+            feature_matrix = await self._build_feature_matrix(snapshots)
+        X_all, valid = feature_matrix
 
-            X_list.append([features.get(name, 0) for name in feature_names])
-            y_list.append(target_value)
-            included_snapshots.append(snapshot)
+        rows = []
+        y_list = []
+        for i in np.flatnonzero(valid):
+            target_value = self._extract_target(snapshots[i], target)
+            if target_value is not None:
+                rows.append(i)
+                y_list.append(target_value)
 
-        if not X_list:
+        if not rows:
             return np.array([]), np.array([]), np.array([])
 
         # Compute decay-based sample weights
-        sample_weights = self._compute_decay_weights(included_snapshots)
+        sample_weights = self._compute_decay_weights([snapshots[i] for i in rows])
 
-        return np.array(X_list), np.array(y_list), sample_weights
+        return X_all[rows], np.array(y_list, dtype=np.float64), sample_weights
 
     async def _get_feature_config(self) -> Dict[str, Any]:
         """Get feature configuration from cache or return default.
@@ -639,8 +972,6 @@ class MLEngine(Module):
         """
         # Use canonical engine config as default — hub extends with rolling
         # window features in _get_feature_names(), not in the config dict.
-        import copy
-
         default = copy.deepcopy(_ENGINE_FEATURE_CONFIG)
         default["modified_by"] = "ml_engine"
 
@@ -1103,20 +1434,11 @@ class MLEngine(Module):
         Returns:
             Target value or None if not available
         """
-        # Map target names to snapshot locations
-        target_map = {
-            "power_watts": ("power", "total_watts"),
-            "lights_on": ("lights", "on"),
-            "total_brightness": ("lights", "total_brightness"),
-            "people_home": ("occupancy", "people_home_count"),
-            "devices_home": ("occupancy", "device_count_home"),
-            "motion_active_count": ("motion", "active_count"),
-        }
-
-        if target not in target_map:
+        location = TARGET_SNAPSHOT_FIELDS.get(target)
+        if location is None:
             return None
 
-        section, key = target_map[target]
+        section, key = location
         value = snapshot.get(section, {}).get(key)
 
         return float(value) if value is not None else None
@@ -1181,38 +1503,23 @@ class MLEngine(Module):
         if "anomaly_detector" in self.models:
             try:
                 anomaly_model = self.models["anomaly_detector"]["model"]
-                anomaly_score = float(anomaly_model.decision_function(X)[0])
-                # Negative score = anomaly (more negative = more anomalous)
-                is_anomaly = bool(anomaly_model.predict(X)[0] == -1)
+                anomaly_score = float((await asyncio.to_thread(anomaly_model.decision_function, X))[0])
+                # Negative score = anomaly (more negative = more anomalous); this is
+                # exactly IsolationForest.predict(X) == -1 without scoring twice
+                is_anomaly = anomaly_score < 0
                 self.logger.info(f"Anomaly detection: score={anomaly_score:.3f}, is_anomaly={is_anomaly}")
             except Exception as e:
                 self.logger.error(f"Anomaly detection failed: {e}")
 
-        for target, model_data in self.models.items():
-            # Skip anomaly detector (already processed)
-            if target == "anomaly_detector":
-                continue
+        # All model inference in one worker thread, off the event loop
+        raw_predictions = await asyncio.to_thread(self._predict_targets, X)
 
+        for target, individual_preds in raw_predictions.items():
             try:
-                # Scale features
-                scaler = model_data["scaler"]
-                X_scaled = scaler.transform(X)
-
-                # Collect predictions from all enabled models
-                individual_preds: Dict[str, float] = {}
-                active_weights: Dict[str, float] = {}
+                if isinstance(individual_preds, Exception):
+                    raise individual_preds
 
-                if self.enabled_models.get("gb") and "gb_model" in model_data:
-                    individual_preds["gb"] = float(model_data["gb_model"].predict(X_scaled)[0])
-                    active_weights["gb"] = self.model_weights.get("gb", 0.35)
-
-                if self.enabled_models.get("rf") and "rf_model" in model_data:
-                    individual_preds["rf"] = float(model_data["rf_model"].predict(X_scaled)[0])
-                    active_weights["rf"] = self.model_weights.get("rf", 0.25)
-
-                if self.enabled_models.get("lgbm") and "lgbm_model" in model_data:
-                    individual_preds["lgbm"] = float(model_data["lgbm_model"].predict(X_scaled)[0])
-                    active_weights["lgbm"] = self.model_weights.get("lgbm", 0.40)
+                active_weights = {k: self.model_weights.get(k, MODEL_WEIGHT_DEFAULTS[k]) for k in individual_preds}
 
                 if not individual_preds:
                     self.logger.warning(f"No enabled models produced predictions for {target}")
@@ -1291,6 +1598,30 @@ class MLEngine(Module):
 
         return result
 
+    def _predict_targets(self, X: np.ndarray) -> Dict[str, Any]:
+        """Run every enabled model of every target on the shared feature row.
+
+        Blocking; generate_predictions calls it through asyncio.to_thread.
+
+        Returns:
+            target -> {model key: prediction} in gb/rf/lgbm order, or the
+            exception raised while predicting that target
+        """
+        raw: Dict[str, Any] = {}
+        for target, model_data in list(self.models.items()):
+            if target == "anomaly_detector":
+                continue
+            try:
+                # Models are fit on unscaled features (trees are scale-invariant)
+                raw[target] = {
+                    key: float(model_data[f"{key}_model"].predict(X)[0])
+                    for key in MODEL_WEIGHT_DEFAULTS
+                    if self.enabled_models.get(key) and f"{key}_model" in model_data
+                }
+            except Exception as e:
+                raw[target] = e
+        return raw
+
     async def _get_current_snapshot(self) -> Optional[Dict[str, Any]]:
         """Get latest snapshot from cache or build from discovery data.
 
@@ -1333,8 +1664,7 @@ class MLEngine(Module):
         if len(snapshot_files) >= 2:
             # Return second-to-last (most recent historical)
             try:
-                with open(snapshot_files[-2]) as f:
-                    return json.load(f)
+                return await asyncio.to_thread(_read_json_file, snapshot_files[-2])
             except Exception as e:
                 self.logger.warning(f"Failed to load previous snapshot: {e}")
 
@@ -1353,14 +1683,16 @@ class MLEngine(Module):
         if len(snapshot_files) < 7:
             return stats
 
+        recent_files = snapshot_files[-7:]
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_read_json_file, f) for f in recent_files), return_exceptions=True
+        )
         recent_snapshots = []
-        for snapshot_file in snapshot_files[-7:]:
-            try:
-                with open(snapshot_file) as f:
-                    recent_snapshots.append(json.load(f))
-            except Exception as e:
-                self.logger.warning(f"Failed to load snapshot {snapshot_file}: {e}")
+        for snapshot_file, result in zip(recent_files, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Failed to load snapshot {snapshot_file}: {result}")
                 continue
+            recent_snapshots.append(result)
 
         if not recent_snapshots:
             return stats
@@ -1396,6 +1728,33 @@ class MLEngine(Module):
         if event_type == "cache_updated" and data.get("category") == "capabilities":
             self.logger.info("Capabilities updated - models may need retraining")
 
+    @staticmethod
+    def _available_capabilities(capabilities: Dict[str, Any]) -> List[str]:
+        """Sorted names of the available capabilities (what decides the trained targets)."""
+        return sorted(name for name, data in capabilities.items() if data.get("available"))
+
+    async def _trained_since(self, max_age: timedelta) -> bool:
+        """Whether the last training run is younger than max_age and used the current capabilities.
+
+        The scheduler sleeps a full interval after each run, so this only holds when
+        a training run was triggered by other means (e.g. the API) since the last tick.
+        """
+        metadata_entry = await self.hub.get_cache("ml_training_metadata")
+        capabilities_entry = await self.hub.get_cache("capabilities")
+        if not metadata_entry or not capabilities_entry:
+            return False
+
+        metadata = metadata_entry.get("data", {})
+        try:
+            last_trained = datetime.fromisoformat(metadata["last_trained"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        if datetime.now() - last_trained >= max_age:
+            return False
+        return metadata.get("available_capabilities") == self._available_capabilities(
+            capabilities_entry.get("data", {})
+        )
+
     async def schedule_periodic_training(self, interval_days: int = 7):
         """Schedule periodic model retraining.
 
@@ -1405,7 +1764,10 @@ class MLEngine(Module):
 
         async def training_task():
             try:
-                await self.train_models(days_history=60)
+                if await self._trained_since(timedelta(days=interval_days)):
+                    self.logger.info("Skipping scheduled training: models are recent and capabilities unchanged")
+                    return
+                await self.train_models(days_history=60, incremental=True)
             except Exception as e:
                 self.logger.error(f"Scheduled training failed: {e}")
 
@@ -11,12 +11,33 @@ from sklearn.cluster import HDBSCAN
 from sklearn.metrics import silhouette_samples
 from sklearn.preprocessing import StandardScaler
 
+# Above this many entities, silhouettes are estimated on a stratified sample
+# (silhouette_samples is O(N^2) in the number of rows)
+SILHOUETTE_SAMPLE_SIZE = 2000
+
+
+def _sample_rows(labels: np.ndarray, sample_size: int, seed: int = 0) -> np.ndarray:
+    """Sorted row indices of a stratified sample of about sample_size rows.
+
+    Every label keeps a share proportional to its size, and at least two rows
+    (when it has them) so small clusters still get a silhouette estimate.
+    """
+    rng = np.random.default_rng(seed)
+    fraction = sample_size / len(labels)
+    picked = []
+    for label in np.unique(labels):
+        rows = np.flatnonzero(labels == label)
+        k = min(len(rows), max(2, round(len(rows) * fraction)))
+        picked.append(rng.choice(rows, size=k, replace=False))
+    return np.sort(np.concatenate(picked))
+
 
 def cluster_entities(
     matrix: np.ndarray,
     entity_ids: list[str],
     min_cluster_size: int = 5,
     min_samples: int = 3,
+    silhouette_sample_size: int = SILHOUETTE_SAMPLE_SIZE,
 ) -> list[dict]:
     """Cluster entities using HDBSCAN on a feature matrix.
 
@@ -25,6 +46,9 @@ def cluster_entities(
         entity_ids: Entity ID strings, one per row in matrix.
         min_cluster_size: Minimum cluster size for HDBSCAN.
         min_samples: Minimum samples for HDBSCAN core point definition.
+        silhouette_sample_size: Row count above which per-cluster silhouettes
+            are averaged over a stratified sample (fixed seed) instead of
+            every entity.
 
     Returns:
         List of cluster dicts with keys: cluster_id, entity_ids, silhouette.
@@ -61,10 +85,13 @@ def cluster_entities(
     # 4. Compute per-sample silhouette scores (needs >= 2 clusters)
     n_clusters = len(unique_labels)
     has_silhouette = n_clusters >= 2
-    if has_silhouette:
+    if has_silhouette and len(labels) > silhouette_sample_size:
+        rows = _sample_rows(labels, silhouette_sample_size)
+        score_labels = labels[rows]
+        sample_scores = silhouette_samples(scaled[rows], score_labels)
+    elif has_silhouette:
+        score_labels = labels
         sample_scores = silhouette_samples(scaled, labels)
-    else:
-        sample_scores = np.zeros(len(labels))
 
     # 5. Build cluster dicts
     entity_arr = np.array(entity_ids)
@@ -73,7 +100,7 @@ def cluster_entities(
         mask = labels == label
         member_ids = entity_arr[mask].tolist()
         if has_silhouette:
-            avg_silhouette = float(np.mean(sample_scores[mask]))
+            avg_silhouette = float(np.mean(sample_scores[score_labels == label]))
         else:
             # Single cluster — silhouette is undefined, report 0.0
             avg_silhouette = 0.0
@@ -218,6 +218,8 @@ class OrganicDiscoveryModule(Module):
         # 5-6. Name and score each cluster
         organic_caps: Dict[str, Dict[str, Any]] = {}
         total_entities = len(entity_ids) if entity_ids else 1
+        # Built once for the demand-alignment lookups of every cluster below
+        entity_lookup = {e.get("entity_id", ""): e for e in entities}
 
         for cluster in clusters:
             cluster_id = cluster["cluster_id"]
@@ -251,7 +253,6 @@ class OrganicDiscoveryModule(Module):
             usefulness = compute_usefulness(components)
 
             # Demand alignment bonus
-            entity_lookup = {e.get("entity_id", ""): e for e in entities}
             cluster_entity_data = [entity_lookup[eid] for eid in member_ids if eid in entity_lookup]
             demand_bonus = self._compute_demand_alignment(cluster_entity_data, demand_signals)
             usefulness = int(min(usefulness + demand_bonus * 100, 100))
@@ -310,8 +311,7 @@ class OrganicDiscoveryModule(Module):
                 usefulness = compute_usefulness(components)
 
                 # Demand alignment bonus
-                entity_lookup_b = {e.get("entity_id", ""): e for e in entities}
-                cluster_entity_data_b = [entity_lookup_b[eid] for eid in member_ids if eid in entity_lookup_b]
+                cluster_entity_data_b = [entity_lookup[eid] for eid in member_ids if eid in entity_lookup]
                 demand_bonus_b = self._compute_demand_alignment(cluster_entity_data_b, demand_signals)
                 usefulness = int(min(usefulness + demand_bonus_b * 100, 100))
 
@@ -6,8 +6,11 @@ five measurable components with fixed weights.
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 
+import numpy as np
+
 # Weights must sum to 1.0
 WEIGHTS: dict[str, float] = {
     "predictability": 0.30,
@@ -17,13 +20,24 @@ WEIGHTS: dict[str, float] = {
     "cohesion": 0.15,
 }
 
+# Unpacked for the straight-line weighted sum in compute_usefulness
+_W_PRED = WEIGHTS["predictability"]
+_W_STAB = WEIGHTS["stability"]
+_W_COV = WEIGHTS["entity_coverage"]
+_W_ACT = WEIGHTS["activity"]
+_W_COH = WEIGHTS["cohesion"]
+
+# Same weights as a vector, in COMPONENT_ORDER, for batch scoring
+COMPONENT_ORDER: tuple[str, ...] = tuple(WEIGHTS)
+_W_VEC = np.array([WEIGHTS[k] for k in COMPONENT_ORDER], dtype=np.float64)
+
 
 def _clamp(value: float) -> float:
     """Clamp a value to the 0.0-1.0 range."""
     return max(0.0, min(1.0, value))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UsefulnessComponents:
     """Raw component scores for a single capability, each 0.0-1.0.
 
@@ -40,15 +54,19 @@ class UsefulnessComponents:
     activity: float
     cohesion: float
 
+    def as_int_tuple(self) -> tuple[int, int, int, int, int]:
+        """Return each component as a 0-100 int (clamped), in COMPONENT_ORDER."""
+        return (
+            int(round(_clamp(self.predictability) * 100)),
+            int(round(_clamp(self.stability) * 100)),
+            int(round(_clamp(self.entity_coverage) * 100)),
+            int(round(_clamp(self.activity) * 100)),
+            int(round(_clamp(self.cohesion) * 100)),
+        )
+
     def to_dict(self) -> dict[str, int]:
-        """Return each component as a 0-100 int (clamped)."""
-        return {
-            "predictability": int(round(_clamp(self.predictability) * 100)),
-            "stability": int(round(_clamp(self.stability) * 100)),
-            "entity_coverage": int(round(_clamp(self.entity_coverage) * 100)),
-            "activity": int(round(_clamp(self.activity) * 100)),
-            "cohesion": int(round(_clamp(self.cohesion) * 100)),
-        }
+        """Return each component as a 0-100 int (clamped), keyed by name."""
+        return dict(zip(COMPONENT_ORDER, self.as_int_tuple(), strict=True))
 
 
 def compute_usefulness(components: UsefulnessComponents) -> int:
@@ -61,13 +79,39 @@ def compute_usefulness(components: UsefulnessComponents) -> int:
         activity        15%
         cohesion        15%
     """
-    clamped = {
-        "predictability": _clamp(components.predictability),
-        "stability": _clamp(components.stability),
-        "entity_coverage": _clamp(components.entity_coverage),
-        "activity": _clamp(components.activity),
-        "cohesion": _clamp(components.cohesion),
-    }
-
-    score = sum(clamped[k] * WEIGHTS[k] for k in WEIGHTS)
+    c = components
+    score = (
+        _clamp(c.predictability) * _W_PRED
+        + _clamp(c.stability) * _W_STAB
+        + _clamp(c.entity_coverage) * _W_COV
+        + _clamp(c.activity) * _W_ACT
+        + _clamp(c.cohesion) * _W_COH
+    )
     return int(round(score * 100))
+
+
+def _components_matrix(components: Sequence[UsefulnessComponents]) -> np.ndarray:
+    """Stack UsefulnessComponents into an (N, 5) float64 matrix in COMPONENT_ORDER."""
+    values = (v for c in components for v in (c.predictability, c.stability, c.entity_coverage, c.activity, c.cohesion))
+    return np.fromiter(values, dtype=np.float64, count=5 * len(components)).reshape(-1, 5)
+
+
+def compute_usefulness_batch(components: np.ndarray | Sequence[UsefulnessComponents]) -> np.ndarray:
+    """Score many clusters at once.
+
+    Args:
+        components: (N, 5) array of raw component scores with columns in
+            COMPONENT_ORDER (predictability, stability, entity_coverage,
+            activity, cohesion), or a sequence of UsefulnessComponents.
+            Any float dtype; the input is not modified.
+
+    Returns:
+        (N,) int array of usefulness scores, 0-100, same as calling
+        compute_usefulness on each row.
+    """
+    if not isinstance(components, np.ndarray) and components and isinstance(components[0], UsefulnessComponents):
+        components = _components_matrix(components)
+    clamped = np.clip(np.asarray(components, dtype=np.float64).reshape(-1, 5), 0.0, 1.0)
+    # Row sums accumulate left to right, matching compute_usefulness bit for bit
+    score = (clamped * _W_VEC).sum(axis=1)
+    return np.rint(score * 100).astype(np.int64)
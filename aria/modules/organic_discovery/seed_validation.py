@@ -1,20 +1,68 @@
 """Validate organic clusters against seed (hard-coded) capabilities."""
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 MATCH_THRESHOLD = 0.8
 
 
 def jaccard_similarity(set_a: set, set_b: set) -> float:
-    """Compute Jaccard similarity between two sets."""
+    """Compute Jaccard similarity between two sets.
+
+    The union size is derived from the intersection (|A| + |B| - |A n B|),
+    so only one temporary set is built per call.
+    """
     if not set_a and not set_b:
         return 0.0
     intersection = len(set_a & set_b)
-    union = len(set_a | set_b)
+    union = len(set_a) + len(set_b) - intersection
     return intersection / union if union > 0 else 0.0
 
 
+def _pack_bitsets(groups: list[set], id_map: dict[str, int], n_words: int) -> np.ndarray:
+    """Encode each entity group as a row of uint64 words (one bit per mapped entity id).
+
+    Entities missing from ``id_map`` are skipped. All groups are scattered in a
+    single ``bitwise_or.at`` call over flattened (row, word) offsets.
+    """
+    bits = np.zeros(len(groups) * n_words, dtype=np.uint64)
+    rows: list[int] = []
+    ids: list[int] = []
+    for row, members in enumerate(groups):
+        mapped = [id_map[e] for e in members if e in id_map]
+        ids.extend(mapped)
+        rows.extend([row] * len(mapped))
+    if ids:
+        idx = np.array(ids, dtype=np.uint64)
+        offsets = np.array(rows, dtype=np.intp) * n_words + (idx >> np.uint64(6)).astype(np.intp)
+        np.bitwise_or.at(bits, offsets, np.uint64(1) << (idx & np.uint64(63)))
+    return bits.reshape(len(groups), n_words)
+
+
+def _jaccard_matrix(seed_sets: list[set], cluster_sets: list[set]) -> np.ndarray:
+    """Pairwise Jaccard similarity, shape (n_seeds, n_clusters), via bitset AND + popcount.
+
+    Only entities that appear in some seed can contribute to an intersection, so
+    the bit vocabulary is restricted to seed entities and the union is derived
+    from set sizes: |A u B| = |A| + |B| - |A n B|. Cluster members outside every
+    seed are never packed, which keeps rows short when clusters are large.
+    """
+    vocab = set().union(*seed_sets)
+    id_map = {entity_id: i for i, entity_id in enumerate(vocab)}
+    n_words = max(1, (len(vocab) + 63) // 64)
+
+    seed_bits = _pack_bitsets(seed_sets, id_map, n_words)
+    cluster_bits = _pack_bitsets(cluster_sets, id_map, n_words)
+
+    inter = np.bitwise_count(seed_bits[:, None, :] & cluster_bits[None, :, :]).sum(axis=-1, dtype=np.int64)
+    seed_sizes = np.fromiter((len(s) for s in seed_sets), dtype=np.int64, count=len(seed_sets))
+    cluster_sizes = np.fromiter((len(c) for c in cluster_sets), dtype=np.int64, count=len(cluster_sets))
+    union = seed_sizes[:, None] + cluster_sizes[None, :] - inter
+    return np.divide(inter, union, out=np.zeros(inter.shape, dtype=np.float64), where=union > 0)
+
+
 def validate_seeds(
     seed_capabilities: dict,
     clusters: list[dict],
@@ -25,19 +73,24 @@ def validate_seeds(
     Returns dict mapping seed name to validation result:
         best_jaccard, best_cluster_id, matched (bool)
     """
+    seed_names = list(seed_capabilities)
+    seed_sets = [set(seed_capabilities[name].get("entities", [])) for name in seed_names]
+    cluster_sets = [set(cluster["entity_ids"]) for cluster in clusters]
+
+    if seed_sets and cluster_sets:
+        jaccard = _jaccard_matrix(seed_sets, cluster_sets)
+        best_idx = jaccard.argmax(axis=1)
+        best_scores = jaccard[np.arange(len(seed_sets)), best_idx]
+    else:
+        best_idx = best_scores = None
+
     results = {}
 
-    for seed_name, seed_data in seed_capabilities.items():
-        seed_entities = set(seed_data.get("entities", []))
-        best_jaccard = 0.0
-        best_cluster_id = None
-
-        for cluster in clusters:
-            cluster_entities = set(cluster["entity_ids"])
-            sim = jaccard_similarity(seed_entities, cluster_entities)
-            if sim > best_jaccard:
-                best_jaccard = sim
-                best_cluster_id = cluster["cluster_id"]
+    for row, seed_name in enumerate(seed_names):
+        seed_entities = seed_sets[row]
+        best_jaccard = float(best_scores[row]) if best_scores is not None else 0.0
+        # argmax picks the first maximum, matching a strict ">" scan; no overlap means no best cluster
+        best_cluster_id = clusters[best_idx[row]]["cluster_id"] if best_jaccard > 0.0 else None
 
         matched = best_jaccard >= threshold
         if not matched and seed_entities:
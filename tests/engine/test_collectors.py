@@ -53,6 +53,25 @@ class TestDailySnapshot(unittest.TestCase):
         self.assertEqual(snapshot["day_of_week"], "Tuesday")
         self.assertFalse(snapshot["is_weekend"])
 
+    def test_holiday_flags(self):
+        snapshot = build_empty_snapshot("2026-07-04", HolidayConfig())
+        self.assertTrue(snapshot["is_holiday"])
+        self.assertIn("Independence Day", snapshot["holiday_name"])
+        self.assertFalse(build_empty_snapshot("2026-07-06", HolidayConfig())["is_holiday"])
+
+    def test_holiday_calendar_copies_are_independent(self):
+        first = HolidayConfig().get_holidays()
+        size = len(first)
+        # A lookup outside the configured years expands that copy only
+        self.assertIn("2031-07-04", first)
+        self.assertEqual(len(HolidayConfig().get_holidays()), size)
+
+    def test_holiday_lookup_outside_years_does_not_mark_year_loaded(self):
+        self.assertNotIn("2030-01-02", HolidayConfig().get_holidays())
+        # A fresh calendar still expands 2030 itself rather than trusting a shared years set
+        self.assertIn("2030-01-01", HolidayConfig().get_holidays())
+        self.assertTrue(build_empty_snapshot("2030-07-04", HolidayConfig())["is_holiday"])
+
 
 class TestExternalData(unittest.TestCase):
     def test_parse_weather(self):
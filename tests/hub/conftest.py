@@ -35,8 +35,33 @@ def api_hub():
     return mock_hub
 
 
+class _HubProxy:
+    """Stand-in hub that forwards every attribute to the current test's api_hub.
+
+    create_api closes over the hub it is given, so routing it through this
+    proxy lets one app (built once per test module) serve each test's own mock.
+    """
+
+    def __init__(self, target):
+        object.__setattr__(self, "_target", target)
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+
+@pytest.fixture(scope="module")
+def _shared_api():
+    """One FastAPI app + TestClient per test module, bound to a _HubProxy."""
+    proxy = _HubProxy(MagicMock(spec=IntelligenceHub))
+    return proxy, TestClient(create_api(proxy))
+
+
 @pytest.fixture
-def api_client(api_hub):
-    """Create a FastAPI TestClient backed by api_hub."""
-    app = create_api(api_hub)
-    return TestClient(app)
+def api_client(api_hub, _shared_api):
+    """A FastAPI TestClient backed by api_hub (the app is shared across the module)."""
+    proxy, client = _shared_api
+    object.__setattr__(proxy, "_target", api_hub)
+    return client
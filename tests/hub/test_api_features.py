@@ -76,7 +76,7 @@ class TestGetVersion:
 class TestGetCacheKeys:
     def test_empty_cache(self, hub, client):
         """Returns empty list when no cache categories exist."""
-        hub.cache.list_categories = AsyncMock(return_value=[])
+        hub.cache.list_entries = AsyncMock(return_value=[])
 
         response = client.get("/api/cache/keys")
         assert response.status_code == 200
@@ -87,11 +87,10 @@ class TestGetCacheKeys:
 
     def test_with_categories(self, hub, client):
         """Returns categories with metadata."""
-        hub.cache.list_categories = AsyncMock(return_value=["entities", "areas"])
-        hub.cache.get = AsyncMock(
-            side_effect=[
-                {"last_updated": "2026-02-13T10:00:00", "version": 3, "data": {}},
-                {"last_updated": "2026-02-13T09:00:00", "version": 1, "data": {}},
+        hub.cache.list_entries = AsyncMock(
+            return_value=[
+                {"category": "entities", "last_updated": "2026-02-13T10:00:00", "version": 3},
+                {"category": "areas", "last_updated": "2026-02-13T09:00:00", "version": 1},
             ]
         )
 
@@ -104,19 +103,6 @@ class TestGetCacheKeys:
         assert data["keys"][0]["version"] == 3
         assert data["keys"][1]["category"] == "areas"
 
-    def test_category_with_no_entry(self, hub, client):
-        """Handles categories where get returns None gracefully."""
-        hub.cache.list_categories = AsyncMock(return_value=["empty_cat"])
-        hub.cache.get = AsyncMock(return_value=None)
-
-        response = client.get("/api/cache/keys")
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["count"] == 1
-        assert data["keys"][0]["last_updated"] is None
-        assert data["keys"][0]["version"] is None
-
 
 # ============================================================================
 # GET /api/metrics
@@ -23,6 +23,19 @@ def mock_discovery_module():
     return module
 
 
+@pytest.fixture(autouse=True)
+def cache_revision(api_hub):
+    """Serve get_revision from whatever entry the test gave cache.get, without calling it."""
+
+    async def get_revision(category):
+        entry = getattr(api_hub.cache.get, "return_value", None)
+        if not isinstance(entry, dict) or entry.get("version") is None:
+            return None
+        return {"category": entry.get("category"), "version": entry["version"], "last_updated": entry["last_updated"]}
+
+    api_hub.cache.get_revision = AsyncMock(side_effect=get_revision)
+
+
 # ============================================================================
 # GET /api/capabilities/candidates
 # ============================================================================
@@ -102,6 +115,73 @@ class TestGetDiscoveryHistory:
         assert data[0]["timestamp"] == "2026-02-14"
         assert data[0]["clusters_found"] == 5
 
+    def test_large_history_is_gzipped(self, api_hub, api_client):
+        """Responses above the size threshold are gzip-encoded; small ones are not."""
+        history = [{"timestamp": f"2026-01-{d:02d}", "clusters_found": 5, "total_merged": 12} for d in range(1, 29)]
+        api_hub.cache.get = AsyncMock(return_value={"data": history})
+
+        response = api_client.get("/api/capabilities/history", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == history
+
+        api_hub.cache.get = AsyncMock(return_value={"data": history[:1]})
+        small = api_client.get("/api/capabilities/history", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+
+    def test_revalidation_returns_304(self, api_hub, api_client):
+        """A client holding the current ETag gets a bodiless 304; a new version gets 200."""
+        entry = {
+            "category": "discovery_history",
+            "data": [{"timestamp": "2026-02-14", "clusters_found": 5}],
+            "version": 3,
+            "last_updated": "2026-02-14T10:00:00",
+        }
+        api_hub.cache.get = AsyncMock(return_value=entry)
+
+        first = api_client.get("/api/capabilities/history")
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+        assert etag.startswith('W/"')
+
+        again = api_client.get("/api/capabilities/history", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+
+        # Weak comparison ignores the W/ prefix; "*" matches any current entry
+        for header in (etag.removeprefix("W/"), f'"other", {etag}', "*"):
+            assert api_client.get("/api/capabilities/history", headers={"If-None-Match": header}).status_code == 304
+
+        repeat = api_client.get("/api/capabilities/history")
+        assert repeat.status_code == 200
+        assert repeat.json() == first.json()
+        assert repeat.headers["content-type"] == "application/json"
+
+        entry["version"] = 4
+        entry["data"] = entry["data"] + [{"timestamp": "2026-02-15", "clusters_found": 6}]
+        changed = api_client.get("/api/capabilities/history", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert len(changed.json()) == 2
+
+    def test_conditional_hits_skip_decoding_the_entry(self, api_hub, api_client):
+        """A 304 or a kept body is served from the revision alone; cache.get runs only on a miss."""
+        entry = {
+            "category": "discovery_history",
+            "data": [{"timestamp": "2026-02-14", "clusters_found": 5}],
+            "version": 7,
+            "last_updated": "2026-02-14T10:00:00",
+        }
+        api_hub.cache.get = AsyncMock(return_value=entry)
+
+        first = api_client.get("/api/capabilities/history")
+        assert api_hub.cache.get.await_count == 1
+
+        again = api_client.get("/api/capabilities/history", headers={"If-None-Match": first.headers["etag"]})
+        repeat = api_client.get("/api/capabilities/history")
+        assert again.status_code == 304
+        assert repeat.json() == first.json()
+        assert api_hub.cache.get.await_count == 1
+
     def test_returns_empty_when_no_cache(self, api_hub, api_client):
         """Returns empty list when no history cached."""
         api_hub.cache.get = AsyncMock(return_value=None)
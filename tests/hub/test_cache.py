@@ -0,0 +1,576 @@
+"""Tests for CacheManager connection setup and core cache/event operations."""
+
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from aria.hub.cache import CacheManager
+
+
+@pytest_asyncio.fixture
+async def cache(tmp_path):
+    """Create and initialize a CacheManager with a temp DB."""
+    cm = CacheManager(str(tmp_path / "test_hub.db"))
+    await cm.initialize()
+    yield cm
+    await cm.close()
+
+
+async def _pragma(cache, name):
+    cursor = await cache._writer.execute(f"PRAGMA {name}")
+    row = await cursor.fetchone()
+    return row[0]
+
+
+class TestConnectionTuning:
+    @pytest.mark.asyncio
+    async def test_wal_journal_mode(self, cache):
+        assert (await _pragma(cache, "journal_mode")).lower() == "wal"
+
+    @pytest.mark.asyncio
+    async def test_tuning_pragmas_applied(self, cache):
+        assert await _pragma(cache, "synchronous") == 1  # NORMAL
+        assert await _pragma(cache, "temp_store") == 2  # MEMORY
+        assert await _pragma(cache, "cache_size") == -20000
+        assert await _pragma(cache, "busy_timeout") == 5000
+
+    @pytest.mark.asyncio
+    async def test_set_get_roundtrip(self, cache):
+        assert await cache.set("entities", {"light.a": {"state": "on"}}) == 1
+        assert await cache.set("entities", {"light.a": {"state": "off"}}) == 2
+        entry = await cache.get("entities")
+        assert entry["version"] == 2
+        assert entry["data"] == {"light.a": {"state": "off"}}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sets_get_distinct_versions(self, cache):
+        versions = await asyncio.gather(*(cache.set("entities", {"i": i}) for i in range(10)))
+        assert sorted(versions) == list(range(1, 11))
+        assert (await cache.get("entities"))["version"] == 10
+
+    @pytest.mark.asyncio
+    async def test_json_columns_stored_as_blob(self, cache):
+        await cache.set("entities", {"light.a": {"state": "on"}}, metadata={"source": "test"})
+        row = await cache._fetchone("SELECT typeof(data), typeof(metadata) FROM cache")
+        assert tuple(row) == ("blob", "blob")
+
+    @pytest.mark.asyncio
+    async def test_large_payload_compressed(self, cache):
+        pytest.importorskip("zstandard")
+        from aria.hub.cache import COMPRESS_MIN_BYTES
+
+        data = {f"sensor.s{i}": {"state": "on", "attributes": {"unit": "W"}} for i in range(200)}
+        await cache.set("entities", data)
+        row = await cache._fetchone("SELECT data FROM cache WHERE category = 'entities'")
+        assert row["data"][:4] == b"\x28\xb5\x2f\xfd"
+        assert len(row["data"]) < COMPRESS_MIN_BYTES
+        cache._row_memo.clear()
+        assert (await cache.get("entities"))["data"] == data
+
+    @pytest.mark.asyncio
+    async def test_small_payload_stored_plain(self, cache):
+        await cache.set("areas", {"kitchen": {}})
+        row = await cache._fetchone("SELECT data FROM cache WHERE category = 'areas'")
+        assert row["data"].startswith(b"{")
+
+    @pytest.mark.asyncio
+    async def test_reads_legacy_text_rows(self, cache):
+        """Rows written as TEXT by older versions still decode."""
+        await cache._writer.execute(
+            "INSERT INTO cache (category, data, version, last_updated, metadata) VALUES (?, ?, 3, ?, ?)",
+            ("legacy", '{"a": 1}', "2026-01-01T00:00:00", '{"m": true}'),
+        )
+        await cache._writer.commit()
+        entry = await cache.get("legacy")
+        assert entry["data"] == {"a": 1}
+        assert entry["metadata"] == {"m": True}
+        assert await cache.set("legacy", {"a": 2}) == 4
+
+
+class TestReadPool:
+    @pytest.mark.asyncio
+    async def test_readers_are_read_only(self, cache):
+        async with cache._acquire_read() as conn:
+            with pytest.raises(Exception, match="readonly|read-only|query_only|attempt to write"):
+                await conn.execute("DELETE FROM cache")
+
+    @pytest.mark.asyncio
+    async def test_reads_see_committed_writes(self, cache):
+        # Warm every reader so each holds a prepared statement before the write
+        for _ in range(cache.read_pool_size):
+            assert await cache.get("areas") is None
+        await cache.set("areas", {"kitchen": {}})
+        for _ in range(cache.read_pool_size):
+            assert (await cache.get("areas"))["data"] == {"kitchen": {}}
+        assert await cache.list_categories() == ["areas"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_use_the_pool(self, tmp_path):
+        cm = CacheManager(str(tmp_path / "pool.db"), read_pool_size=3)
+        await cm.initialize()
+        try:
+            await cm.set("entities", {"n": 1})
+            results = await asyncio.gather(*(cm.get("entities") for _ in range(20)))
+            assert all(r["data"] == {"n": 1} for r in results)
+            assert cm._readers.qsize() == 3
+        finally:
+            await cm.close()
+
+    @pytest.mark.asyncio
+    async def test_close_releases_pool(self, tmp_path):
+        cm = CacheManager(str(tmp_path / "closed.db"), read_pool_size=2)
+        await cm.initialize()
+        await cm.close()
+        with pytest.raises(RuntimeError, match="not initialized"):
+            await cm.get("entities")
+
+
+class TestEventBuffer:
+    @pytest.mark.asyncio
+    async def test_log_event_is_buffered_until_flush(self, cache):
+        await cache.log_event("cache_update", category="entities", data={"n": 1})
+        rows = await cache._fetchall("SELECT * FROM events")
+        assert rows == []
+        assert await cache.flush_events() == 1
+        rows = await cache._fetchall("SELECT event_type, category FROM events")
+        assert [tuple(r) for r in rows] == [("cache_update", "entities")]
+
+    @pytest.mark.asyncio
+    async def test_get_events_sees_buffered_events(self, cache):
+        for i in range(3):
+            await cache.log_event("tick", data={"i": i})
+        events = await cache.get_events(event_type="tick")
+        assert sorted(e["data"]["i"] for e in events) == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_background_flush(self, tmp_path):
+        cm = CacheManager(str(tmp_path / "flush.db"), flush_interval_ms=10)
+        await cm.initialize()
+        try:
+            await cm.log_event("tick")
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                if not cm._event_buf:
+                    break
+            rows = await cm._fetchall("SELECT event_type FROM events")
+            assert [r["event_type"] for r in rows] == ["tick"]
+        finally:
+            await cm.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_events(self, tmp_path):
+        db_path = str(tmp_path / "close.db")
+        cm = CacheManager(db_path, flush_interval_ms=60_000)
+        await cm.initialize()
+        await cm.log_event("shutdown")
+        await cm.close()
+
+        cm = CacheManager(db_path)
+        await cm.initialize()
+        try:
+            events = await cm.get_events(event_type="shutdown")
+            assert len(events) == 1
+        finally:
+            await cm.close()
+
+    @pytest.mark.asyncio
+    async def test_close_during_flush_keeps_events(self, tmp_path):
+        db_path = str(tmp_path / "cancel.db")
+        cm = CacheManager(db_path, flush_interval_ms=60_000)
+        await cm.initialize()
+        await cm.log_event("shutdown")
+
+        # Hold the background flush inside its write so close() cancels it there
+        writing = asyncio.Event()
+        executemany = cm._writer.executemany
+
+        async def stalled_executemany(sql, rows):
+            await executemany(sql, rows)
+            writing.set()
+            await asyncio.sleep(10)
+
+        cm._writer.executemany = stalled_executemany
+        cm._flush_wakeup.set()
+        await asyncio.wait_for(writing.wait(), timeout=5)
+        cm._writer.executemany = executemany
+        await cm.close()
+
+        cm = CacheManager(db_path)
+        await cm.initialize()
+        try:
+            events = await cm.get_events(event_type="shutdown")
+            assert len(events) == 1
+        finally:
+            await cm.close()
+
+
+class TestDiscoveryRegistries:
+    ENTITIES = {
+        "light.kitchen": {"entity_id": "light.kitchen", "domain": "light", "area_id": "kitchen", "device_id": "d1"},
+        "light.hall": {"entity_id": "light.hall", "domain": "light", "area_id": "hall", "device_id": None},
+        "sensor.kitchen_temp": {"entity_id": "sensor.kitchen_temp", "domain": "sensor", "area_id": "kitchen"},
+    }
+
+    @pytest.mark.asyncio
+    async def test_upsert_and_query_entities(self, cache):
+        assert await cache.upsert_entities(self.ENTITIES) == 3
+        assert await cache.get_entity("light.hall") == self.ENTITIES["light.hall"]
+        assert await cache.get_entity("light.missing") is None
+        kitchen_lights = await cache.get_entities(area_id="kitchen", domain="light")
+        assert list(kitchen_lights) == ["light.kitchen"]
+        assert set(await cache.get_entities(area_id="kitchen")) == {"light.kitchen", "sensor.kitchen_temp"}
+
+    @pytest.mark.asyncio
+    async def test_rediscovery_rewrites_only_changes(self, cache):
+        await cache.upsert_entities(self.ENTITIES)
+        assert await cache.upsert_entities(self.ENTITIES) == 0
+
+        moved = {**self.ENTITIES, "light.hall": {**self.ENTITIES["light.hall"], "area_id": "kitchen"}}
+        assert await cache.upsert_entities(moved) == 1
+        assert set(await cache.get_entities(area_id="kitchen", domain="light")) == {"light.kitchen", "light.hall"}
+
+    @pytest.mark.asyncio
+    async def test_prune_removes_vanished_rows(self, cache):
+        await cache.upsert_entities(self.ENTITIES)
+        remaining = {k: v for k, v in self.ENTITIES.items() if k != "light.hall"}
+        assert await cache.upsert_entities(remaining) == 1
+        assert await cache.get_entity("light.hall") is None
+
+        assert await cache.upsert_entities({"light.new": {"domain": "light"}}, prune=False) == 1
+        assert len(await cache.get_entities()) == 3
+
+    @pytest.mark.asyncio
+    async def test_devices_and_areas(self, cache):
+        assert await cache.upsert_devices({"d1": {"device_id": "d1", "area_id": "kitchen"}}) == 1
+        assert await cache.upsert_areas([{"area_id": "kitchen", "name": "Kitchen"}]) == 1
+        row = await cache._fetchone("SELECT area_id FROM devices WHERE device_id = 'd1'")
+        assert row["area_id"] == "kitchen"
+
+
+class TestRowMemo:
+    @pytest.mark.asyncio
+    async def test_get_served_from_memo_after_set(self, cache, monkeypatch):
+        await cache.set("entities", {"light.a": {"state": "on"}})
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("memoized get should not query SQLite")
+
+        monkeypatch.setattr(cache, "_fetchone", fail)
+        entry = await cache.get("entities")
+        assert entry["version"] == 1
+        assert entry["data"] == {"light.a": {"state": "on"}}
+
+    @pytest.mark.asyncio
+    async def test_callers_get_independent_copies(self, cache):
+        await cache.set("capabilities", {"lighting": {"entities": ["light.a"]}})
+        first = await cache.get("capabilities")
+        first["data"]["lighting"]["entities"].append("light.b")
+        second = await cache.get("capabilities")
+        assert second["data"] == {"lighting": {"entities": ["light.a"]}}
+
+    @pytest.mark.asyncio
+    async def test_set_and_delete_invalidate(self, cache):
+        await cache.set("areas", {"v": 1})
+        assert (await cache.get("areas"))["data"] == {"v": 1}
+        await cache.set("areas", {"v": 2}, metadata={"source": "test"})
+        entry = await cache.get("areas")
+        assert entry["data"] == {"v": 2}
+        assert entry["version"] == 2
+        assert entry["metadata"] == {"source": "test"}
+        assert await cache.delete("areas") is True
+        assert await cache.get("areas") is None
+
+    @pytest.mark.asyncio
+    async def test_memo_is_bounded(self, cache, monkeypatch):
+        monkeypatch.setattr("aria.hub.cache.ROW_MEMO_SIZE", 3)
+        for i in range(5):
+            await cache.set(f"cat_{i}", {"i": i})
+        assert list(cache._row_memo) == ["cat_2", "cat_3", "cat_4"]
+        assert (await cache.get("cat_0"))["data"] == {"i": 0}
+        assert list(cache._row_memo) == ["cat_3", "cat_4", "cat_0"]
+
+    @pytest.mark.asyncio
+    async def test_get_metadata(self, cache):
+        await cache.set("entities", {"light.a": {}}, metadata={"content_hash": "abc"})
+        assert await cache.get_metadata("entities") == {"content_hash": "abc"}
+        cache._row_memo.clear()
+        assert await cache.get_metadata("entities") == {"content_hash": "abc"}
+        assert await cache.get_metadata("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_get_version(self, cache):
+        await cache.set("entities", {"light.a": {}})
+        await cache.set("entities", {"light.a": {}, "light.b": {}})
+        assert await cache.get_version("entities") == 2
+        cache._row_memo.clear()
+        assert await cache.get_version("entities") == 2
+        assert await cache.get_version("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_get_revision(self, cache):
+        await cache.set("entities", {"light.a": {}})
+        entry = await cache.get("entities")
+        expected = {"category": "entities", "version": 1, "last_updated": entry["last_updated"]}
+        assert await cache.get_revision("entities") == expected
+        cache._row_memo.clear()
+        assert await cache.get_revision("entities") == expected
+        assert await cache.get_revision("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_list_entries(self, cache):
+        await cache.set("entities", {"light.a": {}})
+        await cache.set("areas", {"kitchen": {}})
+        await cache.set("areas", {"kitchen": {}, "garage": {}})
+        entries = await cache.list_entries()
+        assert [(e["category"], e["version"]) for e in entries] == [("areas", 2), ("entities", 1)]
+        assert all(datetime.fromisoformat(e["last_updated"]) for e in entries)
+
+
+class TestTransaction:
+    @pytest.mark.asyncio
+    async def test_writes_commit_together(self, cache):
+        async with cache.transaction():
+            await cache.set("entities", {"a": 1})
+            await cache.upsert_entities({"light.a": {"domain": "light"}})
+            await cache.set("areas", {"kitchen": {}})
+            assert cache._writer.in_transaction
+        assert not cache._writer.in_transaction
+        assert await cache.list_categories() == ["areas", "entities"]
+        assert await cache.get_entity("light.a") == {"domain": "light"}
+
+    @pytest.mark.asyncio
+    async def test_error_rolls_back_held_rows(self, cache):
+        await cache.set("entities", {"a": 1})
+        with pytest.raises(ValueError):
+            async with cache.transaction():
+                await cache.set("entities", {"a": 2})
+                await cache.set("devices", {"d": 1})
+                raise ValueError("boom")
+        entry = await cache.get("entities")
+        assert entry["data"] == {"a": 1}
+        assert entry["version"] == 1
+        assert await cache.get("devices") is None
+
+    @pytest.mark.asyncio
+    async def test_events_flush_after_transaction(self, cache):
+        async with cache.transaction():
+            await cache.log_event("inside")
+            assert await cache.flush_events() == 0
+        assert await cache.flush_events() == 1
+
+    @pytest.mark.asyncio
+    async def test_nested_transaction_joins_outer(self, cache):
+        async with cache.transaction():
+            async with cache.transaction():
+                await cache.set("entities", {"a": 1})
+            assert cache._writer.in_transaction
+        assert (await cache.get("entities"))["version"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reads_inside_block_see_its_own_writes(self, cache):
+        async with cache.transaction():
+            await cache.upsert_entities({"light.a": {"domain": "light"}})
+            await cache.set("entities", {"a": 1})
+            assert await cache.get_entity("light.a") == {"domain": "light"}
+            assert await cache.list_categories() == ["entities"]
+            assert await cache.get_version("entities") == 1
+
+    @pytest.mark.asyncio
+    async def test_other_tasks_do_not_see_uncommitted_writes(self, cache):
+        async with cache.transaction():
+            await cache.set("entities", {"a": 1})
+            assert await asyncio.create_task(cache.get("entities")) is None
+            assert await asyncio.create_task(cache.list_categories()) == []
+        assert (await cache.get("entities"))["data"] == {"a": 1}
+
+    @pytest.mark.asyncio
+    async def test_other_writers_wait_instead_of_joining(self, cache):
+        started = asyncio.Event()
+
+        async def write_elsewhere():
+            started.set()
+            return await cache.set("ml_predictions", {"p": 1})
+
+        with pytest.raises(ValueError):
+            async with cache.transaction():
+                await cache.set("entities", {"a": 1})
+                other = asyncio.create_task(write_elsewhere())
+                await started.wait()
+                await asyncio.sleep(0.01)
+                assert not other.done()
+                raise ValueError("boom")
+
+        assert await other == 1
+        assert (await cache.get("ml_predictions"))["data"] == {"p": 1}
+        assert await cache.get("entities") is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_transactions_are_isolated(self, cache):
+        async def failing_block():
+            async with cache.transaction():
+                await cache.set("devices", {"d": 1})
+                raise ValueError("boom")
+
+        async with cache.transaction():
+            await cache.set("entities", {"a": 1})
+            other = asyncio.create_task(failing_block())
+            await asyncio.sleep(0.01)
+        with pytest.raises(ValueError):
+            await other
+
+        assert (await cache.get("entities"))["data"] == {"a": 1}
+        assert await cache.get("devices") is None
+
+
+class TestIterEvents:
+    @pytest.mark.asyncio
+    async def test_yields_newest_first_and_respects_filters(self, cache):
+        for i in range(5):
+            await cache.log_event("tick", category="a" if i % 2 else "b", data={"i": i})
+            await asyncio.sleep(0.001)  # distinct timestamps
+        seen = [e["data"]["i"] async for e in cache.iter_events(event_type="tick", category="a")]
+        assert seen == [3, 1]
+
+    @pytest.mark.asyncio
+    async def test_early_exit_returns_reader_to_pool(self, cache):
+        for i in range(100):
+            await cache.log_event("tick", data={"i": i})
+        events = cache.iter_events(limit=100)
+        async for _event in events:
+            break
+        await events.aclose()
+        assert cache._readers.qsize() == cache.read_pool_size
+
+    @pytest.mark.asyncio
+    async def test_get_events_matches_iter_events(self, cache):
+        for i in range(40):
+            await cache.log_event("tick", data={"i": i})
+        listed = await cache.get_events(limit=35)
+        streamed = [e async for e in cache.iter_events(limit=35)]
+        assert len(listed) == 35
+        assert listed == streamed
+
+
+class TestEventTimestamps:
+    @pytest.mark.asyncio
+    async def test_stored_as_unix_ms_and_read_as_iso(self, cache):
+        await cache.log_event("tick")
+        await cache.flush_events()
+        row = await cache._fetchone("SELECT typeof(timestamp) AS t, timestamp FROM events")
+        assert row["t"] == "integer"
+        event = (await cache.get_events())[0]
+        assert datetime.fromisoformat(event["timestamp"]).timestamp() * 1000 == pytest.approx(row["timestamp"], abs=1)
+
+    @pytest.mark.asyncio
+    async def test_prune_events_by_age(self, cache):
+        old_ms = int((datetime.now() - timedelta(days=10)).timestamp() * 1000)
+        await cache._writer.execute("INSERT INTO events (timestamp, event_type) VALUES (?, 'old')", (old_ms,))
+        await cache._writer.commit()
+        await cache.log_event("new")
+        assert await cache.prune_events(retention_days=7) == 1
+        assert [e["event_type"] for e in await cache.get_events()] == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_text_timestamps(self, tmp_path):
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+            "event_type TEXT NOT NULL, category TEXT, data TEXT, metadata TEXT)"
+        )
+        conn.execute("CREATE INDEX idx_events_timestamp ON events(timestamp DESC)")
+        conn.execute(
+            "INSERT INTO events (timestamp, event_type, data) VALUES (?, 'cache_update', ?)",
+            ("2026-02-01T08:30:00.123456", '{"category": "entities"}'),
+        )
+        conn.execute("INSERT INTO events (timestamp, event_type) VALUES ('garbage', 'bad')")
+        conn.commit()
+        conn.close()
+
+        cm = CacheManager(str(db_path))
+        await cm.initialize()
+        try:
+            events = await cm.get_events()
+            assert len(events) == 1
+            assert events[0]["timestamp"] == "2026-02-01T08:30:00.123000"
+            assert events[0]["data"] == {"category": "entities"}
+            row = await cm._fetchone("SELECT name FROM sqlite_master WHERE name = 'idx_events_timestamp'")
+            assert row is not None
+            await cm.log_event("after")
+            assert len(await cm.get_events()) == 2
+        finally:
+            await cm.close()
+
+        cm = CacheManager(str(db_path))
+        await cm.initialize()  # already migrated: no-op
+        try:
+            assert len(await cm.get_events()) == 2
+        finally:
+            await cm.close()
+
+
+class TestSchemaVersion:
+    @pytest.mark.asyncio
+    async def test_fresh_database_is_stamped(self, cache):
+        from aria.hub.cache import SCHEMA_VERSION
+
+        assert await _pragma(cache, "user_version") == SCHEMA_VERSION
+
+    @pytest.mark.asyncio
+    async def test_warm_start_skips_ddl(self, tmp_path):
+        db_path = str(tmp_path / "warm.db")
+        cm = CacheManager(db_path)
+        await cm.initialize()
+        await cm.close()
+
+        # A dropped table is not recreated once the version stamp is current
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE areas")
+        conn.commit()
+        conn.close()
+
+        cm = CacheManager(db_path)
+        await cm.initialize()
+        row = await cm._fetchone("SELECT count(*) AS n FROM sqlite_master WHERE name = 'areas'")
+        await cm.close()
+        assert row["n"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unversioned_database_is_upgraded(self, tmp_path):
+        db_path = tmp_path / "unversioned.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE cache (category TEXT PRIMARY KEY, data BLOB NOT NULL, "
+            "version INTEGER NOT NULL DEFAULT 1, last_updated TEXT NOT NULL, metadata BLOB)"
+        )
+        conn.execute("INSERT INTO cache VALUES ('kept', '{\"a\": 1}', 3, '2026-01-01T00:00:00', NULL)")
+        conn.commit()
+        conn.close()
+
+        cm = CacheManager(str(db_path))
+        await cm.initialize()
+        entry = await cm.get("kept")
+        tables = {row["name"] for row in await cm._fetchall("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        await cm.close()
+        assert entry["data"] == {"a": 1} and entry["version"] == 3
+        assert {"events", "predictions", "entities", "devices", "areas"} <= tables
+
+
+class TestEventQueryPlans:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "event_type,category,index",
+        [("tick", None, "idx_events_type_ts"), (None, "entities", "idx_events_cat_ts")],
+    )
+    async def test_filtered_tail_uses_composite_index(self, cache, event_type, category, index):
+        from aria.hub.cache import _SELECT_EVENTS_SQL
+
+        query = _SELECT_EVENTS_SQL[bool(event_type), bool(category)]
+        params = [v for v in (event_type, category) if v] + [10]
+        rows = await cache._fetchall(f"EXPLAIN QUERY PLAN {query}", params)
+        plan = " ".join(row["detail"] for row in rows)
+        assert index in plan
+        assert "TEMP B-TREE" not in plan
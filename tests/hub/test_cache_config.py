@@ -86,26 +86,26 @@ class TestConstants:
 class TestTableCreation:
     @pytest.mark.asyncio
     async def test_config_table_exists(self, cache):
-        cursor = await cache._conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='config'")
+        cursor = await cache._writer.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='config'")
         assert await cursor.fetchone() is not None
 
     @pytest.mark.asyncio
     async def test_entity_curation_table_exists(self, cache):
-        cursor = await cache._conn.execute(
+        cursor = await cache._writer.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='entity_curation'"
         )
         assert await cursor.fetchone() is not None
 
     @pytest.mark.asyncio
     async def test_config_history_table_exists(self, cache):
-        cursor = await cache._conn.execute(
+        cursor = await cache._writer.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='config_history'"
         )
         assert await cursor.fetchone() is not None
 
     @pytest.mark.asyncio
     async def test_curation_indexes_exist(self, cache):
-        cursor = await cache._conn.execute(
+        cursor = await cache._writer.execute(
             "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_entity_curation_%'"
         )
         rows = await cursor.fetchall()
@@ -115,7 +115,7 @@ class TestTableCreation:
 
     @pytest.mark.asyncio
     async def test_history_index_exists(self, cache):
-        cursor = await cache._conn.execute(
+        cursor = await cache._writer.execute(
             "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_config_history_key'"
         )
         assert await cursor.fetchone() is not None
@@ -123,7 +123,7 @@ class TestTableCreation:
     @pytest.mark.asyncio
     async def test_reinitialize_is_safe(self, cache):
         await cache.initialize()
-        cursor = await cache._conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='config'")
+        cursor = await cache._writer.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='config'")
         assert await cursor.fetchone() is not None
 
 
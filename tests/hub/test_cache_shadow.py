@@ -60,13 +60,13 @@ class TestTableCreation:
 
     @pytest.mark.asyncio
     async def test_predictions_table_exists(self, cache):
-        cursor = await cache._conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='predictions'")
+        cursor = await cache._writer.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='predictions'")
         row = await cursor.fetchone()
         assert row is not None
 
     @pytest.mark.asyncio
     async def test_pipeline_state_table_exists(self, cache):
-        cursor = await cache._conn.execute(
+        cursor = await cache._writer.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='pipeline_state'"
         )
         row = await cursor.fetchone()
@@ -74,7 +74,7 @@ class TestTableCreation:
 
     @pytest.mark.asyncio
     async def test_predictions_indexes_exist(self, cache):
-        cursor = await cache._conn.execute(
+        cursor = await cache._writer.execute(
             "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_predictions_%'"
         )
         rows = await cursor.fetchall()
@@ -86,7 +86,7 @@ class TestTableCreation:
     async def test_reinitialize_is_safe(self, cache):
         """Calling initialize() again should not fail (IF NOT EXISTS)."""
         await cache.initialize()
-        cursor = await cache._conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='predictions'")
+        cursor = await cache._writer.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='predictions'")
         assert await cursor.fetchone() is not None
 
 
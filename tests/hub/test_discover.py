@@ -1,15 +1,13 @@
 """Tests for HA discovery module."""
 
+import io
 import json
-import sys
-import os
-from unittest.mock import patch, MagicMock
-from io import BytesIO
 
-# Add bin/ to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "bin"))
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
-import discover
+from aria.modules import discovery_core as discover
 
 
 # =============================================================================
@@ -41,12 +39,6 @@ MOCK_STATES = [
 
 MOCK_CONFIG = {"version": "2026.2.1", "location_name": "Home", "time_zone": "America/New_York"}
 
-MOCK_SERVICES = [
-    {"domain": "light", "services": {}},
-    {"domain": "sensor", "services": {}},
-    {"domain": "climate", "services": {}},
-]
-
 MOCK_ENTITY_REGISTRY = [
     {"entity_id": "light.living_room", "platform": "hue", "disabled_by": None, "hidden_by": None},
     {"entity_id": "sensor.power_meter", "platform": "utility_meter", "disabled_by": None, "hidden_by": None},
@@ -57,137 +49,216 @@ MOCK_DEVICE_REGISTRY = [{"id": "device_1", "name": "Philips Hue Bridge", "manufa
 MOCK_AREA_REGISTRY = [{"area_id": "living_room", "name": "Living Room"}]
 
 
+TEST_TOKEN = "test-token"
+
+
+class FakeHA:
+    """In-process Home Assistant stand-in serving REST endpoints and the WebSocket API."""
+
+    def __init__(self):
+        self.rest = {"/api/states": MOCK_STATES, "/api/config": MOCK_CONFIG}
+        # endpoint -> list of (status, headers) returned before the real payload
+        self.rest_failures = {}
+        self.rest_calls = {}
+        self.registries = {
+            "config/entity_registry/list": MOCK_ENTITY_REGISTRY,
+            "config/device_registry/list": MOCK_DEVICE_REGISTRY,
+            "config/area_registry/list": MOCK_AREA_REGISTRY,
+        }
+        self.ws_connections = 0
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get("/api/websocket", self._websocket)
+        app.router.add_get("/api/{tail:.*}", self._rest)
+        return app
+
+    async def _rest(self, request):
+        path = request.path
+        self.rest_calls[path] = self.rest_calls.get(path, 0) + 1
+        if request.headers.get("Authorization") != f"Bearer {TEST_TOKEN}":
+            return web.json_response({"message": "Invalid token"}, status=401)
+        failures = self.rest_failures.get(path)
+        if failures:
+            status, headers = failures.pop(0)
+            return web.json_response({}, status=status, headers=headers)
+        if path not in self.rest:
+            return web.json_response({"message": "Not found"}, status=404)
+        return web.json_response(self.rest[path])
+
+    async def _websocket(self, request):
+        self.ws_connections += 1
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json({"type": "auth_required", "ha_version": "2026.2.1"})
+        auth = await ws.receive_json()
+        if auth.get("access_token") != TEST_TOKEN:
+            await ws.send_json({"type": "auth_invalid", "message": "Invalid access token"})
+            await ws.close()
+            return ws
+        await ws.send_json({"type": "auth_ok", "ha_version": "2026.2.1"})
+
+        async for msg in ws:
+            command = json.loads(msg.data)
+            # Unrelated event frames must be skipped by the client
+            await ws.send_json({"id": 999, "type": "event", "event": {"event_type": "state_changed"}})
+            if command["type"] in self.registries:
+                await ws.send_json(
+                    {"id": command["id"], "type": "result", "success": True, "result": self.registries[command["type"]]}
+                )
+            else:
+                await ws.send_json(
+                    {"id": command["id"], "type": "result", "success": False, "error": {"code": "unknown_command"}}
+                )
+        return ws
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(discover, "RETRY_BASE_DELAY", 0)
+
+
+@pytest.fixture
+async def fake_ha():
+    ha = FakeHA()
+    server = TestServer(ha.app())
+    await server.start_server()
+    ha.url = str(server.make_url("")).rstrip("/")
+    try:
+        yield ha
+    finally:
+        await server.close()
+
+
 # =============================================================================
 # REST API TESTS
 # =============================================================================
 
 
-def test_fetch_rest_api_success():
+async def test_fetch_rest_api_success(fake_ha):
     """Test successful REST API fetch."""
-    mock_response = MagicMock()
-    mock_response.read.return_value = json.dumps(MOCK_STATES).encode("utf-8")
-    mock_response.__enter__ = MagicMock(return_value=mock_response)
-    mock_response.__exit__ = MagicMock(return_value=False)
-
-    with patch("urllib.request.urlopen", return_value=mock_response):
-        result = discover.fetch_rest_api("/api/states")
+    async with discover.create_session(TEST_TOKEN) as session:
+        result = await discover.fetch_rest_api(session, fake_ha.url, "/api/states")
 
     assert result == MOCK_STATES
     assert len(result) == 4
 
 
-def test_fetch_rest_api_retry_on_connection_error():
-    """Test retry logic on connection errors."""
-    mock_response = MagicMock()
-    mock_response.read.return_value = json.dumps(MOCK_CONFIG).encode("utf-8")
-    mock_response.__enter__ = MagicMock(return_value=mock_response)
-    mock_response.__exit__ = MagicMock(return_value=False)
+async def test_fetch_rest_api_retry_on_server_error(fake_ha, no_backoff):
+    """Test retry logic on 5xx responses."""
+    fake_ha.rest_failures["/api/config"] = [(503, None), (502, None)]
 
     # Fail twice, then succeed
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_urlopen.side_effect = [Exception("Connection refused"), Exception("Timeout"), mock_response]
-
-        with patch("time.sleep"):  # Don't actually sleep during tests
-            result = discover.fetch_rest_api("/api/config", retries=3)
+    async with discover.create_session(TEST_TOKEN) as session:
+        result = await discover.fetch_rest_api(session, fake_ha.url, "/api/config", retries=3)
 
     assert result == MOCK_CONFIG
-    assert mock_urlopen.call_count == 3
+    assert fake_ha.rest_calls["/api/config"] == 3
 
 
-def test_fetch_rest_api_auth_error_no_retry():
+async def test_fetch_rest_api_auth_error_no_retry(fake_ha, no_backoff):
     """Test that auth errors don't retry."""
-    from urllib.error import HTTPError
+    async with discover.create_session("wrong-token") as session:
+        with pytest.raises(discover.HARequestError, match="Authentication failed"):
+            await discover.fetch_rest_api(session, fake_ha.url, "/api/states")
 
-    error = HTTPError("/api/states", 401, "Unauthorized", {}, BytesIO(b"Invalid token"))
+    assert fake_ha.rest_calls["/api/states"] == 1
 
-    with patch("urllib.request.urlopen", side_effect=error):
-        try:
-            discover.fetch_rest_api("/api/states")
-            assert False, "Should have raised exception"
-        except Exception as e:
-            assert "Authentication failed" in str(e)
 
+async def test_fetch_rest_api_client_error_no_retry(fake_ha, no_backoff):
+    """Test that non-retryable 4xx responses fail on the first attempt."""
+    async with discover.create_session(TEST_TOKEN) as session:
+        with pytest.raises(discover.HARequestError, match="HTTP error 404"):
+            await discover.fetch_rest_api(session, fake_ha.url, "/api/missing")
 
-def test_fetch_rest_api_exhausted_retries():
-    """Test failure after exhausting all retries."""
-    with patch("urllib.request.urlopen", side_effect=Exception("Network error")):
-        with patch("time.sleep"):
-            try:
-                discover.fetch_rest_api("/api/states", retries=2)
-                assert False, "Should have raised exception"
-            except Exception as e:
-                assert "after 2 attempts" in str(e)
+    assert fake_ha.rest_calls["/api/missing"] == 1
 
 
-# =============================================================================
-# WEBSOCKET TESTS
-# =============================================================================
+async def test_fetch_rest_api_retries_429(fake_ha, no_backoff):
+    """Test that 429 is retried."""
+    fake_ha.rest_failures["/api/config"] = [(429, {"Retry-After": "0"})]
+
+    async with discover.create_session(TEST_TOKEN) as session:
+        assert await discover.fetch_rest_api(session, fake_ha.url, "/api/config") == MOCK_CONFIG
+
+    assert fake_ha.rest_calls["/api/config"] == 2
 
 
-def test_websocket_handshake_creation():
-    """Test WebSocket handshake HTTP request creation."""
-    handshake, key = discover.create_websocket_handshake("localhost:8123", "/api/websocket")
+def test_backoff_delay_is_jittered_and_bounded():
+    """Test full-jitter backoff stays within base * 2**attempt and honors Retry-After."""
+    for attempt in range(4):
+        for _ in range(50):
+            delay = discover.backoff_delay(attempt, base=0.5)
+            assert 0.0 <= delay <= 0.5 * 2**attempt
+    assert discover.backoff_delay(0, retry_after="7") == 7.0
 
-    assert b"GET /api/websocket HTTP/1.1" in handshake
-    assert b"Host: localhost:8123" in handshake
-    assert b"Upgrade: websocket" in handshake
-    assert b"Sec-WebSocket-Key:" in handshake
-    assert b"Sec-WebSocket-Version: 13" in handshake
 
+async def test_fetch_rest_api_exhausted_retries(fake_ha, no_backoff):
+    """Test failure after exhausting all retries."""
+    fake_ha.rest_failures["/api/states"] = [(503, None)] * 5
 
-def test_websocket_handshake_response_success():
-    """Test that handshake returns bytes with 101 status."""
-    handshake, key = discover.create_websocket_handshake("localhost:8123", "/api/websocket")
-    # Verify handshake is valid HTTP upgrade request
-    assert handshake.startswith(b"GET /api/websocket HTTP/1.1")
-    assert isinstance(key, str)
+    async with discover.create_session(TEST_TOKEN) as session:
+        with pytest.raises(Exception, match="after 2 attempts"):
+            await discover.fetch_rest_api(session, fake_ha.url, "/api/states", retries=2)
 
 
-def test_websocket_handshake_response_failure():
-    """Test that handshake with bad host still produces valid request bytes."""
-    handshake, key = discover.create_websocket_handshake("badhost", "/api/websocket")
-    assert b"Host: badhost" in handshake
-    assert isinstance(key, str)
+async def test_fetch_rest_api_connection_error(no_backoff):
+    """Test that an unreachable host is retried, then reported."""
+    async with discover.create_session(TEST_TOKEN) as session:
+        with pytest.raises(Exception, match="after 2 attempts"):
+            await discover.fetch_rest_api(session, "http://127.0.0.1:1", "/api/states", retries=2)
 
 
-def test_websocket_frame_creation():
-    """Test WebSocket frame creation with masking via send_websocket_frame."""
-    mock_sock = MagicMock()
-    payload = '{"type": "auth", "token": "test"}'
-    discover.send_websocket_frame(mock_sock, payload)
+# =============================================================================
+# WEBSOCKET TESTS
+# =============================================================================
 
-    # Verify sendall was called with frame data
-    assert mock_sock.sendall.called
-    frame = mock_sock.sendall.call_args[0][0]
-    assert frame[0] == 0x81  # FIN + text opcode
-    assert frame[1] & 0x80  # Mask bit set
-    assert len(frame) > len(payload)  # Frame header + mask + payload
 
+async def test_ha_websocket_reuses_connection_and_skips_events(fake_ha):
+    """Test that one session authenticates once and ignores unrelated frames."""
+    async with discover.create_session(TEST_TOKEN) as session:
+        async with discover.HAWebSocket(session, fake_ha.url, TEST_TOKEN) as ws:
+            assert await ws.command("config/entity_registry/list") == MOCK_ENTITY_REGISTRY
+            assert await ws.command("config/device_registry/list") == MOCK_DEVICE_REGISTRY
+            with pytest.raises(discover.WebSocketCommandError):
+                await ws.command("config/label_registry/list")
 
-def test_fetch_websocket_data_mocked():
-    """Test WebSocket fetch with mocked socket."""
-    # Mock socket
-    mock_sock = MagicMock()
+    assert fake_ha.ws_connections == 1
 
-    # Make recv return handshake response on first call, then empty
-    handshake_response = b"HTTP/1.1 101 Switching Protocols\r\n\r\n"
-    mock_sock.recv.side_effect = [handshake_response]
 
-    # Fixed request_id so mock result ID matches
-    fixed_request_id = 42
+async def test_ha_websocket_auth_invalid_not_retried(fake_ha, no_backoff):
+    """Test that a rejected token fails immediately instead of reconnecting."""
+    async with discover.create_session(TEST_TOKEN) as session:
+        async with discover.HAWebSocket(session, fake_ha.url, "wrong-token") as ws:
+            with pytest.raises(discover.WebSocketCommandError, match="Authentication failed"):
+                await ws.command("config/entity_registry/list")
 
-    auth_required_msg = json.dumps({"type": "auth_required", "ha_version": "2026.2.1"})
-    auth_ok_msg = json.dumps({"type": "auth_ok", "ha_version": "2026.2.1"})
-    result_msg = json.dumps({"id": fixed_request_id, "type": "result", "success": True, "result": MOCK_ENTITY_REGISTRY})
+    assert fake_ha.ws_connections == 1
 
-    parse_responses = [auth_required_msg, auth_ok_msg, result_msg]
 
-    with patch("socket.socket", return_value=mock_sock):
-        with patch.object(discover, "parse_websocket_frame", side_effect=parse_responses):
-            with patch("random.randint", return_value=fixed_request_id):
-                result = discover.fetch_websocket_data("config/entity_registry/list")
+async def test_ha_websocket_commands_batch_in_order(fake_ha):
+    """Test that a pipelined batch returns results in request order, with rejections in place."""
+    async with discover.create_session(TEST_TOKEN) as session:
+        async with discover.HAWebSocket(session, fake_ha.url, TEST_TOKEN) as ws:
+            areas, missing, entities = await ws.commands(
+                ["config/area_registry/list", "config/label_registry/list", "config/entity_registry/list"]
+            )
 
-    assert result == MOCK_ENTITY_REGISTRY
+    assert areas == MOCK_AREA_REGISTRY
+    assert isinstance(missing, discover.WebSocketCommandError)
+    assert entities == MOCK_ENTITY_REGISTRY
+    assert fake_ha.ws_connections == 1
+
+
+async def test_fetch_registries_label_fallback(fake_ha):
+    """Test that a missing label registry yields an empty list."""
+    async with discover.create_session(TEST_TOKEN) as session:
+        entities, devices, areas, labels = await discover.fetch_registries(session, fake_ha.url, TEST_TOKEN)
+
+    assert entities == MOCK_ENTITY_REGISTRY
+    assert devices == MOCK_DEVICE_REGISTRY
+    assert areas == MOCK_AREA_REGISTRY
+    assert labels == []
 
 
 # =============================================================================
@@ -217,6 +288,24 @@ def test_detect_lighting_capability():
     assert light_cap["entities"][0] == "light.living_room"
 
 
+def test_detect_lighting_feature_counts():
+    """Test that color/color_temp/brightness support is tallied per light only."""
+    states = [
+        {"entity_id": "light.rgb", "attributes": {"rgb_color": [255, 0, 0], "brightness": 200}},
+        {"entity_id": "light.tunable", "attributes": {"color_temp": 300, "brightness": 120}},
+        {"entity_id": "light.plain", "attributes": {}},
+        {"entity_id": "light.no_attrs"},
+        {"entity_id": "sensor.fake_rgb", "attributes": {"rgb_color": [0, 0, 0], "brightness": 1}},
+    ]
+
+    light_cap = discover.detect_capabilities(states, [], [])["lighting"]
+
+    assert light_cap["total_count"] == 4
+    assert light_cap["supports_color"] == 1
+    assert light_cap["supports_color_temp"] == 1
+    assert light_cap["supports_brightness"] == 2
+
+
 def test_detect_motion_capability():
     """Test motion sensor capability detection."""
     capabilities = discover.detect_capabilities(MOCK_STATES, MOCK_ENTITY_REGISTRY, MOCK_DEVICE_REGISTRY)
@@ -239,6 +328,22 @@ def test_detect_climate_capability():
     assert climate_cap["entities"][0] == "climate.thermostat"
 
 
+def test_detect_ev_charging_matches_whole_tokens_only():
+    """Test EV detection: battery+vehicle entities or the vehicle name as its own token."""
+    states = [
+        {"entity_id": "sensor.tars_battery_level", "attributes": {}},
+        {"entity_id": "lock.tars", "attributes": {}},
+        {"entity_id": "sensor.vehicle_battery", "attributes": {}},
+        {"entity_id": "media_player.guitars", "attributes": {}},
+        {"entity_id": "sensor.stars_visible", "attributes": {}},
+        {"entity_id": "sensor.phone_battery", "attributes": {}},
+    ]
+
+    ev_cap = discover.detect_capabilities(states, [], [])["ev_charging"]
+
+    assert ev_cap["entities"] == ["sensor.tars_battery_level", "lock.tars", "sensor.vehicle_battery"]
+
+
 def test_capability_not_available_when_no_entities():
     """Test that capabilities are absent when no matching entities exist."""
     # Only include one entity (no vacuum, no EV charging, etc)
@@ -272,57 +377,57 @@ def test_capability_entities_all_included():
 # =============================================================================
 
 
-def test_discover_all_integration():
-    """Test full discovery flow with all mocked APIs."""
-    # Mock all API calls
-    with patch.object(discover, "fetch_rest_api") as mock_rest:
-        with patch.object(discover, "fetch_websocket_data") as mock_ws:
-            # Configure mocks
-            mock_rest.side_effect = [
-                MOCK_STATES,  # /api/states
-                MOCK_CONFIG,  # /api/config
-                MOCK_SERVICES,  # /api/services
-            ]
-
-            mock_ws.side_effect = [
-                MOCK_ENTITY_REGISTRY,  # entity_registry
-                MOCK_DEVICE_REGISTRY,  # device_registry
-                MOCK_AREA_REGISTRY,  # area_registry
-                Exception("Label registry not available"),  # label_registry
-            ]
-
-            # Run discovery
-            result = discover.discover_all()
-
-            # Verify structure
-            assert "discovery_timestamp" in result
-            assert result["ha_version"] == "2026.2.1"
-            assert result["entity_count"] == 4
-            assert "capabilities" in result
-            assert "entities" in result
-            assert "devices" in result
-            assert "areas" in result
-            assert "integrations" in result
-
-            # Verify capabilities
-            assert result["capabilities"]["lighting"]["available"] is True
-            assert result["capabilities"]["power_monitoring"]["available"] is True
-            assert result["capabilities"]["motion"]["available"] is True
-
-            # Verify entities dict
-            assert "light.living_room" in result["entities"]
-            assert "sensor.power_meter" in result["entities"]
-
-            # Verify devices dict
-            assert "device_1" in result["devices"]
-
-            # Verify areas dict
-            assert "living_room" in result["areas"]
-
-            # Verify integrations list (list of dicts with domain + entity_count)
-            integration_domains = [i["domain"] for i in result["integrations"]]
-            assert "light" in integration_domains
-            assert "climate" in integration_domains
+async def test_discover_all_integration(fake_ha):
+    """Test full discovery flow against the fake HA server."""
+    result = await discover.discover_all(fake_ha.url, TEST_TOKEN)
+
+    # Verify structure
+    assert "discovery_timestamp" in result
+    assert result["ha_version"] == "2026.2.1"
+    assert result["entity_count"] == 4
+    assert "capabilities" in result
+    assert "entities" in result
+    assert "devices" in result
+    assert "areas" in result
+    assert "integrations" in result
+    assert result["labels"] == []
+
+    # Verify capabilities
+    assert result["capabilities"]["lighting"]["available"] is True
+    assert result["capabilities"]["power_monitoring"]["available"] is True
+    assert result["capabilities"]["motion"]["available"] is True
+
+    # Verify entities dict
+    assert "light.living_room" in result["entities"]
+    assert "sensor.power_meter" in result["entities"]
+
+    # Verify devices dict
+    assert "device_1" in result["devices"]
+
+    # Verify areas dict
+    assert "living_room" in result["areas"]
+
+    # Verify integrations list (list of dicts with domain + entity_count)
+    integration_domains = [i["domain"] for i in result["integrations"]]
+    assert "light" in integration_domains
+    assert "climate" in integration_domains
+
+    # One WebSocket session served all registry commands
+    assert fake_ha.ws_connections == 1
+
+
+def test_write_json_round_trips(monkeypatch):
+    """Test that output is parseable by the hub with and without orjson."""
+    result = {"entity_count": 1, "entities": {"light.a": {"state": "on", "name": "Küche"}}}
+
+    for fast in (True, False):
+        if not fast:
+            monkeypatch.setattr(discover, "orjson", None)
+        buf = io.BytesIO()
+        discover.write_json(result, buf)
+        output = buf.getvalue()
+        assert output.endswith(b"\n")
+        assert json.loads(output) == result
 
 
 if __name__ == "__main__":
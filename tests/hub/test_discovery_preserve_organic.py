@@ -12,8 +12,11 @@ def mock_hub():
     hub.set_cache = AsyncMock()
     hub.get_cache = AsyncMock(return_value=None)
     hub.schedule_task = AsyncMock()
+    hub.publish = AsyncMock()
     hub.cache = MagicMock()
+    hub.cache.set = AsyncMock(return_value=1)
     hub.cache.get_config_value = AsyncMock(return_value="")
+    hub.cache.get_metadata = AsyncMock(return_value=None)
     return hub
 
 
@@ -54,9 +57,9 @@ async def test_store_preserves_organic_capabilities(mock_hub):
 
     await module._store_discovery_results(seed_results)
 
-    # Find the set_cache call for capabilities
+    # Find the cache write for capabilities
     cap_calls = [
-        call for call in mock_hub.set_cache.call_args_list
+        call for call in mock_hub.cache.set.call_args_list
         if call[0][0] == "capabilities"
     ]
     assert len(cap_calls) == 1
@@ -95,7 +98,7 @@ async def test_store_no_existing_cache(mock_hub):
     await module._store_discovery_results(seed_results)
 
     cap_calls = [
-        call for call in mock_hub.set_cache.call_args_list
+        call for call in mock_hub.cache.set.call_args_list
         if call[0][0] == "capabilities"
     ]
     assert len(cap_calls) == 1
@@ -131,7 +134,7 @@ async def test_seed_cap_overrides_organic_with_same_name(mock_hub):
     await module._store_discovery_results(seed_results)
 
     cap_calls = [
-        call for call in mock_hub.set_cache.call_args_list
+        call for call in mock_hub.cache.set.call_args_list
         if call[0][0] == "capabilities"
     ]
     stored_caps = cap_calls[0][0][1]
@@ -10,7 +10,7 @@ import tempfile
 import json
 import sqlite3
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, patch
 from datetime import datetime, timedelta
 
 import sys
@@ -71,10 +71,8 @@ async def test_hub_initialization(initialized_hub):
 @pytest.mark.asyncio
 async def test_module_registration(initialized_hub):
     """Test modules can be registered with hub."""
-    # Mock the discover script subprocess call
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = MagicMock(returncode=0, stdout=json.dumps({"capabilities": {}, "entities": []}))
-
+    # Mock the in-process discovery call
+    with patch("aria.modules.discovery.discover_all", AsyncMock(return_value={"capabilities": {}, "entities": []})):
         # Create and register discovery module
         discovery = DiscoveryModule(initialized_hub, "http://test:8123", "test_token")
         initialized_hub.register_module(discovery)
@@ -100,9 +98,7 @@ async def test_discovery_to_cache_pipeline(initialized_hub):
         ],
     }
 
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = MagicMock(returncode=0, stdout=json.dumps(mock_output))
-
+    with patch("aria.modules.discovery.discover_all", AsyncMock(return_value=mock_output)):
         # Initialize discovery module
         discovery = DiscoveryModule(initialized_hub, "http://test:8123", "test_token")
         initialized_hub.register_module(discovery)
@@ -115,6 +111,54 @@ async def test_discovery_to_cache_pipeline(initialized_hub):
         assert "power_monitoring" in capabilities["data"]
 
 
+@pytest.mark.asyncio
+async def test_rediscovery_skips_unchanged_categories(initialized_hub):
+    """An identical discovery run does not re-version the whole-map entries."""
+    results = {
+        "capabilities": {"lighting": {"count": 1, "entities": ["light.living_room"]}},
+        "entities": {"light.living_room": {"entity_id": "light.living_room", "domain": "light"}},
+        "areas": {"kitchen": {"area_id": "kitchen", "name": "Kitchen"}},
+    }
+    discovery = DiscoveryModule(initialized_hub, "http://test:8123", "test_token")
+
+    await discovery._store_discovery_results(json.loads(json.dumps(results)))
+    await discovery._store_discovery_results(json.loads(json.dumps(results)))
+    for category in ("entities", "areas", "capabilities"):
+        assert (await initialized_hub.cache.get(category))["version"] == 1
+
+    results["areas"]["garage"] = {"area_id": "garage", "name": "Garage"}
+    await discovery._store_discovery_results(results)
+    assert (await initialized_hub.cache.get("areas"))["version"] == 2
+    assert (await initialized_hub.cache.get("entities"))["version"] == 1
+
+
+@pytest.mark.asyncio
+async def test_discovery_publishes_cache_updated_after_commit(initialized_hub):
+    """cache_updated events go out only once the discovery transaction has committed."""
+    results = {
+        "capabilities": {"lighting": {"count": 1, "entities": ["light.living_room"]}},
+        "areas": {"kitchen": {"area_id": "kitchen", "name": "Kitchen"}},
+    }
+    discovery = DiscoveryModule(initialized_hub, "http://test:8123", "test_token")
+    seen = {}
+
+    async def on_cache_updated(data):
+        # A separate connection only sees committed rows
+        with sqlite3.connect(initialized_hub.cache.db_path) as conn:
+            row = conn.execute("SELECT version FROM cache WHERE category = ?", (data["category"],)).fetchone()
+        seen[data["category"]] = (data["version"], row[0] if row else None)
+
+    initialized_hub.subscribe("cache_updated", on_cache_updated)
+    await discovery._store_discovery_results(results)
+    assert seen == {"areas": (1, 1), "capabilities": (1, 1), "discovery_metadata": (1, 1)}
+
+    seen.clear()
+    failing = AsyncMock(side_effect=RuntimeError("boom"))
+    with patch.object(initialized_hub.cache, "upsert_areas", failing), pytest.raises(RuntimeError):
+        await discovery._store_discovery_results({"areas": {"garage": {"area_id": "garage"}}})
+    assert seen == {}
+
+
 @pytest.mark.asyncio
 async def test_ml_engine_integration(initialized_hub, temp_dirs):
     """Test ML engine integrates with hub and cache."""
@@ -149,9 +193,7 @@ async def test_ml_engine_integration(initialized_hub, temp_dirs):
 @pytest.mark.asyncio
 async def test_health_check(initialized_hub, temp_dirs):
     """Test health check reports status of all modules."""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = MagicMock(returncode=0, stdout="{}")
-
+    with patch("aria.modules.discovery.discover_all", AsyncMock(return_value={})):
         # Register modules
         discovery = DiscoveryModule(initialized_hub, "http://test:8123", "test_token")
         ml_engine = MLEngine(initialized_hub, temp_dirs["models"], temp_dirs["training"])
@@ -267,10 +309,8 @@ async def test_cache_persistence_across_restarts(temp_dirs):
 @pytest.mark.asyncio
 async def test_error_recovery_discovery_failure(initialized_hub):
     """Test hub handles discovery failures gracefully."""
-    # Mock discovery script to fail
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = MagicMock(returncode=1, stderr="Connection failed")
-
+    # Mock discovery to fail
+    with patch("aria.modules.discovery.discover_all", AsyncMock(side_effect=RuntimeError("Connection failed"))):
         discovery = DiscoveryModule(initialized_hub, "http://test:8123", "test_token")
         initialized_hub.register_module(discovery)
 
@@ -328,9 +368,7 @@ async def test_cache_performance(initialized_hub):
 @pytest.mark.asyncio
 async def test_module_initialization_order(initialized_hub, temp_dirs):
     """Test modules can initialize in any order."""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = MagicMock(returncode=0, stdout="{}")
-
+    with patch("aria.modules.discovery.discover_all", AsyncMock(return_value={})):
         # Create all modules
         discovery = DiscoveryModule(initialized_hub, "http://test:8123", "test_token")
         ml_engine = MLEngine(initialized_hub, temp_dirs["models"], temp_dirs["training"])
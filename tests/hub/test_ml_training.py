@@ -128,6 +128,23 @@ class TestMLEngine:
         assert all("power" in s for s in snapshots)
         assert all("time_features" in s for s in snapshots)
 
+    @pytest.mark.asyncio
+    async def test_load_training_data_skips_bad_and_missing_days(self, ml_engine):
+        """Unreadable files are skipped; results are oldest-first."""
+        training_dir = Path(ml_engine.training_data_dir)
+        for f in training_dir.glob("*.json"):
+            f.unlink()
+        today = datetime.now()
+        for i in (0, 2, 3):
+            date_str = (today - timedelta(days=i)).strftime("%Y-%m-%d")
+            (training_dir / f"{date_str}.json").write_text(json.dumps({"day": i}))
+        bad_date = (today - timedelta(days=1)).strftime("%Y-%m-%d")
+        (training_dir / f"{bad_date}.json").write_text("{not json")
+
+        snapshots = await ml_engine._load_training_data(5)
+
+        assert [s["day"] for s in snapshots] == [3, 2, 0]
+
     @pytest.mark.asyncio
     async def test_build_training_dataset(self, ml_engine, synthetic_snapshots):
         """Test building training dataset from snapshots."""
@@ -181,6 +198,67 @@ class TestMLEngine:
         assert expected_power_mean > 0
         assert expected_lights_mean > 0
 
+    @pytest.mark.asyncio
+    async def test_rolling_means_match_trailing_window(self, ml_engine, synthetic_snapshots):
+        """rolling_7d_* features average the 7 snapshots before each row, and are 0 before that."""
+        snapshots = synthetic_snapshots[:12]
+        names = await ml_engine._get_feature_names()
+        assert "rolling_7d_power_mean" in names
+        col = names.index("rolling_7d_power_mean")
+
+        X, valid = await ml_engine._build_feature_matrix(snapshots)
+
+        assert valid.all()
+        assert X[:7, col].tolist() == [0.0] * 7
+        for i in range(7, len(snapshots)):
+            expected = sum(s["power"]["total_watts"] for s in snapshots[i - 7 : i]) / 7
+            assert X[i, col] == pytest.approx(expected, rel=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_build_training_dataset_skips_missing_targets(self, ml_engine, synthetic_snapshots):
+        """Snapshots without the target are dropped and the remaining rows stay aligned."""
+        import copy
+
+        snapshots = copy.deepcopy(synthetic_snapshots[:10])
+        for i in (2, 5):
+            del snapshots[i]["lights"]["on"]
+
+        X, y, weights = await ml_engine._build_training_dataset(snapshots, "lights_on")
+
+        kept = [s for i, s in enumerate(snapshots) if i not in (2, 5)]
+        assert X.shape[0] == len(y) == len(weights) == 8
+        assert y.tolist() == [float(s["lights"]["on"]) for s in kept]
+
+    @pytest.mark.asyncio
+    async def test_fit_jobs_isolates_failures(self, ml_engine):
+        """A failing fit comes back as its exception without sinking the other jobs."""
+        rng = np.random.default_rng(0)
+        X = rng.random((30, 5))
+        y = rng.random(30)
+        w = np.ones(30)
+
+        good, bad = await ml_engine._fit_jobs([(X, y, w), (X, y[:10], w)])
+
+        assert good["num_train"] == 24 and good["num_val"] == 6
+        assert hasattr(good["rf_model"], "estimators_")
+        assert isinstance(bad, Exception)
+
+    @pytest.mark.asyncio
+    async def test_predict_targets_uses_unscaled_features(self, ml_engine):
+        """Predictions feed the models the same raw features they were fit on."""
+        rng = np.random.default_rng(1)
+        X = rng.random((30, 5)) * 1000
+        y = X[:, 0] * 2.0
+        (fitted,) = await ml_engine._fit_jobs([(X, y, np.ones(30))])
+        ml_engine.models = {"power_watts": fitted}
+        ml_engine.enabled_models = {"gb": True, "rf": True}
+
+        row = X[:1]
+        raw = ml_engine._predict_targets(row)
+
+        assert raw["power_watts"]["gb"] == pytest.approx(float(fitted["gb_model"].predict(row)[0]))
+        assert raw["power_watts"]["rf"] == pytest.approx(float(fitted["rf_model"].predict(row)[0]))
+
     def test_extract_target(self, ml_engine, synthetic_snapshots):
         """Test target extraction from snapshot."""
         snapshot = synthetic_snapshots[0]
@@ -234,6 +312,117 @@ class TestMLEngine:
         assert features["rolling_7d_power_mean"] == 500.0
         assert features["rolling_7d_lights_mean"] == 3.0
 
+    @pytest.mark.asyncio
+    async def test_train_models_extracts_features_once(
+        self, ml_engine, mock_hub, mock_capabilities, synthetic_snapshots, monkeypatch
+    ):
+        """Every target (and the anomaly detector) shares one feature extraction pass."""
+        mock_hub.get_cache_fresh.return_value = mock_capabilities
+        calls = []
+        original = ml_engine._extract_features
+
+        async def counting_extract(snapshot, **kwargs):
+            calls.append(snapshot)
+            return await original(snapshot, **kwargs)
+
+        monkeypatch.setattr(ml_engine, "_extract_features", counting_extract)
+        training_data = await ml_engine._load_training_data(30)
+
+        await ml_engine.train_models(days_history=30)
+
+        assert len(ml_engine.models) > 2
+        assert len(calls) == len(training_data)
+
+    @pytest.mark.asyncio
+    async def test_incremental_training_warm_starts_saved_models(
+        self, ml_engine, mock_hub, mock_capabilities, synthetic_snapshots
+    ):
+        """An incremental run grows the saved models instead of refitting them."""
+        mock_hub.get_cache_fresh.return_value = mock_capabilities
+        mock_hub.cache = Mock()
+        mock_hub.cache.get_config_value = AsyncMock(side_effect=lambda key, fallback=None: fallback)
+
+        # Nothing saved yet: falls back to a full fit
+        await ml_engine.train_models(days_history=30, incremental=True)
+        first = ml_engine.models["power_watts"]
+        assert len(first["rf_model"].estimators_) == 100
+
+        await ml_engine.train_models(days_history=30, incremental=True)
+
+        warm = ml_engine.models["power_watts"]
+        assert len(warm["rf_model"].estimators_) == 120
+        assert warm["gb_model"].n_iter_ == 120
+        assert warm["lgbm_model"].booster_.num_trees() == 120
+        assert len(first["rf_model"].estimators_) == 100  # previous bundle untouched
+        metadata = next(
+            c.args[1] for c in reversed(mock_hub.set_cache.call_args_list) if c.args[0] == "ml_training_metadata"
+        )
+        assert metadata["incremental"] is True
+        assert metadata["days_history"] == 14
+
+        # Past the tree cap the next run is a full retrain again
+        mock_hub.cache.get_config_value.side_effect = lambda key, fallback=None: (
+            130 if key == "incremental.max_total_trees" else fallback
+        )
+        await ml_engine.train_models(days_history=30, incremental=True)
+        assert len(ml_engine.models["power_watts"]["rf_model"].estimators_) == 100
+
+    @pytest.mark.asyncio
+    async def test_incremental_training_warm_starts_alongside_unmodelled_targets(
+        self, ml_engine, mock_hub, mock_capabilities, synthetic_snapshots
+    ):
+        """Targets that never get a model (climate has no snapshot field) don't force a full retrain."""
+        mock_capabilities["data"]["climate"] = {"available": True, "entities": ["climate.living_room"]}
+        mock_hub.get_cache_fresh.return_value = mock_capabilities
+        mock_hub.cache = Mock()
+        mock_hub.cache.get_config_value = AsyncMock(side_effect=lambda key, fallback=None: fallback)
+
+        await ml_engine.train_models(days_history=30, incremental=True)
+        assert "temperature" not in ml_engine.models
+        assert "humidity" not in ml_engine.models
+
+        plan = await ml_engine._plan_warm_start(mock_capabilities["data"], await ml_engine._get_feature_names())
+        assert plan is not None
+        assert "power_watts" in plan[0]
+        assert "temperature" not in plan[0]
+
+        await ml_engine.train_models(days_history=30, incremental=True)
+        assert len(ml_engine.models["power_watts"]["rf_model"].estimators_) == 120
+
+    @pytest.mark.asyncio
+    async def test_train_models_reads_feature_config_once(
+        self, ml_engine, mock_hub, mock_capabilities, synthetic_snapshots
+    ):
+        """The feature schema is resolved once per run, not once per target."""
+        mock_hub.get_cache_fresh.return_value = mock_capabilities
+
+        await ml_engine.train_models(days_history=30)
+
+        config_reads = [c for c in mock_hub.get_cache.call_args_list if c.args[0] == "feature_config"]
+        assert len(ml_engine.models) > 2
+        assert len(config_reads) == 1
+
+    @pytest.mark.asyncio
+    async def test_trained_since_requires_recent_run_and_same_capabilities(
+        self, ml_engine, mock_hub, mock_capabilities
+    ):
+        """Scheduled training is skipped only after a recent run on the same capabilities."""
+        metadata = {
+            "last_trained": (datetime.now() - timedelta(days=2)).isoformat(),
+            "available_capabilities": ["lighting", "occupancy", "power_monitoring"],
+        }
+        entries = {"ml_training_metadata": {"data": metadata}, "capabilities": mock_capabilities}
+        mock_hub.get_cache.side_effect = lambda category: entries.get(category)
+
+        assert await ml_engine._trained_since(timedelta(days=7)) is True
+        assert await ml_engine._trained_since(timedelta(days=1)) is False
+
+        mock_capabilities["data"]["lighting"]["available"] = False
+        assert await ml_engine._trained_since(timedelta(days=7)) is False
+
+        del entries["ml_training_metadata"]
+        assert await ml_engine._trained_since(timedelta(days=7)) is False
+
     @pytest.mark.asyncio
     async def test_train_models(self, ml_engine, mock_hub, mock_capabilities, synthetic_snapshots):
         """Test complete training pipeline."""
@@ -291,6 +480,21 @@ class TestMLEngine:
         assert "targets_trained" in metadata
         assert "accuracy_summary" in metadata
 
+    @pytest.mark.asyncio
+    async def test_load_models_keys_bundles_by_target(
+        self, ml_engine, mock_hub, mock_capabilities, synthetic_snapshots
+    ):
+        """Models reloaded from disk keep the keys train_models gave them."""
+        mock_hub.get_cache_fresh.return_value = mock_capabilities
+        await ml_engine.train_models(days_history=30)
+        (Path(ml_engine.models_dir) / "notes.txt").write_text("not a model")
+
+        restarted = MLEngine(mock_hub, str(ml_engine.models_dir), str(ml_engine.training_data_dir))
+        await restarted._load_models()
+
+        assert set(restarted.models) == set(ml_engine.models)
+        assert restarted.models["power_watts"]["target"] == "power_watts"
+
     @pytest.mark.asyncio
     async def test_insufficient_training_data(self, ml_engine, synthetic_snapshots):
         """Test handling of insufficient training data."""
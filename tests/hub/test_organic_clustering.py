@@ -124,3 +124,13 @@ class TestClusterEntities:
         assert len(clusters) >= 1
         for c in clusters:
             assert len(c["entity_ids"]) >= 15
+
+    def test_sampled_silhouette_matches_full(self):
+        """Above the sample size, silhouettes are estimated close to the exact values."""
+        matrix, entity_ids = _make_two_blobs(n_per_cluster=300)
+        full = cluster_entities(matrix, entity_ids, silhouette_sample_size=10_000)
+        sampled = cluster_entities(matrix, entity_ids, silhouette_sample_size=100)
+        assert [c["entity_ids"] for c in sampled] == [c["entity_ids"] for c in full]
+        for s, f in zip(sampled, full):
+            assert s["silhouette"] == pytest.approx(f["silhouette"], abs=0.05)
+        assert sampled == cluster_entities(matrix, entity_ids, silhouette_sample_size=100)
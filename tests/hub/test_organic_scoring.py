@@ -1,9 +1,12 @@
 """Tests for organic discovery usefulness scoring."""
 
 
+import numpy as np
+
 from aria.modules.organic_discovery.scoring import (
     UsefulnessComponents,
     compute_usefulness,
+    compute_usefulness_batch,
 )
 
 
@@ -44,6 +47,18 @@ class TestUsefulnessComponents:
             "cohesion": 0,
         }
 
+    def test_as_int_tuple_matches_to_dict_order(self):
+        c = UsefulnessComponents(
+            predictability=0.5,
+            stability=1.3,
+            entity_coverage=0.75,
+            activity=-0.2,
+            cohesion=0.9,
+        )
+        result = c.as_int_tuple()
+        assert result == (50, 100, 75, 0, 90)
+        assert result == tuple(c.to_dict().values())
+
     def test_to_dict_returns_ints(self):
         c = UsefulnessComponents(
             predictability=0.5,
@@ -230,3 +245,27 @@ class TestComputeUsefulness:
             kwargs[field] = 1.0
             c = UsefulnessComponents(**kwargs)
             assert compute_usefulness(c) == 15, f"{field} should contribute 15"
+
+
+class TestComputeUsefulnessBatch:
+    """Tests for compute_usefulness_batch."""
+
+    def test_matches_scalar_scoring(self):
+        rng = np.random.default_rng(42)
+        comps = np.concatenate([rng.uniform(-0.5, 1.5, (500, 5)), np.round(rng.random((500, 5)), 2)])
+        expected = [compute_usefulness(UsefulnessComponents(*map(float, row))) for row in comps]
+        assert compute_usefulness_batch(comps).tolist() == expected
+
+    def test_accepts_float32_without_mutating_input(self):
+        comps = np.array([[1.5, 1.0, 1.0, 1.0, 1.0], [0.8, 0.6, 0.4, 0.2, 1.0]], dtype=np.float32)
+        original = comps.copy()
+        assert compute_usefulness_batch(comps).tolist() == [100, 63]
+        np.testing.assert_array_equal(comps, original)
+
+    def test_empty_batch(self):
+        assert compute_usefulness_batch(np.empty((0, 5))).shape == (0,)
+        assert compute_usefulness_batch([]).shape == (0,)
+
+    def test_accepts_components_sequence(self):
+        comps = [UsefulnessComponents(1.5, 1.0, 1.0, 1.0, 1.0), UsefulnessComponents(0.8, 0.6, 0.4, 0.2, 1.0)]
+        assert compute_usefulness_batch(comps).tolist() == [compute_usefulness(c) for c in comps]
@@ -59,3 +59,24 @@ def test_validate_seeds_no_match():
     results = validate_seeds(SEED_CAPABILITIES, clusters)
     assert not results["lighting"]["matched"]
     assert results["lighting"]["best_jaccard"] == 0.0
+
+
+def test_validate_seeds_ties_pick_first_cluster():
+    clusters = [
+        {"cluster_id": 0, "entity_ids": ["switch.a"]},
+        {"cluster_id": 7, "entity_ids": ["sensor.outlet_1_power"]},
+        {"cluster_id": 9, "entity_ids": ["sensor.outlet_2_power"]},
+    ]
+    results = validate_seeds(SEED_CAPABILITIES, clusters)
+    assert results["power_monitoring"]["best_cluster_id"] == 7
+    assert results["power_monitoring"]["best_jaccard"] == 0.5
+    assert results["lighting"]["best_cluster_id"] is None
+
+
+def test_validate_seeds_uses_set_semantics_for_members():
+    """Member lists are converted to sets once; duplicates must not skew the score."""
+    seeds = {"lighting": {"entities": ["light.a", "light.b", "light.a"]}}
+    clusters = [{"cluster_id": 3, "entity_ids": ["light.b", "light.a", "light.b"]}]
+    results = validate_seeds(seeds, clusters)
+    assert results["lighting"]["best_jaccard"] == 1.0
+    assert results["lighting"]["best_cluster_id"] == 3
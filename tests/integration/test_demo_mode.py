@@ -1,28 +1,35 @@
 """Tests for aria demo mode CLI integration."""
+import pytest
+
 from tests.demo.generate import generate_checkpoint
 from tests.synthetic.simulator import INTRADAY_HOURS
 
 
-class TestDemoGenerate:
-    def test_generate_checkpoint(self, tmp_path):
+@pytest.fixture(scope="module")
+def demo_checkpoints(tmp_path_factory):
+    """7- and 14-day stable_couple checkpoints, generated once. Module-scoped for performance."""
+    root = tmp_path_factory.mktemp("demo")
+    checkpoints = {}
+    for name, days in [("day_07", 7), ("day_14", 14)]:
         output = generate_checkpoint(
             scenario="stable_couple",
-            days=14,
+            days=days,
             seed=42,
-            output_dir=tmp_path / "day_14",
+            output_dir=root / name,
         )
-        assert (tmp_path / "day_14").exists()
-        assert (tmp_path / "day_14" / "daily").exists()
+        checkpoints[name] = (days, output, root / name)
+    return checkpoints
+
+
+class TestDemoGenerate:
+    def test_generate_checkpoint(self, demo_checkpoints):
+        _, output, checkpoint_dir = demo_checkpoints["day_14"]
+        assert checkpoint_dir.exists()
+        assert (checkpoint_dir / "daily").exists()
         # Multiple intraday snapshots per day overwrite the same {date}.json on disk
-        assert len(list((tmp_path / "day_14" / "daily").glob("*.json"))) == 14
+        assert len(list((checkpoint_dir / "daily").glob("*.json"))) == 14
         assert output["snapshots_saved"] == 14 * len(INTRADAY_HOURS)
 
-    def test_generate_multiple_checkpoints(self, tmp_path):
-        for name, days in [("day_07", 7), ("day_14", 14)]:
-            output = generate_checkpoint(
-                scenario="stable_couple",
-                days=days,
-                seed=42,
-                output_dir=tmp_path / name,
-            )
+    def test_generate_multiple_checkpoints(self, demo_checkpoints):
+        for days, output, _ in demo_checkpoints.values():
             assert output["snapshots_saved"] == days * len(INTRADAY_HOURS)
@@ -28,48 +28,60 @@ class SnapshotAssembler:
         self.weather = weather
         self.seed = seed
         self.entity_gen = EntityStateGenerator(roster, people, seed)
+        self._holidays_config = HolidayConfig()
+        self._safety_config = SafetyConfig()
+        # Collectors keep no per-call state, so one instance each serves every snapshot
+        self._collectors = tuple(
+            cls(safety_config=self._safety_config) if name == "entities_summary" else cls()
+            for name, cls in CollectorRegistry.all().items()
+        )
+        # Sunrise/sunset are fixed per weather profile; only the date prefix changes per snapshot
+        self._sunrise_hhmm = self._format_hhmm(weather.sunrise)
+        self._sunset_hhmm = self._format_hhmm(weather.sunset)
+
+    @staticmethod
+    def _format_hhmm(hour: float) -> str:
+        return f"{int(hour):02d}:{int((hour % 1) * 60):02d}"
+
+    def build_snapshot(
+        self, day: int, date_str: str, hour: float = 18.0, dt: datetime | None = None
+    ) -> dict:
+        """Build a single snapshot for a given day using real collectors.
 
-    def build_snapshot(self, day: int, date_str: str, hour: float = 18.0) -> dict:
-        """Build a single snapshot for a given day using real collectors."""
+        ``dt`` is the already-parsed ``date_str``; callers that iterate dates pass it to skip re-parsing.
+        """
         import random
 
-        dt = datetime.strptime(date_str, "%Y-%m-%d")
+        if dt is None:
+            dt = datetime.strptime(date_str, "%Y-%m-%d")
         is_weekend = dt.weekday() >= 5
-        holidays_config = HolidayConfig()
-        safety_config = SafetyConfig()
 
         states = self.entity_gen.generate_states(
             day=day, hour=hour, is_weekend=is_weekend,
             sunrise=self.weather.sunrise, sunset=self.weather.sunset,
         )
 
+        by_id = {s["entity_id"]: s for s in states}
+
         # Patch synthetic states to match what real HA provides and collectors expect
-        self._patch_states_for_collectors(states, date_str, hour)
+        self._patch_states_for_collectors(by_id, date_str, hour)
 
-        snapshot = build_empty_snapshot(date_str, holidays_config)
+        snapshot = build_empty_snapshot(date_str, self._holidays_config)
 
-        for name, collector_cls in CollectorRegistry.all().items():
-            if name == "entities_summary":
-                collector = collector_cls(safety_config=safety_config)
-            else:
-                collector = collector_cls()
+        for collector in self._collectors:
             collector.extract(snapshot, states)
 
         # PowerCollector looks for usp_pdu_pro entities which don't exist in
         # synthetic data. Inject power from the synthetic total_power sensor.
-        if snapshot["power"]["total_watts"] == 0:
-            for s in states:
-                if s["entity_id"] == "sensor.total_power":
-                    try:
-                        snapshot["power"]["total_watts"] = float(s["state"])
-                    except (ValueError, TypeError):
-                        pass
-                    break
+        total_power = by_id.get("sensor.total_power")
+        if snapshot["power"]["total_watts"] == 0 and total_power is not None:
+            try:
+                snapshot["power"]["total_watts"] = float(total_power["state"])
+            except (ValueError, TypeError):
+                pass
 
         # Enrich motion with active_count (done in intraday snapshot code, not by collector)
-        snapshot["motion"]["active_count"] = sum(
-            1 for v in snapshot["motion"]["sensors"].values() if v == "on"
-        )
+        snapshot["motion"]["active_count"] = list(snapshot["motion"]["sensors"].values()).count("on")
 
         # Weather from synthetic profile
         weather_cond = self.weather.get_conditions(day, hour, self.seed)
@@ -77,11 +89,7 @@ class SnapshotAssembler:
 
         # Time features
         timestamp_str = f"{date_str}T{int(hour):02d}:{int((hour % 1) * 60):02d}:00"
-        sun_data = None
-        for s in states:
-            if s["entity_id"] == "sun.sun":
-                sun_data = s["attributes"]
-                break
+        sun_data = by_id["sun.sun"]["attributes"] if "sun.sun" in by_id else None
         snapshot["time_features"] = build_time_features(timestamp_str, sun_data, date_str)
 
         # Logbook summary — varies with occupancy, time, and active devices
@@ -120,7 +128,7 @@ class SnapshotAssembler:
         }
 
     def _patch_states_for_collectors(
-        self, states: list[dict], date_str: str, hour: float
+        self, by_id: dict[str, dict], date_str: str, hour: float
     ) -> None:
         """Mutate synthetic states so real collectors can extract data correctly.
 
@@ -128,27 +136,22 @@ class SnapshotAssembler:
         doesn't produce. This method adds them.
         """
         # Build sunrise/sunset ISO strings for SunCollector (expects next_rising/next_setting)
-        sunrise_hour = int(self.weather.sunrise)
-        sunrise_min = int((self.weather.sunrise % 1) * 60)
-        sunset_hour = int(self.weather.sunset)
-        sunset_min = int((self.weather.sunset % 1) * 60)
-        next_rising = f"{date_str}T{sunrise_hour:02d}:{sunrise_min:02d}:00+00:00"
-        next_setting = f"{date_str}T{sunset_hour:02d}:{sunset_min:02d}:00+00:00"
-
-        for s in states:
-            eid = s["entity_id"]
-
-            # SunCollector expects next_rising / next_setting attributes
-            if eid == "sun.sun":
-                s["attributes"]["next_rising"] = next_rising
-                s["attributes"]["next_setting"] = next_setting
-                # Also provide sunrise/sunset in HH:MM for time_features sun_data
-                s["attributes"]["sunrise"] = f"{sunrise_hour:02d}:{sunrise_min:02d}"
-                s["attributes"]["sunset"] = f"{sunset_hour:02d}:{sunset_min:02d}"
-
-            # EVCollector checks for "mi" in unit_of_measurement for range
-            if eid == "sensor.luda_range":
-                s["attributes"]["unit_of_measurement"] = "mi"
+        next_rising = f"{date_str}T{self._sunrise_hhmm}:00+00:00"
+        next_setting = f"{date_str}T{self._sunset_hhmm}:00+00:00"
+
+        # SunCollector expects next_rising / next_setting attributes
+        sun = by_id.get("sun.sun")
+        if sun is not None:
+            sun["attributes"]["next_rising"] = next_rising
+            sun["attributes"]["next_setting"] = next_setting
+            # Also provide sunrise/sunset in HH:MM for time_features sun_data
+            sun["attributes"]["sunrise"] = self._sunrise_hhmm
+            sun["attributes"]["sunset"] = self._sunset_hhmm
+
+        # EVCollector checks for "mi" in unit_of_measurement for range
+        luda_range = by_id.get("sensor.luda_range")
+        if luda_range is not None:
+            luda_range["attributes"]["unit_of_measurement"] = "mi"
 
     def build_daily_series(
         self, days: int, start_date: str = "2026-02-01"
@@ -158,7 +161,7 @@ class SnapshotAssembler:
         snapshots = []
         for day in range(days):
             dt = start + timedelta(days=day)
-            date_str = dt.strftime("%Y-%m-%d")
-            snapshot = self.build_snapshot(day=day, date_str=date_str)
+            date_str = dt.date().isoformat()
+            snapshot = self.build_snapshot(day=day, date_str=date_str, dt=dt)
             snapshots.append(snapshot)
         return snapshots
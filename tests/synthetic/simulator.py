@@ -43,14 +43,14 @@ class HouseholdSimulator:
 
         for day in range(self.days):
             dt = start + timedelta(days=day)
-            date_str = dt.strftime("%Y-%m-%d")
+            date_str = dt.date().isoformat()
             is_weekend = dt.weekday() >= 5
 
             day_people = self._get_people_for_day(people, config, day, is_weekend)
 
+            assembler = SnapshotAssembler(roster, day_people, weather, self.seed)
             for hour in hours_per_day:
-                assembler = SnapshotAssembler(roster, day_people, weather, self.seed)
-                snapshot = assembler.build_snapshot(day=day, date_str=date_str, hour=hour)
+                snapshot = assembler.build_snapshot(day=day, date_str=date_str, hour=hour, dt=dt)
 
                 self._apply_scenario_mods(snapshot, config, day)
                 snapshots.append(snapshot)